@@ -4,46 +4,206 @@
 Converts markdown documentation to PDF format
 """
 
+import asyncio
+import hashlib
+import json
 import os
+import re
+import shutil
 import subprocess
-import sys
+import tempfile
+import threading
+from functools import lru_cache
+from string import Template
+
+try:
+    import mistune
+    MISTUNE_AVAILABLE = True
+except ImportError:
+    MISTUNE_AVAILABLE = False
+
+INPUT_FILES = ["docs/ASSIGNMENT_SUBMISSION.md"]
+PDF_OUTPUT = "SmartLearn_Assignment_Submission.pdf"
+CACHE_MANIFEST = ".smartlearn/pdf_manifest.json"
+# Large enough that a whole document goes out in a handful of write syscalls
+WRITE_BUFFER_SIZE = 1 << 20
+
+HTML_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>SmartLearn: AI-Powered Educational Platform</title>
+    <style>
+$style
+    </style>
+</head>
+<body>
+"""
+
+# Compact styling for wkhtmltopdf output
+PDF_STYLE = """        body { font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }
+        h1, h2, h3 { color: #2c3e50; }
+        .mermaid { text-align: center; margin: 20px 0; }
+        table { border-collapse: collapse; width: 100%; margin: 20px 0; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+        code { background-color: #f4f4f4; padding: 2px 4px; border-radius: 3px; }
+        pre { background-color: #f4f4f4; padding: 10px; border-radius: 5px; overflow-x: auto; }"""
+
+# Richer styling for the standalone HTML version viewed in a browser
+SCREEN_STYLE = """        body { font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; max-width: 1200px; margin: 0 auto; padding: 20px; }
+        h1, h2, h3 { color: #2c3e50; }
+        h1 { border-bottom: 3px solid #3498db; padding-bottom: 10px; }
+        h2 { border-bottom: 2px solid #ecf0f1; padding-bottom: 5px; margin-top: 30px; }
+        .mermaid { text-align: center; margin: 20px 0; padding: 20px; background-color: #f8f9fa; border-radius: 5px; }
+        table { border-collapse: collapse; width: 100%; margin: 20px 0; }
+        th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
+        th { background-color: #3498db; color: white; }
+        tr:nth-child(even) { background-color: #f2f2f2; }
+        code { background-color: #f4f4f4; padding: 2px 4px; border-radius: 3px; font-family: 'Courier New', monospace; }
+        pre { background-color: #f4f4f4; padding: 15px; border-radius: 5px; overflow-x: auto; border-left: 4px solid #3498db; }
+        .highlight { background-color: #fff3cd; padding: 15px; border-radius: 5px; border-left: 4px solid #ffc107; }
+        .success { background-color: #d4edda; padding: 15px; border-radius: 5px; border-left: 4px solid #28a745; }
+        .info { background-color: #d1ecf1; padding: 15px; border-radius: 5px; border-left: 4px solid #17a2b8; }"""
+
+# Rendered once at import; each document only adds its body
+HTML_PROLOGUES = {
+    "pdf": Template(HTML_HEAD).substitute(style=PDF_STYLE),
+    "screen": Template(HTML_HEAD).substitute(style=SCREEN_STYLE),
+}
+HTML_EPILOGUE = """
+</body>
+</html>
+"""
+
+CLEANUP_RE = re.compile(r'```(mermaid)?')
+MERMAID_PLACEHOLDER = '<div class="mermaid">[Mermaid diagrams will be rendered in PDF]</div>'
+
+def clean_markdown(content):
+    """Strip code fences and swap mermaid blocks for a placeholder"""
+    # One pass over the text instead of one per replacement
+    return CLEANUP_RE.sub(lambda m: MERMAID_PLACEHOLDER if m.group(1) else '', content)
+
+# Byte-level twin of clean_markdown, used when streaming raw UTF-8 without decoding
+CLEANUP_BYTES_RE = re.compile(CLEANUP_RE.pattern.encode('ascii'))
+MERMAID_PLACEHOLDER_BYTES = MERMAID_PLACEHOLDER.encode('utf-8')
+
+def clean_markdown_bytes(content):
+    return CLEANUP_BYTES_RE.sub(lambda m: MERMAID_PLACEHOLDER_BYTES if m.group(1) else b'', content)
+
+if MISTUNE_AVAILABLE:
+    render_markdown = mistune.create_markdown(plugins=['table', 'footnotes'])
+else:
+    # Without a markdown parser, fall back to the old fence cleanup
+    render_markdown = clean_markdown
+
+@lru_cache(maxsize=None)
+def has_tool(name):
+    """Check whether a command-line tool is on PATH (probed once per process)"""
+    return shutil.which(name) is not None
+
+async def run_command(cmd, input=None):
+    """Run a converter without blocking the event loop; raises on failure"""
+    stdin = asyncio.subprocess.PIPE if input is not None else None
+    process = await asyncio.create_subprocess_exec(*cmd, stdin=stdin)
+    await process.communicate(input)
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
+
+def read_sources(input_files=None):
+    """Read each markdown source once; every converter shares these buffers"""
+    sources = []
+    for input_file in input_files or INPUT_FILES:
+        with open(input_file, 'rb') as f:
+            sources.append(f.read())
+    return sources
+
+def source_digest(input_files, sources):
+    """MD5 over the markdown sources and their names"""
+    digest = hashlib.md5()
+    for input_file, source in zip(input_files, sources):
+        digest.update(input_file.encode('utf-8'))
+        digest.update(source)
+    return digest.hexdigest()
+
+def load_manifest():
+    try:
+        with open(CACHE_MANIFEST, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    os.makedirs(os.path.dirname(CACHE_MANIFEST), exist_ok=True)
+    with open(CACHE_MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
 
 def create_pdf():
     print("📚 Creating PDF Documentation for SmartLearn Assignment...")
+    asyncio.run(build_documents())
+
+# Every build writes the same output files, so concurrent requests take turns
+build_lock = threading.Lock()
+
+def create_pdf_locked():
+    with build_lock:
+        create_pdf()
+
+async def create_pdf_async():
+    """Build the documentation from async code (e.g. a web handler) without
+    blocking its event loop; the conversion runs in a worker thread"""
+    await asyncio.to_thread(create_pdf_locked)
+
+async def build_documents():
+    """Build the PDF and the HTML companion concurrently"""
+    pdf_job = None
+    sources = read_sources(INPUT_FILES)
+    digest = source_digest(INPUT_FILES, sources)
     
+    # Skip the (slow) PDF conversion when neither the sources nor the PDF changed
+    manifest = load_manifest()
+    if (manifest.get('input_md5') == digest and os.path.exists(PDF_OUTPUT)
+            and manifest.get('pdf_mtime') == os.path.getmtime(PDF_OUTPUT)):
+        print(f"✅ Sources unchanged - reusing existing PDF: {PDF_OUTPUT}")
     # Check if required tools are available
-    try:
-        # Try using pandoc if available
-        result = subprocess.run(['pandoc', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ Pandoc found - using it to create PDF")
-            create_pdf_with_pandoc()
-            return
-    except FileNotFoundError:
-        pass
+    elif has_tool('pandoc'):
+        print("✅ Pandoc found - using it to create PDF")
+        pdf_job = create_pdf_with_pandoc(sources)
+    elif has_tool('wkhtmltopdf'):
+        print("✅ wkhtmltopdf found - using it to create PDF")
+        pdf_job = create_pdf_with_wkhtmltopdf(sources)
+    else:
+        # Fallback: Create HTML and provide instructions
+        print("⚠️  No PDF converter found - creating HTML version")
     
-    try:
-        # Try using wkhtmltopdf if available
-        result = subprocess.run(['wkhtmltopdf', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ wkhtmltopdf found - using it to create PDF")
-            create_pdf_with_wkhtmltopdf()
-            return
-    except FileNotFoundError:
-        pass
+    # The HTML version is always written; without a PDF it doubles as the fallback
+    has_pdf = pdf_job is not None or os.path.exists(PDF_OUTPUT)
+    html_job = asyncio.to_thread(create_html_version, sources, fallback=not has_pdf)
+    if pdf_job is None:
+        await html_job
+        return
     
-    # Fallback: Create HTML and provide instructions
-    print("⚠️  No PDF converter found - creating HTML version")
-    create_html_version()
-
-def create_pdf_with_pandoc():
-    """Create PDF using pandoc"""
-    input_file = "docs/ASSIGNMENT_SUBMISSION.md"
-    output_file = "SmartLearn_Assignment_Submission.pdf"
+    pdf_created, _ = await asyncio.gather(pdf_job, html_job)
+    if pdf_created:
+        save_manifest({'input_md5': digest, 'pdf_mtime': os.path.getmtime(PDF_OUTPUT)})
+    else:
+        # The HTML was written alongside the PDF attempt, so it is the fallback now
+        print_pdf_instructions()
+
+async def create_pdf_with_pandoc(sources=None):
+    """Create PDF using pandoc
+
+    All markdown sources are piped to a single pandoc process on stdin,
+    separated by blank lines the same way pandoc joins multiple input files,
+    so extra documents don't each pay pandoc's startup cost.
+    """
+    sources = sources or read_sources()
+    output_file = PDF_OUTPUT
     
     cmd = [
         'pandoc',
-        input_file,
+        '--from=markdown',
         '-o', output_file,
         '--pdf-engine=xelatex',
         '--toc',
@@ -55,53 +215,37 @@ def create_pdf_with_pandoc():
     ]
     
     try:
-        subprocess.run(cmd, check=True)
+        await run_command(cmd, input=b'\n\n'.join(sources))
         print(f"✅ PDF created successfully: {output_file}")
         print(f"📁 Location: {os.path.abspath(output_file)}")
-    except subprocess.CalledProcessError as e:
+        return True
+    except Exception as e:
         print(f"❌ Error creating PDF with pandoc: {e}")
-        print("🔄 Falling back to HTML version...")
-        create_html_version()
-
-def create_pdf_with_wkhtmltopdf():
-    """Create PDF using wkhtmltopdf"""
-    input_file = "docs/ASSIGNMENT_SUBMISSION.md"
-    html_file = "SmartLearn_Assignment_Submission.html"
-    output_file = "SmartLearn_Assignment_Submission.pdf"
+        print("🔄 Use the HTML version instead")
+        return False
+
+async def create_pdf_with_wkhtmltopdf(sources=None):
+    """Create PDF using wkhtmltopdf
+
+    Each markdown source is rendered to its own temporary HTML file and all
+    of them are passed to one wkhtmltopdf process, which lays them out as
+    consecutive pages of a single PDF.
+    """
+    sources = sources or read_sources()
+    output_file = PDF_OUTPUT
+    html_files = []
     
-    # First convert markdown to HTML
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Simple markdown to HTML conversion
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>SmartLearn: AI-Powered Educational Platform</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
-        h1, h2, h3 {{ color: #2c3e50; }}
-        .mermaid {{ text-align: center; margin: 20px 0; }}
-        table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background-color: #f2f2f2; }}
-        code {{ background-color: #f4f4f4; padding: 2px 4px; border-radius: 3px; }}
-        pre {{ background-color: #f4f4f4; padding: 10px; border-radius: 5px; overflow-x: auto; }}
-    </style>
-</head>
-<body>
-{content.replace('```mermaid', '<div class="mermaid">[Mermaid diagrams will be rendered in PDF]</div>').replace('```', '')}
-</body>
-</html>
-"""
+        # First convert each markdown source to a temporary HTML file
+        for source in sources:
+            with tempfile.NamedTemporaryFile('w', buffering=WRITE_BUFFER_SIZE, suffix='.html',
+                                             encoding='utf-8', delete=False) as f:
+                f.write(HTML_PROLOGUES["pdf"])
+                f.write(render_markdown(source.decode('utf-8')))
+                f.write(HTML_EPILOGUE)
+            html_files.append(f.name)
         
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        # Convert HTML to PDF
+        # Convert all HTML files to PDF in a single process
         cmd = [
             'wkhtmltopdf',
             '--page-size', 'A4',
@@ -109,74 +253,62 @@ def create_pdf_with_wkhtmltopdf():
             '--margin-right', '20',
             '--margin-bottom', '20',
             '--margin-left', '20',
-            html_file,
+            *html_files,
             output_file
         ]
         
-        subprocess.run(cmd, check=True)
+        await run_command(cmd)
         print(f"✅ PDF created successfully: {output_file}")
         print(f"📁 Location: {os.path.abspath(output_file)}")
-        
-        # Clean up HTML file
-        os.remove(html_file)
+        return True
         
     except Exception as e:
         print(f"❌ Error creating PDF with wkhtmltopdf: {e}")
-        print("🔄 Falling back to HTML version...")
-        create_html_version()
+        print("🔄 Use the HTML version instead")
+        return False
+    finally:
+        # Clean up temporary HTML files
+        for html_file in html_files:
+            if os.path.exists(html_file):
+                os.remove(html_file)
+
+def create_html_version(sources=None, fallback=True):
+    """Create HTML version as fallback
 
-def create_html_version():
-    """Create HTML version as fallback"""
-    input_file = "docs/ASSIGNMENT_SUBMISSION.md"
+    Markdown is rendered with mistune when it is installed. Otherwise the
+    raw bytes go through the fence cleanup straight into the output file,
+    without being decoded.
+    """
+    sources = sources or read_sources()
     output_file = "SmartLearn_Assignment_Submission.html"
     
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>SmartLearn: AI-Powered Educational Platform</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; max-width: 1200px; margin: 0 auto; padding: 20px; }}
-        h1, h2, h3 {{ color: #2c3e50; }}
-        h1 {{ border-bottom: 3px solid #3498db; padding-bottom: 10px; }}
-        h2 {{ border-bottom: 2px solid #ecf0f1; padding-bottom: 5px; margin-top: 30px; }}
-        .mermaid {{ text-align: center; margin: 20px 0; padding: 20px; background-color: #f8f9fa; border-radius: 5px; }}
-        table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
-        th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
-        th {{ background-color: #3498db; color: white; }}
-        tr:nth-child(even) {{ background-color: #f2f2f2; }}
-        code {{ background-color: #f4f4f4; padding: 2px 4px; border-radius: 3px; font-family: 'Courier New', monospace; }}
-        pre {{ background-color: #f4f4f4; padding: 15px; border-radius: 5px; overflow-x: auto; border-left: 4px solid #3498db; }}
-        .highlight {{ background-color: #fff3cd; padding: 15px; border-radius: 5px; border-left: 4px solid #ffc107; }}
-        .success {{ background-color: #d4edda; padding: 15px; border-radius: 5px; border-left: 4px solid #28a745; }}
-        .info {{ background-color: #d1ecf1; padding: 15px; border-radius: 5px; border-left: 4px solid #17a2b8; }}
-    </style>
-</head>
-<body>
-{content.replace('```mermaid', '<div class="mermaid">[Mermaid diagrams will be rendered in PDF]</div>').replace('```', '')}
-</body>
-</html>
-"""
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # The markdown is UTF-8 and the fences are ASCII, so the source can be
+        # copied through as bytes without a decode/encode round trip
+        with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as out:
+            out.write(HTML_PROLOGUES["screen"].encode('utf-8'))
+            for source in sources:
+                if MISTUNE_AVAILABLE:
+                    out.write(render_markdown(source.decode('utf-8')).encode('utf-8'))
+                else:
+                    out.write(clean_markdown_bytes(source))
+            out.write(HTML_EPILOGUE.encode('utf-8'))
         
         print(f"✅ HTML version created: {output_file}")
         print(f"📁 Location: {os.path.abspath(output_file)}")
-        print("\n📋 To convert to PDF:")
-        print("   1. Open the HTML file in a web browser")
-        print("   2. Use 'Print' → 'Save as PDF'")
-        print("   3. Or install pandoc: brew install pandoc")
-        print("   4. Or install wkhtmltopdf: brew install wkhtmltopdf")
+        if fallback:
+            print_pdf_instructions()
         
     except Exception as e:
         print(f"❌ Error creating HTML version: {e}")
 
+def print_pdf_instructions():
+    print("\n📋 To convert to PDF:")
+    print("   1. Open the HTML file in a web browser")
+    print("   2. Use 'Print' → 'Save as PDF'")
+    print("   3. Or install pandoc: brew install pandoc")
+    print("   4. Or install wkhtmltopdf: brew install wkhtmltopdf")
+
 def main():
     print("🚀 SmartLearn Assignment Documentation Generator")
     print("=" * 50)
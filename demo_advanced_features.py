@@ -6,25 +6,75 @@
 
 import sys
 import os
+import io
 import time
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+class LazyModule:
+    """Module proxy that only imports the real module on first attribute access."""
+    
+    _lock = threading.Lock()
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            # Tests run in threads, so serialise the first import
+            with LazyModule._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+# Heavy modules (torch, transformers, whisper) are only imported by the tests
+# that actually construct something from them
+prompt_templates = LazyModule("core.prompt_templates")
+rag = LazyModule("core.rag")
+fine_tuning = LazyModule("core.fine_tuning")
+multimodal = LazyModule("core.multimodal")
+advanced_features = LazyModule("core.advanced_features")
+
+class ThreadOutput:
+    """Routes print() output from worker threads into per-test buffers."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def __getattr__(self, name):
+        # isatty(), encoding, fileno() etc. come from the real stream
+        return getattr(self.stream, name)
+    
+    def run(self, test_fn):
+        """Run a test with its output captured; returns (result, output)."""
+        self.local.buffer = io.StringIO()
+        try:
+            return test_fn(), self.local.buffer.getvalue()
+        finally:
+            self.local.buffer = None
+
 def test_enhanced_prompt_engineering():
     """Test Enhanced Prompt Engineering features."""
     print("\n🧠 Testing Enhanced Prompt Engineering...")
     print("=" * 50)
     
     try:
-        from core.prompt_templates import (
-            StudyPlanPrompt, ExplanationPrompt, QuizPrompt, 
-            AdaptivePromptManager
-        )
-        
         # Test StudyPlanPrompt with advanced features
-        study_prompt = StudyPlanPrompt()
+        study_prompt = prompt_templates.StudyPlanPrompt()
         prompt = study_prompt.render(
             subject="mathematics",
             level="intermediate",
@@ -44,7 +94,7 @@ def test_enhanced_prompt_engineering():
         print(f"   Includes User Context: {'visual' in prompt}")
         
         # Test ExplanationPrompt with few-shot examples
-        explanation_prompt = ExplanationPrompt()
+        explanation_prompt = prompt_templates.ExplanationPrompt()
         exp_prompt = explanation_prompt.render(
             topic="derivatives",
             level="intermediate",
@@ -57,7 +107,7 @@ def test_enhanced_prompt_engineering():
         print(f"   Includes Few-Shot Examples: {'Examples:' in exp_prompt}")
         
         # Test QuizPrompt with difficulty adaptation
-        quiz_prompt = QuizPrompt()
+        quiz_prompt = prompt_templates.QuizPrompt()
         quiz_p = quiz_prompt.render(
             topic="calculus",
             level="intermediate",
@@ -70,7 +120,7 @@ def test_enhanced_prompt_engineering():
         print(f"   Includes Difficulty Guidelines: {'HARD' in quiz_p}")
         
         # Test AdaptivePromptManager
-        prompt_manager = AdaptivePromptManager()
+        prompt_manager = prompt_templates.AdaptivePromptManager()
         personalized_prompt = prompt_manager.get_personalized_prompt(
             "study_plan",
             "user123",
@@ -95,21 +145,19 @@ def test_advanced_rag():
     print("=" * 50)
     
     try:
-        from core.rag import EnhancedRAG, HybridSearchEngine, QueryExpander
-        
         # Initialize RAG system
-        rag = EnhancedRAG()
+        rag_system = rag.EnhancedRAG()
         
         # Test document loading
         print("📚 Loading knowledge base...")
-        success = rag.load_knowledge_base("data/knowledge_base")
+        success = rag_system.load_knowledge_base("data/knowledge_base")
         
         if success:
             print("✅ Knowledge base loaded successfully")
             
             # Test hybrid search
             print("🔍 Testing hybrid search...")
-            context, sources = rag.retrieve_relevant_context(
+            context, sources = rag_system.retrieve_relevant_context(
                 "machine learning algorithms", k=3, use_hybrid=True
             )
             
@@ -118,7 +166,7 @@ def test_advanced_rag():
             
             # Test query expansion
             print("🔍 Testing query expansion...")
-            query_expander = QueryExpander()
+            query_expander = rag.QueryExpander()
             expanded_queries = query_expander.expand_query("derivatives")
             
             print(f"✅ Query Expansion: {len(expanded_queries)} expanded queries")
@@ -129,12 +177,12 @@ def test_advanced_rag():
             if sources:
                 source = sources[0].get('source', '')
                 if source:
-                    insights = rag.get_document_summary(source)
+                    insights = rag_system.get_document_summary(source)
                     print(f"✅ Document Insights: {insights.get('total_chunks', 0)} chunks")
             
             # Test advanced search with different parameters
             print("🔍 Testing advanced search parameters...")
-            context2, sources2 = rag.retrieve_relevant_context(
+            context2, sources2 = rag_system.retrieve_relevant_context(
                 "python programming", k=2, use_hybrid=True, alpha=0.8
             )
             
@@ -155,17 +203,12 @@ def test_fine_tuning():
     print("=" * 50)
     
     try:
-        from core.fine_tuning import (
-            FineTuningPipeline, TrainingExample, 
-            generate_synthetic_data
-        )
-        
         # Initialize pipeline
-        pipeline = FineTuningPipeline()
+        pipeline = fine_tuning.FineTuningPipeline()
         
         # Test synthetic data generation
         print("📊 Generating synthetic training data...")
-        synthetic_examples = generate_synthetic_data("mathematics", 10)
+        synthetic_examples = fine_tuning.generate_synthetic_data("mathematics", 10)
         
         print(f"✅ Synthetic Data Generated: {len(synthetic_examples)} examples")
         
@@ -227,13 +270,8 @@ def test_multimodal():
     print("=" * 50)
     
     try:
-        from core.multimodal import (
-            MultimodalManager, CrossModalAnalyzer,
-            ImageProcessor, AudioProcessor, VideoProcessor
-        )
-        
         # Initialize multimodal manager
-        mm_manager = MultimodalManager()
+        mm_manager = multimodal.MultimodalManager()
         
         # Test supported formats
         print("📁 Testing supported formats...")
@@ -243,10 +281,18 @@ def test_multimodal():
         for content_type, formats in supported_formats.items():
             print(f"   {content_type}: {', '.join(formats)}")
         
+        # The three processors load independent models, so load them concurrently
+        print("⏳ Loading image, audio and video models...")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            image_future = executor.submit(multimodal.ImageProcessor)
+            audio_future = executor.submit(multimodal.AudioProcessor)
+            video_future = executor.submit(multimodal.VideoProcessor)
+            image_processor = image_future.result()
+            audio_processor = audio_future.result()
+            video_processor = video_future.result()
+        
         # Test image processor initialization
         print("🖼️ Testing image processor...")
-        image_processor = ImageProcessor()
-        
         if image_processor.caption_model:
             print("✅ Image captioning model loaded")
         else:
@@ -254,8 +300,6 @@ def test_multimodal():
         
         # Test audio processor initialization
         print("🎵 Testing audio processor...")
-        audio_processor = AudioProcessor()
-        
         if audio_processor.whisper_model:
             print("✅ Audio transcription model loaded")
         else:
@@ -263,8 +307,6 @@ def test_multimodal():
         
         # Test video processor initialization
         print("🎬 Testing video processor...")
-        video_processor = VideoProcessor()
-        
         if video_processor.video_processor:
             print("✅ Video processing model loaded")
         else:
@@ -288,7 +330,7 @@ def test_multimodal():
         
         # Test cross-modal analyzer
         print("🔗 Testing cross-modal analyzer...")
-        cross_analyzer = CrossModalAnalyzer()
+        cross_analyzer = multimodal.CrossModalAnalyzer()
         
         # Test with empty file list
         analysis = cross_analyzer.analyze_content_relationships([])
@@ -306,11 +348,9 @@ def test_integration():
     print("=" * 50)
     
     try:
-        from core.advanced_features import create_advanced_smartlearn
-        
         # Initialize integrated system
         print("🔧 Initializing integrated system...")
-        smartlearn = create_advanced_smartlearn()
+        smartlearn = advanced_features.create_advanced_smartlearn()
         
         # Get system status
         print("📊 Getting system status...")
@@ -372,14 +412,29 @@ def main():
     print("=" * 60)
     
     start_time = time.time()
-    results = {}
+    tests = {
+        'enhanced_prompting': test_enhanced_prompt_engineering,
+        'advanced_rag': test_advanced_rag,
+        'fine_tuning': test_fine_tuning,
+        'multimodal': test_multimodal,
+        'integration': test_integration,
+    }
     
-    # Run all tests
-    results['enhanced_prompting'] = test_enhanced_prompt_engineering()
-    results['advanced_rag'] = test_advanced_rag()
-    results['fine_tuning'] = test_fine_tuning()
-    results['multimodal'] = test_multimodal()
-    results['integration'] = test_integration()
+    # Run all tests concurrently so their model loads overlap; each test's
+    # output is buffered and printed in one piece when it finishes
+    output = ThreadOutput(sys.stdout)
+    sys.stdout = output
+    finished = {}
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = {executor.submit(output.run, test_fn): name for name, test_fn in tests.items()}
+            for future in as_completed(futures):
+                success, test_output = future.result()
+                finished[futures[future]] = success
+                output.stream.write(test_output)
+    finally:
+        sys.stdout = output.stream
+    results = {name: finished[name] for name in tests}
     
     # Summary
     end_time = time.time()
@@ -389,13 +444,15 @@ def main():
     print("📊 TEST RESULTS SUMMARY")
     print("=" * 60)
     
+    # Tally while printing so results are only walked once
+    passed = 0
+    total = 0
     for feature, success in results.items():
+        total += 1
+        passed += success
         status = "✅ PASS" if success else "❌ FAIL"
         print(f"{feature.replace('_', ' ').title()}: {status}")
     
-    passed = sum(results.values())
-    total = len(results)
-    
     print(f"\nOverall: {passed}/{total} features working")
     print(f"Total Test Time: {total_time:.2f} seconds")
     
@@ -6,12 +6,26 @@
 import sys
 import os
 import time
-import random
 import json
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow  # noqa: F401 - pandas' Parquet engine
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add the src directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
@@ -30,55 +44,90 @@
     print("Please ensure you're in the correct directory and have installed requirements_metrics.txt")
     sys.exit(1)
 
+# Seed for the sample data generator
+RANDOM_SEED = 42
+
+# Hour-of-day lookup tables: business hours (9:00-17:59) run at higher load
+BUSINESS_HOURS = np.zeros(24, dtype=bool)
+BUSINESS_HOURS[9:18] = True
+CPU_BASE_BY_HOUR = np.where(BUSINESS_HOURS, 60.0, 30.0)
+MEMORY_BASE_BY_HOUR = np.where(BUSINESS_HOURS, 70.0, 50.0)
+
+# Subjects whose questions take longer to answer
+HARD_SUBJECTS = frozenset({"computer_science", "physics"})
+
+def write_json(filename: str, data, indent: bool = False):
+    """Write JSON with orjson when available; datetimes are serialized natively"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=option))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=2 if indent else None, default=lambda o: o.isoformat())
+
+@lru_cache(maxsize=None)
+def interaction_bases(subject: str, difficulty: str):
+    """Base response time (ms) and accuracy for a subject/difficulty pair"""
+    # Response time (varies by difficulty and subject)
+    base_response_time = 1000
+    if difficulty == "advanced":
+        base_response_time *= 1.5
+    if subject in HARD_SUBJECTS:
+        base_response_time *= 1.2
+    
+    # Accuracy (varies by difficulty)
+    base_accuracy = 0.8
+    if difficulty == "beginner":
+        base_accuracy += 0.1
+    elif difficulty == "advanced":
+        base_accuracy -= 0.1
+    
+    return base_response_time, base_accuracy
+
 def generate_comprehensive_sample_data(metrics_collector: MetricsCollector):
     """Generate comprehensive sample data for demonstration"""
     print("🔄 Generating comprehensive sample data...")
     
+    # One seeded generator for every column, so demo runs are reproducible
+    rng = np.random.default_rng(RANDOM_SEED)
+    
     # Generate 24 hours of performance data (every 5 minutes)
     base_time = datetime.now() - timedelta(hours=24)
     print(f"📅 Generating data from {base_time.strftime('%Y-%m-%d %H:%M')} to now")
     
-    for i in range(288):  # 24 hours * 12 (every 5 minutes)
-        timestamp = base_time + timedelta(minutes=5*i)
-        
-        # Simulate realistic CPU and memory patterns
-        hour = timestamp.hour
-        if 9 <= hour <= 17:  # Business hours - higher usage
-            cpu_base = 60
-            memory_base = 70
-        else:  # Off hours - lower usage
-            cpu_base = 30
-            memory_base = 50
-        
-        # Add some randomness and trends
-        cpu_usage = max(10, min(95, cpu_base + random.uniform(-15, 25) + np.sin(i/50) * 10))
-        memory_usage = max(20, min(90, memory_base + random.uniform(-10, 20) + np.cos(i/30) * 8))
-        
-        # GPU memory simulation (Apple M3 like)
-        gpu_memory_used = random.uniform(2, 8)
-        gpu_memory_total = 10.0
-        
-        # Response time simulation
-        response_time = random.uniform(100, 3000)
-        if cpu_usage > 80:
-            response_time *= 1.5  # Slower when CPU is high
-        
-        # Model accuracy simulation
-        model_accuracy = random.uniform(0.7, 0.95)
-        
-        # User engagement simulation
-        user_engagement = random.uniform(6, 9)
-        
-        metrics = PerformanceMetrics(
-            timestamp=timestamp,
-            cpu_usage=cpu_usage,
-            memory_usage=memory_usage,
-            gpu_memory_used=gpu_memory_used,
-            gpu_memory_total=gpu_memory_total,
-            response_time=response_time,
-            model_accuracy=model_accuracy,
-            user_engagement=user_engagement
-        )
+    # Build whole columns with NumPy, then only the dataclass assembly loops in Python
+    n_samples = 288  # 24 hours * 12 (every 5 minutes)
+    i = np.arange(n_samples)
+    timestamps = [base_time + timedelta(minutes=5*int(k)) for k in i]
+    
+    # Simulate realistic CPU and memory patterns
+    minutes = base_time.hour * 60 + base_time.minute + 5 * i
+    hours = (minutes // 60) % 24
+    cpu_base = CPU_BASE_BY_HOUR[hours]
+    memory_base = MEMORY_BASE_BY_HOUR[hours]
+    
+    # Add some randomness and trends
+    cpu_usage = np.clip(cpu_base + rng.uniform(-15, 25, n_samples) + np.sin(i/50) * 10, 10, 95)
+    memory_usage = np.clip(memory_base + rng.uniform(-10, 20, n_samples) + np.cos(i/30) * 8, 20, 90)
+    
+    # GPU memory simulation (Apple M3 like)
+    gpu_memory_used = rng.uniform(2, 8, n_samples)
+    gpu_memory_total = 10.0
+    
+    # Response time simulation, slower when CPU is high
+    response_time = rng.uniform(100, 3000, n_samples) * np.where(cpu_usage > 80, 1.5, 1.0)
+    
+    # Model accuracy simulation
+    model_accuracy = rng.uniform(0.7, 0.95, n_samples)
+    
+    # User engagement simulation
+    user_engagement = rng.uniform(6, 9, n_samples)
+    
+    # Positional construction from .tolist() columns (field order of PerformanceMetrics)
+    for metrics in map(PerformanceMetrics, timestamps, cpu_usage.tolist(), memory_usage.tolist(),
+                       gpu_memory_used.tolist(), repeat(gpu_memory_total, n_samples),
+                       response_time.tolist(), model_accuracy.tolist(), user_engagement.tolist()):
         metrics_collector.add_performance_metrics(metrics)
     
     print(f"✅ Generated {len(metrics_collector.performance_metrics)} performance metrics")
@@ -86,42 +135,30 @@ def generate_comprehensive_sample_data(metrics_collector: MetricsCollector):
     # Generate training metrics (simulating a training session)
     print("🎓 Generating training metrics...")
     
-    # Simulate a realistic training curve
-    for step in range(0, 1000, 5):
-        # Simulate training loss decreasing over time
-        base_loss = 2.0
-        decay_factor = 0.995
-        training_loss = base_loss * (decay_factor ** step)
-        
-        # Add some noise to make it realistic
-        training_loss += random.uniform(-0.1, 0.1)
-        training_loss = max(0.1, training_loss)
-        
-        # Validation loss (slightly higher, with overfitting simulation)
-        validation_loss = training_loss * (1.1 + random.uniform(-0.05, 0.05))
-        if step > 500:  # Simulate overfitting
-            validation_loss *= (1 + (step - 500) / 1000)
-        
-        # Learning rate (decreasing over time)
-        learning_rate = 1e-4 * (0.999 ** step)
-        
-        # Accuracy (increasing over time)
-        accuracy = 0.6 + 0.3 * (1 - 0.999 ** step)
-        accuracy += random.uniform(-0.02, 0.02)
-        accuracy = min(0.98, max(0.5, accuracy))
-        
-        # Timestamp for training
-        training_timestamp = base_time + timedelta(minutes=step//2)
-        
-        metrics = TrainingMetrics(
-            epoch=1,
-            step=step,
-            training_loss=training_loss,
-            validation_loss=validation_loss,
-            learning_rate=learning_rate,
-            accuracy=accuracy,
-            timestamp=training_timestamp
-        )
+    # Simulate a realistic training curve, one NumPy column per series
+    steps = np.arange(0, 1000, 5)
+    
+    # Simulate training loss decreasing over time, with some noise
+    base_loss = 2.0
+    decay_factor = 0.995
+    training_loss = np.maximum(0.1, base_loss * np.power(decay_factor, steps) + rng.uniform(-0.1, 0.1, steps.size))
+    
+    # Validation loss (slightly higher, with overfitting simulation after step 500)
+    validation_loss = training_loss * (1.1 + rng.uniform(-0.05, 0.05, steps.size))
+    validation_loss *= np.where(steps > 500, 1 + (steps - 500) / 1000, 1.0)
+    
+    # Learning rate (decreasing over time)
+    learning_rate = 1e-4 * np.power(0.999, steps)
+    
+    # Accuracy (increasing over time)
+    accuracy = 0.6 + 0.3 * (1 - np.power(0.999, steps)) + rng.uniform(-0.02, 0.02, steps.size)
+    accuracy = np.clip(accuracy, 0.5, 0.98)
+    
+    # Positional construction from .tolist() columns (field order of TrainingMetrics)
+    training_timestamps = [base_time + timedelta(minutes=step//2) for step in steps.tolist()]
+    for metrics in map(TrainingMetrics, repeat(1, steps.size), steps.tolist(), training_loss.tolist(),
+                       learning_rate.tolist(), validation_loss.tolist(), accuracy.tolist(),
+                       training_timestamps):
         metrics_collector.add_training_metrics(metrics)
     
     print(f"✅ Generated {len(metrics_collector.training_metrics)} training metrics")
@@ -133,37 +170,37 @@ def generate_comprehensive_sample_data(metrics_collector: MetricsCollector):
     difficulties = ["beginner", "intermediate", "advanced"]
     actions = ["quiz", "study_plan", "question", "explanation", "practice"]
     
+    # Draw every random column up front, the loop only combines them
+    n_interactions = 200
+    minute_offsets = rng.integers(0, 1441, n_interactions).tolist()  # distributed over 24 hours
+    user_numbers = rng.integers(1, 11, n_interactions).tolist()  # 10 different users
+    action_column = rng.choice(actions, n_interactions).tolist()
+    subject_column = rng.choice(subjects, n_interactions).tolist()
+    difficulty_column = rng.choice(difficulties, n_interactions).tolist()
+    response_draws = rng.uniform(0.8, 1.5, n_interactions).tolist()
+    user_factors = rng.uniform(0.9, 1.1, n_interactions).tolist()
+    engagement_draws = rng.uniform(-0.5, 0.5, n_interactions).tolist()
+    
     # Generate realistic user interaction patterns
-    for i in range(200):  # 200 user interactions
+    for i in range(n_interactions):
         # Timestamp (distributed over 24 hours)
-        timestamp = base_time + timedelta(minutes=random.randint(0, 1440))
+        timestamp = base_time + timedelta(minutes=minute_offsets[i])
         
         # User ID (10 different users)
-        user_id = f"user_{random.randint(1, 10)}"
+        user_id = f"user_{user_numbers[i]}"
         
         # Action and subject
-        action = random.choice(actions)
-        subject = random.choice(subjects)
-        difficulty = random.choice(difficulties)
-        
-        # Response time (varies by difficulty and subject)
-        base_response_time = 1000
-        if difficulty == "advanced":
-            base_response_time *= 1.5
-        if subject in ["computer_science", "physics"]:
-            base_response_time *= 1.2
+        action = action_column[i]
+        subject = subject_column[i]
+        difficulty = difficulty_column[i]
         
-        response_time = random.uniform(base_response_time * 0.8, base_response_time * 1.5)
+        # Response time and accuracy bases depend only on subject and difficulty
+        base_response_time, base_accuracy = interaction_bases(subject, difficulty)
         
-        # Accuracy (varies by difficulty and user)
-        base_accuracy = 0.8
-        if difficulty == "beginner":
-            base_accuracy += 0.1
-        elif difficulty == "advanced":
-            base_accuracy -= 0.1
+        response_time = base_response_time * response_draws[i]
         
         # Add user-specific variation
-        user_factor = random.uniform(0.9, 1.1)
+        user_factor = user_factors[i]
         accuracy = base_accuracy * user_factor
         accuracy = min(1.0, max(0.3, accuracy))
         
@@ -179,7 +216,7 @@ def generate_comprehensive_sample_data(metrics_collector: MetricsCollector):
         elif difficulty == "advanced":
             engagement_base -= 0.5
         
-        engagement_score = random.uniform(engagement_base - 0.5, engagement_base + 0.5)
+        engagement_score = engagement_base + engagement_draws[i]
         engagement_score = min(10.0, max(1.0, engagement_score))
         
         metrics = UserMetrics(
@@ -204,37 +241,27 @@ def demonstrate_visualizations(metrics_collector: MetricsCollector):
     
     visualization_engine = VisualizationEngine(metrics_collector)
     
-    # Test system dashboard
-    print("📊 Creating system performance dashboard...")
-    try:
-        system_chart = visualization_engine.create_system_dashboard()
-        print(f"✅ System dashboard created successfully (Figure object: {type(system_chart)})")
-    except Exception as e:
-        print(f"❌ Error creating system dashboard: {e}")
+    charts = [
+        ("📊 Creating system performance dashboard...", "system dashboard",
+         visualization_engine.create_system_dashboard),
+        ("📚 Creating training analytics...", "training analytics",
+         visualization_engine.create_training_analytics),
+        ("👥 Creating user analytics...", "user analytics",
+         visualization_engine.create_user_analytics),
+        ("🤖 Creating AI performance dashboard...", "AI performance dashboard",
+         visualization_engine.create_ai_performance_dashboard),
+    ]
     
-    # Test training analytics
-    print("📚 Creating training analytics...")
-    try:
-        training_chart = visualization_engine.create_training_analytics()
-        print(f"✅ Training analytics created successfully (Figure object: {type(training_chart)})")
-    except Exception as e:
-        print(f"❌ Error creating training analytics: {e}")
-    
-    # Test user analytics
-    print("👥 Creating user analytics...")
-    try:
-        user_chart = visualization_engine.create_user_analytics()
-        print(f"✅ User analytics created successfully (Figure object: {type(user_chart)})")
-    except Exception as e:
-        print(f"❌ Error creating user analytics: {e}")
-    
-    # Test AI performance dashboard
-    print("🤖 Creating AI performance dashboard...")
-    try:
-        ai_chart = visualization_engine.create_ai_performance_dashboard()
-        print(f"✅ AI performance dashboard created successfully (Figure object: {type(ai_chart)})")
-    except Exception as e:
-        print(f"❌ Error creating AI performance dashboard: {e}")
+    # The builders are independent, so run them side by side and report in order
+    with ThreadPoolExecutor(max_workers=len(charts)) as executor:
+        futures = [executor.submit(build) for _, _, build in charts]
+        for (message, name, _), future in zip(charts, futures):
+            print(message)
+            try:
+                chart = future.result()
+                print(f"✅ {name[0].upper() + name[1:]} created successfully (Figure object: {type(chart)})")
+            except Exception as e:
+                print(f"❌ Error creating {name}: {e}")
     
     print("🎨 All visualizations tested successfully!")
 
@@ -242,62 +269,57 @@ def demonstrate_metrics_analysis(metrics_collector: MetricsCollector):
     """Demonstrate metrics analysis capabilities"""
     print("\n📈 Demonstrating metrics analysis capabilities...")
     
-    # Performance metrics analysis
+    # Performance metrics analysis, reduced straight from the columnar view
     print("🖥️ Analyzing performance metrics...")
-    performance_metrics = metrics_collector.get_metrics_history("performance", hours=24)
+    performance = metrics_collector.get_columns("performance", hours=24)
     
-    if performance_metrics:
-        cpu_values = [m.cpu_usage for m in performance_metrics]
-        memory_values = [m.memory_usage for m in performance_metrics]
-        response_times = [m.response_time for m in performance_metrics if m.response_time]
+    if performance and performance["cpu_usage"].size:
+        cpu_values = performance["cpu_usage"]
+        memory_values = performance["memory_usage"]
+        response_times = performance["response_time"]
+        response_times = response_times[~np.isnan(response_times)]  # unset values are NaN
         
         print(f"   📊 Performance Summary (24h):")
-        print(f"   • CPU Usage: Avg={np.mean(cpu_values):.1f}%, Min={np.min(cpu_values):.1f}%, Max={np.max(cpu_values):.1f}%")
-        print(f"   • Memory Usage: Avg={np.mean(memory_values):.1f}%, Min={np.min(memory_values):.1f}%, Max={np.max(memory_values):.1f}%")
+        print(f"   • CPU Usage: Avg={cpu_values.mean():.1f}%, Min={cpu_values.min():.1f}%, Max={cpu_values.max():.1f}%")
+        print(f"   • Memory Usage: Avg={memory_values.mean():.1f}%, Min={memory_values.min():.1f}%, Max={memory_values.max():.1f}%")
         
-        if response_times:
-            print(f"   • Response Time: Avg={np.mean(response_times):.0f}ms, Min={np.min(response_times):.0f}ms, Max={np.max(response_times):.0f}ms")
+        if response_times.size:
+            print(f"   • Response Time: Avg={response_times.mean():.0f}ms, Min={response_times.min():.0f}ms, Max={response_times.max():.0f}ms")
     
     # Training metrics analysis
     print("🎓 Analyzing training metrics...")
-    training_metrics = metrics_collector.get_metrics_history("training", hours=24)
+    training = metrics_collector.get_columns("training", hours=24)
     
-    if training_metrics:
-        training_losses = [m.training_loss for m in training_metrics]
-        validation_losses = [m.validation_loss for m in training_metrics if m.validation_loss]
-        accuracies = [m.accuracy for m in training_metrics if m.accuracy]
+    if training and training["training_loss"].size:
+        training_losses = training["training_loss"]
+        validation_losses = training["validation_loss"][~np.isnan(training["validation_loss"])]
+        accuracies = training["accuracy"][~np.isnan(training["accuracy"])]
         
         print(f"   📊 Training Summary:")
         print(f"   • Training Loss: Final={training_losses[-1]:.4f}, Improvement={training_losses[0] - training_losses[-1]:.4f}")
         
-        if validation_losses:
+        if validation_losses.size:
             print(f"   • Validation Loss: Final={validation_losses[-1]:.4f}")
         
-        if accuracies:
+        if accuracies.size:
             print(f"   • Model Accuracy: Final={accuracies[-1]:.2%}, Improvement={accuracies[-1] - accuracies[0]:.2%}")
     
     # User metrics analysis
     print("👥 Analyzing user interaction metrics...")
-    user_metrics = metrics_collector.get_metrics_history("user", hours=24)
+    users = metrics_collector.get_columns("user", hours=24)
     
-    if user_metrics:
-        accuracies = [m.accuracy for m in user_metrics]
-        engagement_scores = [m.engagement_score for m in user_metrics]
-        response_times = [m.response_time for m in user_metrics]
-        
+    if users and users["accuracy"].size:
         print(f"   📊 User Interaction Summary:")
-        print(f"   • Average Accuracy: {np.mean(accuracies):.1%}")
-        print(f"   • Average Engagement: {np.mean(engagement_scores):.1f}/10")
-        print(f"   • Average Response Time: {np.mean(response_times):.0f}ms")
+        print(f"   • Average Accuracy: {users['accuracy'].mean():.1%}")
+        print(f"   • Average Engagement: {users['engagement_score'].mean():.1f}/10")
+        print(f"   • Average Response Time: {users['response_time'].mean():.0f}ms")
         
-        # Subject popularity
-        subject_counts = {}
-        for m in user_metrics:
-            subject_counts[m.subject] = subject_counts.get(m.subject, 0) + 1
+        # Subject popularity, counted in one pass over the subject column
+        values, counts = np.unique(users["subject"], return_counts=True)
         
-        if subject_counts:
-            most_popular = max(subject_counts, key=subject_counts.get)
-            print(f"   • Most Popular Subject: {most_popular} ({subject_counts[most_popular]} interactions)")
+        if counts.size:
+            top = counts.argmax()
+            print(f"   • Most Popular Subject: {values[top]} ({counts[top]} interactions)")
     
     print("📈 Metrics analysis completed successfully!")
 
@@ -306,59 +328,29 @@ def export_demo_data(metrics_collector: MetricsCollector):
     print("\n💾 Exporting demo data...")
     
     try:
+        if PARQUET_AVAILABLE:
+            export_parquet(metrics_collector)
+            return
+        
+        now = datetime.now()
+        now_iso = now.isoformat()
         export_data = {
-            "export_timestamp": datetime.now().isoformat(),
+            "export_timestamp": now_iso,
             "demo_info": {
                 "description": "SmartLearn Comprehensive Demo Data",
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": now_iso,
                 "total_performance_metrics": len(metrics_collector.performance_metrics),
                 "total_training_metrics": len(metrics_collector.training_metrics),
                 "total_user_metrics": len(metrics_collector.user_metrics)
             },
-            "performance_metrics": [
-                {
-                    "timestamp": m.timestamp.isoformat(),
-                    "cpu_usage": m.cpu_usage,
-                    "memory_usage": m.memory_usage,
-                    "gpu_memory_used": m.gpu_memory_used,
-                    "gpu_memory_total": m.gpu_memory_total,
-                    "response_time": m.response_time,
-                    "model_accuracy": m.model_accuracy,
-                    "user_engagement": m.user_engagement
-                }
-                for m in metrics_collector.performance_metrics
-            ],
-            "training_metrics": [
-                {
-                    "epoch": m.epoch,
-                    "step": m.step,
-                    "training_loss": m.training_loss,
-                    "validation_loss": m.validation_loss,
-                    "learning_rate": m.learning_rate,
-                    "accuracy": m.accuracy,
-                    "timestamp": m.timestamp.isoformat() if m.timestamp else None
-                }
-                for m in metrics_collector.training_metrics
-            ],
-            "user_metrics": [
-                {
-                    "timestamp": m.timestamp.isoformat(),
-                    "user_id": m.user_id,
-                    "action": m.action,
-                    "subject": m.subject,
-                    "difficulty": m.difficulty,
-                    "response_time": m.response_time,
-                    "accuracy": m.accuracy,
-                    "engagement_score": m.engagement_score
-                }
-                for m in metrics_collector.user_metrics
-            ]
+            "performance_metrics": column_records(metrics_collector.get_columns("performance")),
+            "training_metrics": column_records(metrics_collector.get_columns("training")),
+            "user_metrics": column_records(metrics_collector.get_columns("user"))
         }
         
         # Save to file
-        filename = f"demo_metrics_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w') as f:
-            json.dump(export_data, f, indent=2)
+        filename = f"demo_metrics_data_{now.strftime('%Y%m%d_%H%M%S')}.json"
+        write_json(filename, export_data)
         
         print(f"✅ Demo data exported to: {filename}")
         print(f"   📁 File size: {os.path.getsize(filename) / 1024:.1f} KB")
@@ -366,6 +358,65 @@ def export_demo_data(metrics_collector: MetricsCollector):
     except Exception as e:
         print(f"❌ Error exporting data: {e}")
 
+def column_records(columns):
+    """Turn a collector column set back into JSON-ready row dicts
+    
+    Timestamps are formatted for the whole column at once and unset
+    (NaN) floats become None, as in the original records.
+    """
+    values = {}
+    for name, column in columns.items():
+        if column.dtype.kind == 'M':
+            values[name] = np.datetime_as_string(column, unit='us').tolist()
+        elif column.dtype.kind == 'f':
+            if column.dtype.itemsize < 8:
+                # Parse back the shortest decimal repr so half/single precision
+                # scores export as 0.8237 rather than 0.82373046875
+                column = column.astype(str).astype(np.float64)
+            values[name] = np.where(np.isnan(column), None, column).tolist()
+        else:
+            values[name] = column.tolist()
+    return [dict(zip(values, row)) for row in zip(*values.values())]
+
+def export_parquet(metrics_collector: MetricsCollector):
+    """Export each metric history as a Snappy-compressed Parquet file
+    
+    The columnar layout is written straight from the collector's NumPy
+    columns (half floats widened to float32); a small JSON sidecar keeps
+    the human-readable summary.
+    """
+    now = datetime.now()
+    stamp = now.strftime('%Y%m%d_%H%M%S')
+    files = {}
+    for metric_type in ("performance", "training", "user"):
+        filename = f"demo_metrics_{metric_type}_{stamp}.parquet"
+        columns = {
+            # pyarrow only writes half floats to Parquet from 15.0 on
+            name: values.astype(np.float32) if values.dtype == np.float16 else values
+            for name, values in metrics_collector.get_columns(metric_type).items()
+        }
+        pd.DataFrame(columns).to_parquet(filename, compression="snappy", index=False)
+        files[metric_type] = filename
+    
+    now_iso = now.isoformat()
+    summary = {
+        "export_timestamp": now_iso,
+        "demo_info": {
+            "description": "SmartLearn Comprehensive Demo Data",
+            "generated_at": now_iso,
+            "total_performance_metrics": len(metrics_collector.performance_metrics),
+            "total_training_metrics": len(metrics_collector.training_metrics),
+            "total_user_metrics": len(metrics_collector.user_metrics)
+        },
+        "files": files
+    }
+    summary_file = f"demo_metrics_data_{stamp}.json"
+    write_json(summary_file, summary, indent=True)
+    
+    print(f"✅ Demo data exported to: {summary_file}")
+    for filename in files.values():
+        print(f"   📁 {filename}: {os.path.getsize(filename) / 1024:.1f} KB")
+
 def main():
     """Main demonstration function"""
     print("🚀 SmartLearn Metrics & Visualization Demo")
@@ -402,7 +453,7 @@ def main():
     print("📊 What you can do next:")
     print("1. Run the metrics dashboard: ./start_metrics_dashboard.sh")
     print("2. View real-time visualizations in your browser")
-    print("3. Analyze the exported JSON data in external tools")
+    print("3. Analyze the exported Parquet/JSON data in external tools")
     print("4. Integrate metrics collection into your main SmartLearn app")
     print("5. Customize visualizations for your specific needs")
     print("=" * 50)
@@ -8,31 +8,64 @@
 import sys
 import subprocess
 import json
-import requests
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Read-only git probes for check_git_status, run concurrently
+GIT_CHECKS = [
+    ['git', 'status'],
+    ['git', 'diff', '--name-only'],
+    ['git', 'remote', 'get-url', 'origin'],
+]
+
+def write_if_changed(path, content):
+    """Write content (str or bytes) to path unless the file already holds it
+    
+    Returns True if the file was written, so reruns leave unchanged files
+    (and their mtimes) alone.
+    """
+    data = content.encode() if isinstance(content, str) else content
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
 def check_git_status():
     """Check if the repository is ready for deployment"""
     print("🔍 Checking Git repository status...")
     
     try:
+        # The probes are independent, so start all three processes at once
+        with ThreadPoolExecutor(max_workers=len(GIT_CHECKS)) as executor:
+            status, diff, remote = executor.map(
+                lambda cmd: subprocess.run(cmd, capture_output=True, text=True), GIT_CHECKS
+            )
+        
         # Check if we're in a git repository
-        result = subprocess.run(['git', 'status'], capture_output=True, text=True)
-        if result.returncode != 0:
+        if status.returncode != 0:
             print("❌ Not in a Git repository. Please run this from your SmartLearn project directory.")
             return False
         
         # Check for uncommitted changes
-        result = subprocess.run(['git', 'diff', '--name-only'], capture_output=True, text=True)
-        if result.stdout.strip():
+        if diff.stdout.strip():
             print("⚠️  You have uncommitted changes. Consider committing them before deployment.")
             response = input("Continue with deployment? (y/N): ")
             if response.lower() != 'y':
                 return False
         
         # Check if remote origin exists
-        result = subprocess.run(['git', 'remote', 'get-url', 'origin'], capture_output=True, text=True)
-        if result.returncode != 0:
+        if remote.returncode != 0:
             print("❌ No remote origin found. Please add your GitHub repository as origin.")
             return False
         
@@ -60,7 +93,7 @@ def create_deployment_files():
     # Create requirements.txt for deployment if it doesn't exist
     if not Path("requirements.txt").exists():
         print("📦 Creating requirements.txt for deployment...")
-        subprocess.run(['cp', 'requirements_deployment.txt', 'requirements.txt'])
+        shutil.copyfile('requirements_deployment.txt', 'requirements.txt')
     
     print("✅ Deployment files created successfully")
     return True
@@ -75,10 +108,19 @@ def check_dependencies():
         "src/app_final_corrected.py"
     ]
     
-    missing_files = []
-    for file_path in required_files:
-        if not Path(file_path).exists():
-            missing_files.append(file_path)
+    # One directory listing per parent instead of a stat per file
+    listings = {}
+    for parent in {os.path.dirname(file_path) or "." for file_path in required_files}:
+        try:
+            with os.scandir(parent) as entries:
+                listings[parent] = {entry.name for entry in entries}
+        except OSError:
+            listings[parent] = set()
+    
+    missing_files = [
+        file_path for file_path in required_files
+        if os.path.basename(file_path) not in listings[os.path.dirname(file_path) or "."]
+    ]
     
     if missing_files:
         print(f"❌ Missing required files: {', '.join(missing_files)}")
@@ -160,8 +202,7 @@ def create_deployment_readme():
 - Regular updates and dependency management
 """
     
-    with open("DEPLOYMENT_GUIDE.md", "w") as f:
-        f.write(readme_content)
+    write_if_changed("DEPLOYMENT_GUIDE.md", readme_content)
     
     print("✅ Deployment documentation created")
     return True
@@ -210,8 +251,7 @@ def create_dockerfile():
 CMD ["streamlit", "run", "src/app_final_corrected.py", "--server.port=8501", "--server.address=0.0.0.0"]
 """
     
-    with open("Dockerfile", "w") as f:
-        f.write(dockerfile_content)
+    write_if_changed("Dockerfile", dockerfile_content)
     
     print("✅ Dockerfile created")
     return True
@@ -222,13 +262,11 @@ def create_heroku_files():
     
     # Create Procfile
     procfile_content = "web: streamlit run src/app_final_corrected.py --server.port=$PORT --server.address=0.0.0.0"
-    with open("Procfile", "w") as f:
-        f.write(procfile_content)
+    write_if_changed("Procfile", procfile_content)
     
     # Create runtime.txt
     runtime_content = "python-3.9.18"
-    with open("runtime.txt", "w") as f:
-        f.write(runtime_content)
+    write_if_changed("runtime.txt", runtime_content)
     
     # Create app.json for Heroku
     app_json = {
@@ -251,8 +289,10 @@ def create_heroku_files():
         ]
     }
     
-    with open("app.json", "w") as f:
-        json.dump(app_json, f, indent=2)
+    if ORJSON_AVAILABLE:
+        write_if_changed("app.json", orjson.dumps(app_json, option=orjson.OPT_INDENT_2))
+    else:
+        write_if_changed("app.json", json.dumps(app_json, indent=2))
     
     print("✅ Heroku deployment files created")
     return True
@@ -303,8 +343,7 @@ def create_github_actions():
 """
     
     workflow_file = workflows_dir / "deploy.yml"
-    with open(workflow_file, "w") as f:
-        f.write(workflow_content)
+    write_if_changed(workflow_file, workflow_content)
     
     print("✅ GitHub Actions workflow created")
     return True
@@ -382,8 +421,12 @@ def main():
     print("📝 Committing deployment files...")
     try:
         subprocess.run(['git', 'add', '.'], check=True)
-        subprocess.run(['git', 'commit', '-m', 'Add deployment configuration files'], check=True)
-        print("✅ Deployment files committed to Git")
+        # Skip the commit when a rerun left everything as it was
+        if subprocess.run(['git', 'diff', '--cached', '--quiet']).returncode == 0:
+            print("✅ Deployment files already up to date, nothing to commit")
+        else:
+            subprocess.run(['git', 'commit', '-m', 'Add deployment configuration files'], check=True)
+            print("✅ Deployment files committed to Git")
     except subprocess.CalledProcessError:
         print("⚠️  Failed to commit deployment files. Please commit manually.")
     
@@ -6,17 +6,34 @@
 
 import sys
 import os
-sys.path.append('src')
+import torch
 
-from src.core.advanced_features import SmartLearnAdvanced
-from src.core.fine_tuning import FineTuningPipeline, TrainingExample
-import json
+from src.core.fine_tuning import DataCollector, release_device_memory
+
+def between_phases(advanced):
+    """Drop the finished Trainer (optimizer state, gradients) and its cached device memory."""
+    advanced.fine_tuning_pipeline.fine_tuner.trainer = None
+    release_device_memory()
 
 def main():
     print("🚀 Starting SmartLearn Fine-Tuning Process...")
     
+    # Autotune cuDNN kernels per shape and allow TF32 matmuls (no-ops without CUDA)
+    torch.backends.cudnn.benchmark = True
+    torch.set_float32_matmul_precision("high")
+    
+    # Check training data before booting RAG, embeddings and models
+    print("\n📈 Training Data Status:")
+    example_count = DataCollector().count()
+    print(f"   - Total Examples: {example_count}")
+    
+    if example_count < 10:
+        print("❌ Need at least 10 training examples to start fine-tuning")
+        return
+    
     # Initialize advanced features
-    print("📚 Initializing SmartLearn Advanced Features...")
+    print("\n📚 Initializing SmartLearn Advanced Features...")
+    from src.core.advanced_features import SmartLearnAdvanced
     advanced = SmartLearnAdvanced()
     
     # Check current status
@@ -26,18 +43,11 @@ def main():
     print(f"   - Fine-tuning: {status['fine_tuning']}")
     print(f"   - Multimodal: {status['multimodal']}")
     
-    # Check training data
-    print("\n📈 Training Data Status:")
-    training_data = advanced.fine_tuning_pipeline.data_collector.examples
-    print(f"   - Total Examples: {len(training_data)}")
-    
-    if len(training_data) < 10:
-        print("❌ Need at least 10 training examples to start fine-tuning")
-        return
+    data_collector = advanced.fine_tuning_pipeline.data_collector
     
     # Display sample training examples
     print("\n🔍 Sample Training Examples:")
-    for i, example in enumerate(training_data[:3]):
+    for i, example in enumerate(data_collector.examples[:3]):
         print(f"   Example {i+1}:")
         print(f"     Input: {example.input_text[:100]}...")
         print(f"     Target: {example.target_text[:100]}...")
@@ -54,19 +64,27 @@ def main():
         metrics = advanced.run_fine_tuning()
         
         if metrics:
-            print("\n✅ Fine-Tuning Completed Successfully!")
-            print("\n📊 Training Results:")
-            print(f"   - Training Time: {metrics.training_time:.2f} seconds")
-            print(f"   - Final Loss: {metrics.loss:.4f}")
-            print(f"   - Perplexity: {metrics.perplexity:.4f}")
-            print(f"   - Accuracy: {metrics.accuracy:.4f}")
-            print(f"   - Precision: {metrics.precision:.4f}")
-            print(f"   - Recall: {metrics.recall:.4f}")
-            print(f"   - F1 Score: {metrics.f1_score:.4f}")
+            # One write keeps the results block together in logs
+            sys.stdout.write("\n".join([
+                "\n✅ Fine-Tuning Completed Successfully!",
+                "\n📊 Training Results:",
+                f"   - Training Time: {metrics.training_time:.2f} seconds",
+                f"   - Final Loss: {metrics.loss:.4f}",
+                f"   - Perplexity: {metrics.perplexity:.4f}",
+                f"   - Accuracy: {metrics.accuracy:.4f}",
+                f"   - Precision: {metrics.precision:.4f}",
+                f"   - Recall: {metrics.recall:.4f}",
+                f"   - F1 Score: {metrics.f1_score:.4f}",
+            ]) + "\n")
+            sys.stdout.flush()
+            
+            # Free training memory so evaluation starts from a clean allocator
+            between_phases(advanced)
             
             # Evaluate the fine-tuned model
             print("\n🔍 Evaluating Fine-Tuned Model...")
-            eval_metrics = advanced.evaluate_fine_tuned_model()
+            with torch.inference_mode():  # No autograd bookkeeping during generation
+                eval_metrics = advanced.evaluate_fine_tuned_model()
             
             if eval_metrics:
                 print("\n📈 Evaluation Results:")
@@ -88,6 +106,9 @@ def main():
         print(f"\n❌ Fine-tuning failed with error: {e}")
         print("   Check the error details above and ensure you have sufficient resources.")
         print("   Fine-tuning requires significant computational resources and time.")
+    
+    finally:
+        between_phases(advanced)
 
 if __name__ == "__main__":
     main()
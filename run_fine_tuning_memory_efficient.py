@@ -6,91 +6,142 @@
 
 import sys
 import os
-sys.path.append('src')
 
-from src.core.fine_tuning import FineTuningPipeline, TrainingExample
+from src.core.fine_tuning import (
+    DATASETS_AVAILABLE, FineTuner, FineTuningPipeline,
+    dataloader_kwargs, release_device_memory
+)
 import torch
-import gc
+import torch.nn.functional as F
+from torch.nn.utils.rnn import pad_sequence
+from packaging import version
 
-def main():
-    print("🚀 Starting Memory-Efficient SmartLearn Fine-Tuning...")
-    
-    # Set memory-efficient PyTorch settings for M3
-    os.environ['PYTORCH_MPS_HIGH_WATERMARK_RATIO'] = '0.8'
-    os.environ['PYTORCH_MPS_LOW_WATERMARK_RATIO'] = '0.6'
-    
-    print("🔧 Optimizing for Apple M3 GPU memory...")
+try:
+    from peft import LoraConfig, TaskType, get_peft_model
+    PEFT_AVAILABLE = True
+except ImportError:
+    PEFT_AVAILABLE = False
+
+try:
+    import bitsandbytes  # noqa: F401 - backs the 8-bit AdamW optimizer
+    BNB_AVAILABLE = True
+except ImportError:
+    BNB_AVAILABLE = False
+
+# LoRA adapters on the GPT-2 style attention/MLP projections of DialoGPT
+LORA_RANK = 8
+LORA_ALPHA = 32
+LORA_DROPOUT = 0.05
+LORA_TARGET_MODULES = ["c_attn", "c_proj"]
+
+def training_precision():
+    """Base weight dtype, optimizer and AMP flag for the current device
     
-    # Initialize fine-tuning pipeline
-    print("📚 Initializing Fine-Tuning Pipeline...")
-    pipeline = FineTuningPipeline(base_model="microsoft/DialoGPT-medium")
+    Frozen base weights can be held in fp16 only when LoRA adapters (kept in
+    fp32 by peft) are what actually trains; CPU runs stay in fp32.
+    """
+    on_cuda = torch.cuda.is_available()
+    half_weights = PEFT_AVAILABLE and (on_cuda or torch.backends.mps.is_available())
+    if on_cuda:
+        optim = "adamw_bnb_8bit" if BNB_AVAILABLE else "adamw_torch_fused"
+    else:
+        optim = "adamw_torch"
+    return (torch.float16 if half_weights else None), optim, on_cuda
+
+def torch_compile_enabled():
+    """Compile the model only on CUDA with PyTorch >= 2.1
     
-    # Check training data
-    training_data = pipeline.data_collector.examples
-    print(f"📈 Training Data: {len(training_data)} examples")
+    MPS falls back to eager for many ops under dynamic shapes, so the
+    compile time would not pay off there.
+    """
+    return torch.cuda.is_available() and version.parse(torch.__version__).release >= (2, 1)
+
+class FastCausalCollator:
+    """Pad a batch of token ids for causal LM training in a few tensor ops
     
-    if len(training_data) < 10:
-        print("❌ Need at least 10 training examples")
-        return
+    Labels are the input ids with padding masked to -100, so padded
+    positions never contribute to the loss.
+    """
     
-    # Create memory-efficient training configuration
-    print("⚙️ Creating memory-efficient training configuration...")
+    def __init__(self, pad_id: int, pad_to_multiple_of: int = 8):
+        self.pad_id = pad_id
+        self.pad_to_multiple_of = pad_to_multiple_of
     
-    # Modify the fine-tuner for memory efficiency
-    fine_tuner = pipeline.fine_tuner
+    def __call__(self, features):
+        input_ids = pad_sequence(
+            [torch.as_tensor(f["input_ids"], dtype=torch.long) for f in features],
+            batch_first=True, padding_value=self.pad_id
+        )
+        attention_mask = pad_sequence(
+            [torch.as_tensor(f["attention_mask"], dtype=torch.long) if "attention_mask" in f
+             else torch.ones(len(f["input_ids"]), dtype=torch.long) for f in features],
+            batch_first=True, padding_value=0
+        )
+        
+        # Round the width up so matmul shapes stay aligned
+        extra = -input_ids.size(1) % self.pad_to_multiple_of
+        if extra:
+            input_ids = F.pad(input_ids, (0, extra), value=self.pad_id)
+            attention_mask = F.pad(attention_mask, (0, extra), value=0)
+        
+        return {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask,
+            "labels": input_ids.masked_fill(attention_mask == 0, -100),
+        }
+
+class MemoryEfficientFineTuner(FineTuner):
+    """FineTuner whose training setup fits DialoGPT-medium into Apple M3 memory."""
     
-    # Use smaller batch sizes and gradient accumulation
-    training_args = type('TrainingArgs', (), {
-        'output_dir': fine_tuner.output_dir,
-        'num_train_epochs': 1,  # Reduce epochs for memory
-        'per_device_train_batch_size': 1,  # Minimal batch size
-        'per_device_eval_batch_size': 1,
-        'gradient_accumulation_steps': 8,  # Accumulate gradients
-                'warmup_steps': 50,
-        'weight_decay': 0.01,
-        'logging_dir': f"{fine_tuner.output_dir}/logs",
-        'logging_steps': 50,
-        'eval_strategy': "steps",
-        'eval_steps': 200,
-        'save_steps': 200,
-        'save_total_limit': 1,
-        'load_best_model_at_end': True,
-        'metric_for_best_model': "eval_loss",
-        'greater_is_better': False,
-        'dataloader_pin_memory': False,  # Disable for M3
-        'dataloader_num_workers': 0,     # Single worker
-    })()
-    
-    # Override the setup_training method
-    def setup_training_memory_efficient(self, train_dataset, val_dataset):
+    def setup_training(self, train_dataset, val_dataset):
         """Memory-efficient training setup."""
-        from transformers import TrainingArguments, Trainer, DataCollatorForLanguageModeling
+        from transformers import TrainingArguments, Trainer
+        
+        # Recompute activations in the backward pass instead of keeping them all
+        self.model.config.use_cache = False
+        self.model.gradient_checkpointing_enable(gradient_checkpointing_kwargs={"use_reentrant": False})
         
+        # Train low-rank adapters only, so optimizer state covers a tiny slice of the weights
+        if PEFT_AVAILABLE and not hasattr(self.model, "peft_config"):
+            lora_config = LoraConfig(
+                r=LORA_RANK,
+                lora_alpha=LORA_ALPHA,
+                lora_dropout=LORA_DROPOUT,
+                target_modules=LORA_TARGET_MODULES,
+                fan_in_fan_out=True,  # GPT-2 projections are Conv1D layers
+                task_type=TaskType.CAUSAL_LM,
+            )
+            self.model = get_peft_model(self.model, lora_config)
+            self.model.print_trainable_parameters()
+        
+        _, optim, use_amp = training_precision()
         training_args = TrainingArguments(
             output_dir=self.output_dir,
             num_train_epochs=1,
             per_device_train_batch_size=1,
             per_device_eval_batch_size=1,
             gradient_accumulation_steps=8,
+            gradient_checkpointing=True,
+            gradient_checkpointing_kwargs={"use_reentrant": False},
+            optim=optim,
+            fp16=use_amp,  # AMP on CUDA only; MPS keeps fp16 weights without autocast
+            bf16=False,
             warmup_steps=50,
             weight_decay=0.01,
             logging_dir=f"{self.output_dir}/logs",
             logging_steps=50,
             eval_strategy="steps",
             eval_steps=200,
-            save_steps=500,
-            save_total_limit=1,
-            load_best_model_at_end=True,
-            metric_for_best_model="eval_loss",
-            greater_is_better=False,
-            dataloader_pin_memory=False,
-            dataloader_num_workers=0,
+            save_strategy="no",  # No intermediate checkpoints; save_model() writes once at the end
+            **dataloader_kwargs(),
+            group_by_length=DATASETS_AVAILABLE,  # Batch similar lengths to cut padding
+            length_column_name="length",
+            # Trainer compiles the wrapped model and still saves the uncompiled weights
+            torch_compile=torch_compile_enabled(),
+            torch_compile_mode="reduce-overhead",
         )
         
-        data_collator = DataCollatorForLanguageModeling(
-            tokenizer=self.tokenizer,
-            mlm=False
-        )
+        data_collator = FastCausalCollator(pad_id=self.tokenizer.pad_token_id, pad_to_multiple_of=8)
         
         self.trainer = Trainer(
             model=self.model,
@@ -99,25 +150,70 @@ def setup_training_memory_efficient(self, train_dataset, val_dataset):
             eval_dataset=val_dataset,
             data_collator=data_collator,
         )
+        
+        # Defragment accelerator memory before the Trainer allocates activations
+        release_device_memory()
+
+def main():
+    print("🚀 Starting Memory-Efficient SmartLearn Fine-Tuning...")
+    
+    # Autotune cuDNN kernels per shape and allow TF32 matmuls (no-ops without CUDA)
+    torch.backends.cudnn.benchmark = True
+    torch.set_float32_matmul_precision("high")
+    
+    # Set memory-efficient PyTorch settings for M3
+    os.environ['PYTORCH_MPS_HIGH_WATERMARK_RATIO'] = '0.8'
+    os.environ['PYTORCH_MPS_LOW_WATERMARK_RATIO'] = '0.6'
+    
+    print("🔧 Optimizing for Apple M3 GPU memory...")
+    
+    # Initialize fine-tuning pipeline
+    print("📚 Initializing Fine-Tuning Pipeline...")
+    weight_dtype, _, _ = training_precision()
+    pipeline = FineTuningPipeline(base_model="microsoft/DialoGPT-medium", torch_dtype=weight_dtype)
+    release_device_memory()  # Drop load-time temporaries before training allocates
+    
+    # Check training data
+    example_count = pipeline.data_collector.count()
+    print(f"📈 Training Data: {example_count} examples")
+    
+    if example_count < 10:
+        print("❌ Need at least 10 training examples")
+        return
     
-    # Replace the method
-    fine_tuner.setup_training = setup_training_memory_efficient.__get__(fine_tuner)
+    # Create memory-efficient training configuration
+    print("⚙️ Creating memory-efficient training configuration...")
+    
+    # Modify the fine-tuner for memory efficiency
+    fine_tuner = pipeline.fine_tuner
+    
+    # Swap in the memory-efficient training setup
+    fine_tuner.__class__ = MemoryEfficientFineTuner
     
     try:
         print("🎯 Starting Memory-Efficient Fine-Tuning...")
         print("   - Batch Size: 1 (with gradient accumulation)")
         print("   - Epochs: 1 (to fit in memory)")
         print("   - Gradient Accumulation: 8 steps")
+        print("   - Gradient Checkpointing: enabled")
+        if PEFT_AVAILABLE:
+            print(f"   - LoRA Adapters: r={LORA_RANK} on {', '.join(LORA_TARGET_MODULES)}")
+        else:
+            print("   - LoRA Adapters: unavailable (pip install peft), training all parameters")
         
         # Run fine-tuning
         metrics = pipeline.run_fine_tuning()
         
         if metrics:
-            print("\n✅ Fine-Tuning Completed Successfully!")
-            print("\n📊 Training Results:")
-            print(f"   - Training Time: {metrics.training_time:.2f} seconds")
-            print(f"   - Final Loss: {metrics.loss:.4f}")
-            print(f"   - Perplexity: {metrics.perplexity:.4f}")
+            # One write keeps the results block together in logs
+            sys.stdout.write("\n".join([
+                "\n✅ Fine-Tuning Completed Successfully!",
+                "\n📊 Training Results:",
+                f"   - Training Time: {metrics.training_time:.2f} seconds",
+                f"   - Final Loss: {metrics.loss:.4f}",
+                f"   - Perplexity: {metrics.perplexity:.4f}",
+            ]) + "\n")
+            sys.stdout.flush()
             
             # Check if model was saved
             model_path = "models/fine_tuned/final_model"
@@ -138,9 +234,7 @@ def setup_training_memory_efficient(self, train_dataset, val_dataset):
         print("   - Consider using CPU training if GPU memory is insufficient")
         
         # Clean up GPU memory
-        if torch.mps.is_available():
-            torch.mps.empty_cache()
-        gc.collect()
+        release_device_memory()
 
 if __name__ == "__main__":
     main()
@@ -5,17 +5,65 @@
 """
 
 import streamlit as st
+import pandas as pd
+import functools
+import gc
 import os
 import json
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
 
-# Local modules
-from core.generator import LLM
-from core.advanced_features import SmartLearnAdvanced, create_advanced_smartlearn
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # copy uploads to disk in 1 MB chunks
+# Uploaded photos are downscaled to this longest side before processing;
+# enough for OCR, and well above the captioning model's input resolution
+UPLOAD_IMAGE_MAX_SIDE = 1024
+DOWNSCALE_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+JOB_POLL_INTERVAL = 1.0  # seconds between background job status checks
+COMPLETION_CACHE_TTL = 3600  # seconds generated text is reused for
+COMPLETION_CACHE_MAX_ENTRIES = 128
+SOURCE_COLUMNS = ["source", "relevance_score", "content_type", "chunk_id", "content"]
+SOURCE_PREVIEW_CHARS = 200
+PROMPT_PREVIEW_CHARS = 500
+FILE_STAMP_FORMAT = "%Y%m%d_%H%M%S"  # suffix for downloaded file names
+FT_BUFFER_MAX_SIZE = 32  # flush buffered training examples at this many...
+FT_BUFFER_MAX_WAIT = 2.0  # ...or this many seconds after the first was queued
+
+# Sampling settings per generated learning-experience component
+COMPONENT_GENERATION_PARAMS = {
+    "study_plan": {"temperature": 0.7, "max_tokens": 1500},
+    "explanation": {"temperature": 0.6, "max_tokens": 1200},
+    "quiz": {"temperature": 0.7, "max_tokens": 2000},
+}
+
+# Learning type -> (component, prompt title, button label, output title)
+LEARNING_OUTPUTS = {
+    "Study Plan": ("study_plan", "📚 Generated Study Plan Prompt", "🎯 Generate Study Plan", "📖 Your Personalized Study Plan"),
+    "Explanation": ("explanation", "📖 Generated Explanation Prompt", "💡 Generate Explanation", "🧠 Your Personalized Explanation"),
+    "Quiz": ("quiz", "🎯 Generated Quiz Prompt", "📝 Generate Quiz", "🧪 Your Personalized Quiz"),
+}
 
 # Load environment variables
 load_dotenv()
+DEBUG_ALLOWED = os.getenv("SMARTLEARN_DEBUG") == "1"
 
 # Page configuration
 st.set_page_config(
@@ -26,7 +74,7 @@
 )
 
 # Custom CSS for enhanced UI
-st.markdown("""
+CSS = """
 <style>
     .main-header {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -90,13 +138,78 @@
         box-shadow: 0 8px 25px rgba(0,0,0,0.3);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+HEADER_HTML = """
+<div class="main-header">
+    <h1>🚀 SmartLearn Advanced</h1>
+    <h3>AI-Powered Learning Platform with Advanced Features</h3>
+    <p>Enhanced Prompting • Advanced RAG • Fine-Tuning • Multimodal Integration</p>
+</div>
+"""
+
+# Static dashboard cards, built once at import
+FEATURE_CARDS = {
+    "prompting": ("🧠 Enhanced Prompt Engineering", [
+        "Chain-of-thought reasoning",
+        "Few-shot learning examples",
+        "Dynamic context adaptation",
+        "Performance-based prompts",
+    ]),
+    "rag": ("🔍 Advanced RAG System", [
+        "Hybrid semantic + keyword search",
+        "Query expansion & optimization",
+        "Multi-modal document support",
+        "Adaptive content chunking",
+    ]),
+    "fine_tuning": ("🎯 Fine-Tuning Pipeline", [
+        "User interaction data collection",
+        "Synthetic data generation",
+        "Custom model training",
+        "Performance evaluation",
+    ]),
+    "multimodal": ("🖼️ Multimodal Integration", [
+        "Image processing & captioning",
+        "Audio transcription & analysis",
+        "Video content processing",
+        "Cross-modal relationships",
+    ]),
+}
+
+FEATURE_CARD_HTML = {
+    name: '<div class="feature-card"><h3>{}</h3>{}</div>'.format(
+        title, "".join(f"<p>• {item}</p>" for item in items)
+    )
+    for name, (title, items) in FEATURE_CARDS.items()
+}
+
+STATUS_CARD_TEMPLATE = """
+<div class="metric-card">
+    <strong>{label}:</strong><br>
+    <span class="status-indicator status-success"></span>{status}{detail}
+</div>
+"""
+
+def inject_css():
+    """Inject the global stylesheet (the page is rebuilt on every rerun)."""
+    st.markdown(CSS, unsafe_allow_html=True)
+
+@st.cache_data(ttl=5)
+def render_status_cards(rag_status, rag_count, ft_status, ft_examples, mm_status):
+    """Build the sidebar status cards for the given status values."""
+    return (
+        STATUS_CARD_TEMPLATE.format(label="RAG System", status=rag_status, detail=f"<br>\n    Documents: {rag_count}"),
+        STATUS_CARD_TEMPLATE.format(label="Fine-Tuning", status=ft_status, detail=f"<br>\n    Training Examples: {ft_examples}"),
+        STATUS_CARD_TEMPLATE.format(label="Multimodal", status=mm_status, detail=""),
+    )
 
 # Initialize advanced features
-@st.cache_resource
+@st.cache_resource(max_entries=1, show_spinner=False)
 def init_advanced_features():
     """Initialize advanced features system."""
     try:
+        # Imported lazily: pulls in the RAG/fine-tuning/multimodal stacks
+        from core.advanced_features import create_advanced_smartlearn
         advanced = create_advanced_smartlearn()
         return advanced
     except Exception as e:
@@ -104,32 +217,932 @@ def init_advanced_features():
         return None
 
 # Initialize LLM
-@st.cache_resource
+@st.cache_resource(max_entries=1, show_spinner=False)
 def init_llm():
     """Initialize LLM system."""
     try:
+        from core.generator import LLM
         return LLM()
     except Exception as e:
         st.error(f"Failed to initialize LLM: {e}")
         return None
 
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_status(_adv):
+    """Snapshot of the advanced features status, refreshed at most every 10s."""
+    return _adv.get_system_status()
+
+@st.cache_data(ttl=300, max_entries=256, show_spinner=False)
+def _cached_search(_adv, query, k, use_hybrid, alpha):
+    """Hybrid search results for identical queries are reused for five minutes."""
+    return _adv.advanced_search(query, k, use_hybrid, alpha)
+
+@st.cache_data(ttl=300, max_entries=256, show_spinner=False)
+def _cached_expanded_search(_adv, query, k, lambda_mult):
+    """Expanded search results for identical queries are reused for five minutes."""
+    return _adv.expand_and_search(query, k, lambda_mult)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_report(_adv):
+    """Advanced features report, its download bytes and file stamp, reused for five minutes."""
+    report = _adv.export_advanced_features_report()
+    if not report:
+        return report, None, None
+    return report, to_json_bytes(report), datetime.now().strftime(FILE_STAMP_FORMAT)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def sources_frame(sources):
+    """Tabulate RAG sources for display, truncating chunk content to a preview."""
+    df = pd.DataFrame.from_records(sources).reindex(columns=SOURCE_COLUMNS)
+    content = df["content"].fillna("").astype(str)
+    df["content"] = content.where(
+        content.str.len() <= SOURCE_PREVIEW_CHARS,
+        content.str.slice(0, SOURCE_PREVIEW_CHARS) + "...",
+    )
+    return df
+
+@st.cache_data(ttl=30, show_spinner=False)
+def content_type_series(content_types):
+    """Chunk counts per content type, ready for charting."""
+    return pd.Series(content_types, name="chunks").sort_values(ascending=False)
+
+def show_sources(sources):
+    """Render RAG sources as a single dataframe widget."""
+    df = sources_frame(sources)
+    st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "relevance_score": st.column_config.ProgressColumn(
+                "Relevance Score",
+                format="%.3f",
+                min_value=0.0,
+                max_value=max(1.0, float(df["relevance_score"].max() or 0.0)),
+            ),
+        },
+    )
+
+def stream_markdown(llm, prompt, temperature, max_tokens):
+    """Render an LLM response as it is generated and return the full text."""
+    return st.write_stream(llm.stream(prompt, temperature=temperature, max_tokens=max_tokens))
+
+def complete_all(llm, prompts):
+    """Generate several components in one batched LLM call."""
+    names = list(prompts)
+    texts = llm.batch_complete([(prompts[name], COMPONENT_GENERATION_PARAMS[name]) for name in names])
+    for name, text in zip(names, texts):
+        store_completion(prompts[name], text=text, **COMPONENT_GENERATION_PARAMS[name])
+    return dict(zip(names, texts))
+
+@st.cache_resource(show_spinner=False)
+def completion_cache():
+    """Generated text shared by all sessions: (prompt, temperature, max_tokens) -> (created, text)."""
+    return OrderedDict(), threading.Lock()
+
+def cached_completion(prompt, temperature, max_tokens):
+    """Previously generated text for these inputs, if still fresh; hits count as recent use."""
+    entries, lock = completion_cache()
+    key = (prompt, temperature, max_tokens)
+    with lock:
+        hit = entries.get(key)
+        if hit is not None and time.monotonic() - hit[0] < COMPLETION_CACHE_TTL:
+            entries.move_to_end(key)
+            return hit[1]
+        entries.pop(key, None)
+    return None
+
+def store_completion(prompt, temperature, max_tokens, text):
+    """Remember generated text; fallback replies from an unavailable model are not kept."""
+    from core.generator import OLLAMA_AVAILABLE
+    if not text or not OLLAMA_AVAILABLE:
+        return
+    entries, lock = completion_cache()
+    with lock:
+        entries[(prompt, temperature, max_tokens)] = (time.monotonic(), text)
+        while len(entries) > COMPLETION_CACHE_MAX_ENTRIES:
+            entries.popitem(last=False)
+
+def generate_markdown(prompt, temperature, max_tokens):
+    """Show cached text for repeat requests, otherwise stream a fresh response."""
+    text = cached_completion(prompt, temperature, max_tokens)
+    if text is not None:
+        st.markdown(text)
+        return text
+    llm = init_llm()
+    if llm is None:
+        st.error("❌ Language model is unavailable, so nothing was generated.")
+        return None
+    text = stream_markdown(llm, prompt, temperature, max_tokens)
+    store_completion(prompt, temperature, max_tokens, text)
+    return text
+
+def flush_training_buffer(advanced):
+    """Write all buffered training examples in a single call."""
+    buffer = st.session_state.get("ft_buffer")
+    if not buffer:
+        return 0
+    advanced.collect_training_data(buffer)
+    flushed = len(buffer)
+    st.session_state.ft_buffer = []
+    st.session_state.ft_buffer_t0 = None
+    _cached_status.clear()
+    return flushed
+
+def buffer_training_example(advanced, example):
+    """Queue a training example, flushing once the buffer is full or old enough."""
+    buffer = st.session_state.setdefault("ft_buffer", [])
+    if not buffer:
+        st.session_state.ft_buffer_t0 = time.monotonic()
+    buffer.append(example)
+    if (len(buffer) >= FT_BUFFER_MAX_SIZE
+            or time.monotonic() - st.session_state.ft_buffer_t0 >= FT_BUFFER_MAX_WAIT):
+        return flush_training_buffer(advanced)
+    return 0
+
+def debug_enabled():
+    """Per-tab timings are collected for ?debug=1, if the server allows it.
+    
+    tracemalloc is process-wide, so operators opt in with SMARTLEARN_DEBUG=1
+    rather than letting any visitor switch it on.
+    """
+    return DEBUG_ALLOWED and st.query_params.get("debug") == "1"
+
+def timed(name):
+    """Record wall time and net traced allocations of each call in debug mode."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not debug_enabled():
+                return fn(*args, **kwargs)
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            mem_before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                current, peak = tracemalloc.get_traced_memory()
+                st.session_state.setdefault("timings", {})[name] = {
+                    "time (ms)": (time.perf_counter() - start) * 1000,
+                    "allocated (KB)": (current - mem_before) / 1024,
+                    "peak (KB)": (peak - mem_before) / 1024,
+                }
+                # Don't leave the whole server paying for tracing after this call
+                if started_tracing:
+                    tracemalloc.stop()
+        return wrapper
+    return decorator
+
+def show_debug_timings():
+    """Sidebar table of the latest per-tab timings."""
+    timings = st.session_state.get("timings")
+    if not timings:
+        return
+    with st.sidebar:
+        st.markdown("## 🐞 Debug Timings")
+        st.table(pd.DataFrame.from_dict(timings, orient="index").round(1))
+
+@st.cache_resource
+def background_executor():
+    """Single worker shared by all sessions; the script module re-executes on every rerun."""
+    return ThreadPoolExecutor(max_workers=1)
+
+@st.cache_resource
+def background_jobs():
+    """Queued or running futures on the shared worker, across all sessions."""
+    return set()
+
+def submit_job(key, fn):
+    """Run fn on the background worker and keep its future in session state."""
+    future = background_executor().submit(fn)
+    jobs = background_jobs()
+    jobs.add(future)
+
+    def finished(done):
+        jobs.discard(done)
+        _cached_status.clear()
+
+    future.add_done_callback(finished)
+    st.session_state[key] = future
+
+def job_running(key):
+    """Whether the background job stored under key is still in progress."""
+    future = st.session_state.get(key)
+    return future is not None and not future.done()
+
+def worker_busy():
+    """Whether any session has a job queued or running on the shared worker."""
+    return bool(background_jobs())
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def job_status(key, label):
+    """Progress note for an unfinished job; reruns the app once it is done."""
+    future = st.session_state.get(key)
+    if future is None or future.done():
+        st.rerun()
+    if future.running():
+        st.info(f"⏳ {label} is running in the background...")
+    else:
+        st.info(f"⏳ {label} is queued behind another session's job on the shared worker...")
+
+def poll_job(key, label):
+    """Return the finished future for key, showing live progress until then."""
+    future = st.session_state.get(key)
+    if future is None:
+        return None
+    if not future.done():
+        job_status(key, label)
+        return None
+    return future
+
+def save_upload(uploaded_file):
+    """Write an upload to a temp file (keeping its extension), downscaling large images."""
+    suffix = os.path.splitext(uploaded_file.name)[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f:
+        uploaded_file.seek(0)
+        if PIL_AVAILABLE and suffix.lower() in DOWNSCALE_IMAGE_SUFFIXES:
+            try:
+                image = Image.open(uploaded_file)
+                image_format = image.format
+                if max(image.size) > UPLOAD_IMAGE_MAX_SIDE:
+                    # For JPEGs, draft() decodes straight at a reduced DCT scale
+                    image.draft("RGB", (UPLOAD_IMAGE_MAX_SIDE, UPLOAD_IMAGE_MAX_SIDE))
+                    image.thumbnail((UPLOAD_IMAGE_MAX_SIDE, UPLOAD_IMAGE_MAX_SIDE), Image.BILINEAR)
+                    if image_format == "JPEG":
+                        image.save(f, image_format, quality=85)
+                    else:
+                        image.save(f, image_format)
+                    return f.name
+            except Exception as e:
+                print(f"⚠️ Could not downscale {uploaded_file.name}, using original: {e}")
+            uploaded_file.seek(0)
+            f.seek(0)
+            f.truncate()
+        shutil.copyfileobj(uploaded_file, f, UPLOAD_CHUNK_SIZE)
+        return f.name
+
+def to_json_bytes(data):
+    """Serialize data for download as indented JSON; datetimes are serialized natively."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, indent=2, default=lambda o: o.isoformat() if isinstance(o, datetime) else str(o)).encode()
+
+def show_raw_json(name, data):
+    """Render data as JSON only when the user asks for it."""
+    if st.toggle(f"Show raw {name}", value=False, key=f"raw_{name}"):
+        st.code(to_json_bytes(data).decode(), language="json")
+
+def show_training_metrics(metrics):
+    """Display the metrics from a completed fine-tuning run."""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Training Time", f"{metrics.training_time:.2f}s")
+        st.metric("Loss", f"{metrics.loss:.4f}")
+    
+    with col2:
+        st.metric("Perplexity", f"{metrics.perplexity:.4f}")
+        st.metric("Accuracy", f"{metrics.accuracy:.4f}")
+    
+    with col3:
+        st.metric("Precision", f"{metrics.precision:.4f}")
+        st.metric("F1 Score", f"{metrics.f1_score:.4f}")
+
+@st.fragment
+@timed("dashboard")
+def render_dashboard_tab():
+    """Render the dashboard tab; widget changes only rerun this tab."""
+    st.markdown("## 📊 SmartLearn Advanced Dashboard")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown(FEATURE_CARD_HTML["prompting"], unsafe_allow_html=True)
+        st.markdown(FEATURE_CARD_HTML["rag"], unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(FEATURE_CARD_HTML["fine_tuning"], unsafe_allow_html=True)
+        st.markdown(FEATURE_CARD_HTML["multimodal"], unsafe_allow_html=True)
+    
+    # Quick Actions
+    st.markdown("## ⚡ Quick Actions")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if st.button("🔍 Test Advanced Search", use_container_width=True):
+            st.info("Navigate to 'Advanced RAG' tab to test search capabilities")
+    
+    with col2:
+        if st.button("🎯 Generate Training Data", use_container_width=True):
+            st.info("Navigate to 'Fine-Tuning' tab to generate synthetic data")
+    
+    with col3:
+        if st.button("🖼️ Process Media Files", use_container_width=True):
+            st.info("Navigate to 'Multimodal' tab to process images/audio/video")
+
+@st.fragment
+@timed("enhanced learning")
+def render_learning_tab():
+    """Render the enhanced learning tab; widget changes only rerun this tab."""
+    advanced = init_advanced_features()
+    
+    st.markdown("## 🧠 Enhanced Learning with Advanced Prompting")
+    
+    # Learning Type Selection
+    learning_type = st.selectbox(
+        "Choose Learning Type",
+        ["Study Plan", "Explanation", "Quiz"],
+        index=0
+    )
+    
+    # Common inputs
+    col1, col2 = st.columns(2)
+    with col1:
+        subject = st.text_input("Subject", value="mathematics")
+        level = st.selectbox("Level", ["beginner", "intermediate", "advanced"])
+    
+    with col2:
+        topic = st.text_input("Topic/Concept", value="calculus")
+        difficulty = st.selectbox("Difficulty", ["easy", "medium", "hard"])
+    
+    # User Context
+    st.markdown("### 🎯 Personalization Context")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        learning_style = st.selectbox(
+            "Learning Style",
+            ["visual", "auditory", "kinesthetic", "reading/writing"],
+            index=0
+        )
+    
+    with col2:
+        previous_knowledge = st.selectbox(
+            "Previous Knowledge",
+            ["none", "basic", "intermediate", "advanced"],
+            index=1
+        )
+    
+    with col3:
+        time_available = st.number_input("Time Available (hours)", min_value=0.5, max_value=10.0, value=2.0, step=0.5)
+    
+    # Advanced Options
+    with st.expander("🔧 Advanced Prompting Options"):
+        use_cot = st.checkbox("Use Chain-of-Thought", value=True)
+        include_examples = st.checkbox("Include Few-Shot Examples", value=True)
+        adaptive_complexity = st.checkbox("Adaptive Complexity", value=True)
+    
+    # Generate Content
+    if st.button("🚀 Generate Enhanced Learning Content", type="primary"):
+        with st.spinner("Generating enhanced content..."):
+            try:
+                user_context = {
+                    "learning_style": learning_style,
+                    "previous_knowledge": previous_knowledge,
+                    "time_available": time_available,
+                    "difficulty_preference": difficulty
+                }
+    
+                if learning_type == "Study Plan":
+                    prompt = advanced.generate_enhanced_study_plan(
+                        subject, level, int(time_available * 60), 7, 
+                        f"Learn {topic}", user_context, use_cot
+                    )
+                elif learning_type == "Explanation":
+                    prompt = advanced.generate_enhanced_explanation(
+                        topic, level, user_context, use_cot, include_examples
+                    )
+                else:
+                    prompt = advanced.generate_enhanced_quiz(
+                        topic, level, difficulty, 10, user_context, use_cot
+                    )
+    
+                # Kept in session state so the generate button below survives its own rerun
+                st.session_state.learning_prompt = (learning_type, prompt)
+    
+            except Exception as e:
+                st.error(f"Error generating content: {e}")
+    
+    if "learning_prompt" not in st.session_state:
+        return
+    
+    prompt_type, prompt = st.session_state.learning_prompt
+    component, prompt_title, button_label, output_title = LEARNING_OUTPUTS[prompt_type]
+    st.markdown(f"### {prompt_title}")
+    st.code(prompt, language="markdown")
+    
+    # Generate actual content
+    if st.button(button_label):
+        st.markdown(f"### {output_title}")
+        try:
+            generate_markdown(prompt, **COMPONENT_GENERATION_PARAMS[component])
+        except Exception as e:
+            st.error(f"Error generating content: {e}")
+
+@st.fragment
+@timed("advanced RAG")
+def render_rag_tab():
+    """Render the advanced RAG tab; widget changes only rerun this tab."""
+    advanced = init_advanced_features()
+    
+    st.markdown("## 🔍 Advanced RAG System")
+    
+    # Search Configuration (a form, so tweaking inputs doesn't rerun the tab)
+    with st.form("rag_search_form"):
+        col1, col2, col3 = st.columns(3)
+    
+        with col1:
+            query = st.text_input("Search Query", value="machine learning algorithms")
+            k_results = st.number_input("Number of Results", min_value=1, max_value=10, value=5)
+    
+        with col2:
+            use_hybrid = st.checkbox("Use Hybrid Search", value=True)
+            alpha = st.slider("Hybrid Weight (α)", min_value=0.0, max_value=1.0, value=0.7, step=0.1)
+            mmr_lambda = st.slider("MMR Relevance Weight (λ)", min_value=0.0, max_value=1.0, value=0.7, step=0.1,
+                                   help="Used by the Expanded search: lower values favour more diverse sources")
+    
+        with col3:
+            enable_expansion = st.checkbox("Enable Query Expansion", value=True)
+            search_type = st.selectbox("Search Type", ["Standard", "Expanded", "Document Insights"])
+        
+        submitted = st.form_submit_button("🔍 Execute Advanced Search", type="primary")
+    
+    # Execute Search
+    if submitted:
+        with st.spinner("Performing advanced search..."):
+            try:
+                if search_type == "Standard":
+                    context, sources = _cached_search(
+                        advanced, query, k_results, use_hybrid, alpha
+                    )
+    
+                    st.markdown("### 📚 Search Results")
+                    st.markdown(f"**Context Length:** {len(context)} characters")
+                    st.markdown(f"**Sources Found:** {len(sources)}")
+    
+                    # Display sources
+                    show_sources(sources)
+    
+                elif search_type == "Expanded":
+                    context, sources = _cached_expanded_search(advanced, query, k_results, mmr_lambda)
+    
+                    st.markdown("### 🔍 Expanded Search Results")
+                    st.markdown(f"**Context Length:** {len(context)} characters")
+                    st.markdown(f"**Sources Found:** {len(sources)}")
+    
+                    # Display expanded results
+                    st.markdown("**Expanded Query Results:**")
+                    show_sources(sources)
+    
+                elif search_type == "Document Insights":
+                    _, sources = _cached_search(advanced, query, k_results, use_hybrid, alpha)
+                    if sources:
+                        source_path = sources[0].get('source', '')
+                        if source_path:
+                            insights = advanced.get_document_insights(source_path)
+    
+                            st.markdown("### 📊 Document Insights")
+                            st.json(insights)
+    
+            except Exception as e:
+                st.error(f"Search failed: {e}")
+    
+    # RAG Statistics
+    st.markdown("### 📊 RAG System Statistics")
+    try:
+        rag_stats = advanced.rag_system.get_knowledge_base_stats()
+    
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Status", rag_stats.get('status', 'Unknown'))
+            st.metric("Document Count", rag_stats.get('count', 0))
+    
+        with col2:
+            st.metric("Embedding Model", rag_stats.get('embedding_model', 'Unknown'))
+            st.metric("Hybrid Search", "✅" if rag_stats.get('hybrid_search', False) else "❌")
+    
+        with col3:
+            st.metric("Query Expansion", "✅" if rag_stats.get('query_expansion', False) else "❌")
+            st.metric("Content Types", len(rag_stats.get('content_types', {})))
+    
+        # Content type breakdown
+        if rag_stats.get('content_types'):
+            st.markdown("**Content Type Distribution:**")
+            st.bar_chart(content_type_series(rag_stats['content_types']), y_label="chunks")
+    
+    except Exception as e:
+        st.error(f"Failed to get RAG statistics: {e}")
+
+@st.fragment
+@timed("fine-tuning")
+def render_fine_tuning_tab():
+    """Render the fine-tuning tab; widget changes only rerun this tab."""
+    advanced = init_advanced_features()
+    
+    st.markdown("## 🎯 Fine-Tuning Pipeline")
+    
+    # Pipeline Status
+    st.markdown("### 📊 Pipeline Status")
+    try:
+        ft_status = advanced.fine_tuning_pipeline.get_pipeline_status()
+    
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Model Status", ft_status['model_status'])
+            st.metric("Base Model", ft_status['base_model'])
+    
+        with col2:
+            st.metric("Training Examples", ft_status['data_collection']['total_examples'])
+            st.metric("Subjects", len(ft_status['data_collection']['subjects']))
+    
+        with col3:
+            st.metric("Difficulties", len(ft_status['data_collection']['difficulties']))
+            st.metric("Avg Rating", f"{ft_status['data_collection']['avg_rating']:.2f}")
+    
+    except Exception as e:
+        st.error(f"Failed to get pipeline status: {e}")
+    
+    # Data Management
+    st.markdown("### 📊 Training Data Management")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 📥 Add Training Data")
+    
+        new_query = st.text_input("Query/Question")
+        new_response = st.text_area("Response/Answer")
+        new_subject = st.selectbox("Subject", ["mathematics", "computer_science", "physics", "chemistry", "biology"])
+        new_difficulty = st.selectbox("Difficulty", ["beginner", "intermediate", "advanced"])
+        new_rating = st.slider("User Rating", min_value=1.0, max_value=5.0, value=4.0, step=0.5)
+    
+        if st.button("💾 Add Training Example"):
+            try:
+                user_interaction = {
+                    "query": new_query,
+                    "response": new_response,
+                    "subject": new_subject,
+                    "difficulty": new_difficulty,
+                    "rating": new_rating
+                }
+    
+                if buffer_training_example(advanced, user_interaction):
+                    st.success("✅ Training example added successfully!")
+                    st.rerun()
+                st.info(f"🕒 Training example queued ({len(st.session_state.ft_buffer)} pending)")
+    
+            except Exception as e:
+                st.error(f"Failed to add training example: {e}")
+    
+        # Drain examples that have waited past the flush deadline
+        pending = st.session_state.get("ft_buffer", [])
+        try:
+            if pending and time.monotonic() - st.session_state.ft_buffer_t0 >= FT_BUFFER_MAX_WAIT:
+                flush_training_buffer(advanced)
+            elif pending and st.button(f"📤 Flush now ({len(pending)} pending)", key="ft_flush"):
+                flush_training_buffer(advanced)
+                st.rerun()
+        except Exception as e:
+            st.error(f"Failed to flush training examples: {e}")
+    
+    with col2:
+        st.markdown("#### 🎲 Generate Synthetic Data")
+    
+        synth_subject = st.selectbox("Subject for Synthetic Data", ["mathematics", "computer_science", "physics"])
+        synth_count = st.number_input("Number of Examples", min_value=5, max_value=100, value=20)
+    
+        if st.button("🎲 Generate Synthetic Data"):
+            try:
+                with st.spinner("Generating synthetic training data..."):
+                    advanced.generate_synthetic_training_data(synth_subject, synth_count)
+                    _cached_status.clear()
+                    st.success(f"✅ Generated {synth_count} synthetic examples for {synth_subject}!")
+                    st.rerun()
+    
+            except Exception as e:
+                st.error(f"Failed to generate synthetic data: {e}")
+    
+    # Fine-Tuning Execution
+    st.markdown("### 🚀 Execute Fine-Tuning")
+    
+    # The worker is shared, so another session's job blocks this one too
+    busy = worker_busy()
+    if busy and not (job_running("ft_job") or job_running("eval_job")):
+        st.caption("⏳ Another session is using the training worker; new jobs are paused until it finishes.")
+    if st.button("🎯 Start Fine-Tuning", type="primary", disabled=busy):
+        submit_job("ft_job", advanced.run_fine_tuning)
+    
+    future = poll_job("ft_job", "Fine-tuning")
+    if future is not None:
+        try:
+            metrics = future.result()
+            if metrics:
+                st.success("✅ Fine-tuning completed successfully!")
+                show_training_metrics(metrics)
+            else:
+                st.error("❌ Fine-tuning failed")
+        
+        except Exception as e:
+            st.error(f"Fine-tuning failed: {e}")
+    
+    # Model Evaluation
+    if st.button("🔍 Evaluate Model", disabled=busy):
+        submit_job("eval_job", advanced.evaluate_fine_tuned_model)
+    
+    future = poll_job("eval_job", "Model evaluation")
+    if future is not None:
+        try:
+            eval_metrics = future.result()
+            if eval_metrics:
+                st.markdown("### 📊 Evaluation Results")
+                metric_cols = st.columns(min(len(eval_metrics), 4))
+                for i, (name, value) in enumerate(eval_metrics.items()):
+                    if isinstance(value, (int, float)):
+                        metric_cols[i % len(metric_cols)].metric(name.replace('_', ' ').title(), f"{value:.4f}")
+                show_raw_json("evaluation metrics", eval_metrics)
+            else:
+                st.warning("⚠️ No fine-tuned model available for evaluation")
+        
+        except Exception as e:
+            st.error(f"Evaluation failed: {e}")
+
+@st.fragment
+@timed("multimodal")
+def render_multimodal_tab():
+    """Render the multimodal tab; widget changes only rerun this tab."""
+    advanced = init_advanced_features()
+    
+    st.markdown("## 🖼️ Multimodal Integration")
+    
+    # File Upload
+    st.markdown("### 📁 Process Media Files")
+    
+    uploaded_file = st.file_uploader(
+        "Choose a file to process",
+        type=['jpg', 'jpeg', 'png', 'gif', 'mp3', 'wav', 'mp4', 'avi', 'txt', 'md', 'pdf']
+    )
+    
+    if uploaded_file is not None:
+        # Save uploaded file temporarily
+        file_path = save_upload(uploaded_file)
+    
+        try:
+            # Process file
+            with st.spinner("Processing file..."):
+                content = advanced.process_multimodal_file(file_path)
+    
+            if content:
+                st.success(f"✅ File processed successfully!")
+    
+                # Display results
+                col1, col2 = st.columns(2)
+    
+                with col1:
+                    st.markdown("### 📊 File Information")
+                    st.json({
+                        "Content Type": content['content_type'],
+                        "Source": uploaded_file.name,
+                        "Timestamp": content['timestamp']
+                    })
+    
+                with col2:
+                    st.markdown("### 🔍 Content Analysis")
+                    show_raw_json("content metadata", content['metadata'])
+            else:
+                st.error("❌ Failed to process file")
+    
+        except Exception as e:
+            st.error(f"File processing failed: {e}")
+    
+        finally:
+            # Clean up
+            os.unlink(file_path)
+    
+    # Educational Content Generation
+    st.markdown("### 🎨 Generate Educational Content")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        gen_subject = st.text_input("Subject", value="mathematics", key="gen_subject")
+        gen_prompt = st.text_area("Content Description", value="Create a diagram showing the relationship between derivatives and integrals")
+    
+    with col2:
+        gen_type = st.selectbox("Content Type", ["image"])
+        gen_size = st.selectbox("Image Size", ["800x600", "1024x768", "1200x800"])
+    
+    if st.button("🎨 Generate Content"):
+        try:
+            with st.spinner("Generating educational content..."):
+                # Parse size
+                width, height = map(int, gen_size.split('x'))
+    
+                content = advanced.generate_educational_content(gen_subject, gen_type, gen_prompt)
+    
+                if content:
+                    st.success("✅ Educational content generated!")
+    
+                    # Display generated content
+                    if content['content_type'] == 'image':
+                        st.markdown("### 🖼️ Generated Image")
+                        # Note: In a real app, you'd save and display the image
+                        st.info("Image generated successfully! (Would display here in production)")
+    
+                    show_raw_json("generated content", content)
+                else:
+                    st.error("❌ Failed to generate content")
+    
+        except Exception as e:
+            st.error(f"Content generation failed: {e}")
+    
+    # Cross-Modal Analysis
+    st.markdown("### 🔗 Cross-Modal Analysis")
+    
+    if st.button("🔍 Analyze Content Relationships"):
+        try:
+            # This would analyze relationships between multiple files
+            st.info("Cross-modal analysis requires multiple files. Upload several files to analyze relationships.")
+    
+        except Exception as e:
+            st.error(f"Analysis failed: {e}")
+
+@st.fragment
+@timed("integration demo")
+def render_integration_tab():
+    """Render the integration demo tab; widget changes only rerun this tab."""
+    advanced = init_advanced_features()
+    
+    st.markdown("## 🚀 Complete Integration Demo")
+    
+    st.markdown("""
+    This tab demonstrates how all advanced features work together to create comprehensive learning experiences.
+    """)
+    
+    # Demo Configuration
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        demo_subject = st.selectbox("Demo Subject", ["mathematics", "computer_science", "physics"], key="demo_subject")
+        demo_topic = st.text_input("Demo Topic", value="calculus", key="demo_topic")
+    
+    with col2:
+        demo_level = st.selectbox("Demo Level", ["beginner", "intermediate", "advanced"], key="demo_level")
+        demo_difficulty = st.selectbox("Demo Difficulty", ["easy", "medium", "hard"], key="demo_difficulty")
+    
+    # Create Comprehensive Learning Experience
+    if st.button("🚀 Create Comprehensive Learning Experience", type="primary"):
+        st.session_state.integration_outputs = {}
+        try:
+            with st.spinner("Creating comprehensive learning experience..."):
+                experience = advanced.create_comprehensive_learning_experience(
+                    demo_subject, demo_topic, demo_level, demo_difficulty, include_multimodal=True
+                )
+            st.session_state.integration_experience = experience
+            st.session_state.integration_created = datetime.now()
+            # Slice the prompt previews once here rather than on every rerun
+            st.session_state.integration_previews = {
+                name: data['prompt'][:PROMPT_PREVIEW_CHARS] + "..."
+                for name, data in experience.get('components', {}).items()
+                if data['type'] == 'enhanced_prompt'
+            }
+        except Exception as e:
+            st.session_state.pop("integration_experience", None)
+            st.error(f"Integration demo failed: {e}")
+    
+    # Kept in session state so the generate buttons below survive their own rerun
+    experience = st.session_state.get("integration_experience")
+    if experience is not None:
+        try:
+            if "error" not in experience:
+                st.success("✅ Comprehensive learning experience created!")
+    
+                # Display experience components
+                st.markdown("### 🎓 Learning Experience Components")
+    
+                outputs = st.session_state.setdefault("integration_outputs", {})
+                previews = st.session_state.get("integration_previews", {})
+                generatable = {
+                    name: data['prompt']
+                    for name, data in experience['components'].items()
+                    if data['type'] == 'enhanced_prompt' and name in COMPONENT_GENERATION_PARAMS
+                }
+                if generatable and st.button("⚡ Generate All", key="gen_all_components"):
+                    with st.spinner(f"Generating {len(generatable)} components in parallel..."):
+                        outputs.update(complete_all(init_llm(), generatable))
+    
+                for component_name, component_data in experience['components'].items():
+                    with st.expander(f"{component_name.replace('_', ' ').title()}"):
+                        if component_data['type'] == 'enhanced_prompt':
+                            st.markdown("**Type:** Enhanced Prompt with Advanced Features")
+                            st.code(previews[component_name], language="markdown")
+    
+                            if component_name in outputs:
+                                st.markdown(f"### 📖 Generated {component_name.replace('_', ' ').title()}")
+                                st.markdown(outputs[component_name])
+                            elif st.button(f"🎯 Generate {component_name.replace('_', ' ').title()}", key=f"gen_{component_name}"):
+                                params = COMPONENT_GENERATION_PARAMS.get(component_name)
+                                if params:
+                                    st.markdown(f"### 📖 Generated {component_name.replace('_', ' ').title()}")
+                                    outputs[component_name] = generate_markdown(component_data['prompt'], **params)
+                                else:
+                                    st.markdown("Component type not supported for generation")
+    
+                        elif component_data['type'] == 'advanced_rag':
+                            st.markdown("**Type:** Advanced RAG Context")
+                            st.markdown(f"**Context Length:** {len(component_data['context'])} characters")
+                            st.markdown(f"**Sources:** {len(component_data['sources'])}")
+    
+                            # Show sources
+                            st.markdown("\n\n".join(
+                                f"**Source {i+1}:** {source.get('source', 'Unknown')}"
+                                for i, source in enumerate(component_data['sources'][:3])
+                            ))
+    
+                        elif component_data['type'] == 'generated_content':
+                            st.markdown("**Type:** Generated Multimodal Content")
+                            show_raw_json(f"{component_name} data", component_data)
+    
+                # Export experience
+                if st.button("📤 Export Learning Experience"):
+                    try:
+                        export_data = {
+                            "experience": experience,
+                            "timestamp": st.session_state.integration_created,
+                            "configuration": {
+                                "subject": demo_subject,
+                                "topic": demo_topic,
+                                "level": demo_level,
+                                "difficulty": demo_difficulty
+                            }
+                        }
+    
+                        st.download_button(
+                            label="💾 Download Experience JSON",
+                            data=to_json_bytes(export_data),
+                            file_name=f"learning_experience_{demo_subject}_{demo_topic}_{st.session_state.integration_created.strftime(FILE_STAMP_FORMAT)}.json",
+                            mime="application/json"
+                        )
+    
+                    except Exception as e:
+                        st.error(f"Export failed: {e}")
+    
+            else:
+                st.error(f"Failed to create learning experience: {experience['error']}")
+    
+        except Exception as e:
+            st.error(f"Integration demo failed: {e}")
+    
+    # System Report
+    st.markdown("### 📊 Advanced Features Report")
+    
+    if st.button("📋 Generate System Report"):
+        try:
+            with st.spinner("Generating comprehensive report..."):
+                report, report_bytes, report_stamp = _cached_report(advanced)
+    
+            if report:
+                st.success("✅ System report generated!")
+    
+                # Display report summary
+                st.markdown("#### 📈 Feature Summary")
+                feature_summary = report.get('feature_summary', {})
+    
+                for feature, capabilities in feature_summary.items():
+                    with st.expander(f"{feature.replace('_', ' ').title()}"):
+                        st.markdown("\n\n".join(
+                            f"• {capability.replace('_', ' ').title()}: {'✅' if status else '❌'}"
+                            for capability, status in capabilities.items()
+                        ))
+    
+                # Download report
+                st.download_button(
+                    label="📥 Download Full Report",
+                    data=report_bytes,
+                    file_name=f"smartlearn_advanced_report_{report_stamp}.json",
+                    mime="application/json"
+                )
+    
+            else:
+                st.error("❌ Failed to generate report")
+    
+        except Exception as e:
+            st.error(f"Report generation failed: {e}")
+
 def main():
     """Main application."""
     
+    inject_css()
+
     # Header
-    st.markdown("""
-    <div class="main-header">
-        <h1>🚀 SmartLearn Advanced</h1>
-        <h3>AI-Powered Learning Platform with Advanced Features</h3>
-        <p>Enhanced Prompting • Advanced RAG • Fine-Tuning • Multimodal Integration</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Initialize systems
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
+    
+    # Initialize systems; the LLM client is only built once something is generated
     advanced = init_advanced_features()
-    llm = init_llm()
     
-    if not advanced or not llm:
+    if not advanced:
         st.error("❌ Failed to initialize required systems. Please check your configuration.")
         return
     
@@ -169,41 +1182,29 @@ def main():
         # System Status
         st.markdown("## 📊 System Status")
         if st.button("🔄 Refresh Status"):
+            _cached_status.clear()
+            _cached_report.clear()
+            st.rerun()
+        
+        if st.button("🧹 Release resources"):
+            _cached_status.clear()
+            _cached_report.clear()
+            completion_cache.clear()
+            init_advanced_features.clear()
+            gc.collect()
             st.rerun()
         
         try:
-            status = advanced.get_system_status()
+            status = _cached_status(advanced)
             
-            # RAG Status
             rag_status = status['rag_system']['status']
             rag_count = status['rag_system'].get('count', 0)
-            st.markdown(f"""
-            <div class="metric-card">
-                <strong>RAG System:</strong><br>
-                <span class="status-indicator status-success"></span>{rag_status}<br>
-                Documents: {rag_count}
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Fine-tuning Status
             ft_status = status['fine_tuning']['model_status']
             ft_examples = status['fine_tuning']['data_collection']['total_examples']
-            st.markdown(f"""
-            <div class="metric-card">
-                <strong>Fine-Tuning:</strong><br>
-                <span class="status-indicator status-success"></span>{ft_status}<br>
-                Training Examples: {ft_examples}
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Multimodal Status
             mm_status = "Available" if status['multimodal']['image_processing'] else "Limited"
-            st.markdown(f"""
-            <div class="metric-card">
-                <strong>Multimodal:</strong><br>
-                <span class="status-indicator status-success"></span>{mm_status}
-            </div>
-            """, unsafe_allow_html=True)
+            
+            for card in render_status_cards(rag_status, rag_count, ft_status, ft_examples, mm_status):
+                st.markdown(card, unsafe_allow_html=True)
             
         except Exception as e:
             st.error(f"Status check failed: {e}")
@@ -218,619 +1219,26 @@ def main():
         "🚀 Integration Demo"
     ])
     
-    # Dashboard Tab
     with tab1:
-        st.markdown("## 📊 SmartLearn Advanced Dashboard")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("""
-            <div class="feature-card">
-                <h3>🧠 Enhanced Prompt Engineering</h3>
-                <p>• Chain-of-thought reasoning</p>
-                <p>• Few-shot learning examples</p>
-                <p>• Dynamic context adaptation</p>
-                <p>• Performance-based prompts</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("""
-            <div class="feature-card">
-                <h3>🔍 Advanced RAG System</h3>
-                <p>• Hybrid semantic + keyword search</p>
-                <p>• Query expansion & optimization</p>
-                <p>• Multi-modal document support</p>
-                <p>• Adaptive content chunking</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("""
-            <div class="feature-card">
-                <h3>🎯 Fine-Tuning Pipeline</h3>
-                <p>• User interaction data collection</p>
-                <p>• Synthetic data generation</p>
-                <p>• Custom model training</p>
-                <p>• Performance evaluation</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("""
-            <div class="feature-card">
-                <h3>🖼️ Multimodal Integration</h3>
-                <p>• Image processing & captioning</p>
-                <p>• Audio transcription & analysis</p>
-                <p>• Video content processing</p>
-                <p>• Cross-modal relationships</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Quick Actions
-        st.markdown("## ⚡ Quick Actions")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            if st.button("🔍 Test Advanced Search", use_container_width=True):
-                st.info("Navigate to 'Advanced RAG' tab to test search capabilities")
-        
-        with col2:
-            if st.button("🎯 Generate Training Data", use_container_width=True):
-                st.info("Navigate to 'Fine-Tuning' tab to generate synthetic data")
-        
-        with col3:
-            if st.button("🖼️ Process Media Files", use_container_width=True):
-                st.info("Navigate to 'Multimodal' tab to process images/audio/video")
-    
-    # Enhanced Learning Tab
+        render_dashboard_tab()
+
     with tab2:
-        st.markdown("## 🧠 Enhanced Learning with Advanced Prompting")
-        
-        # Learning Type Selection
-        learning_type = st.selectbox(
-            "Choose Learning Type",
-            ["Study Plan", "Explanation", "Quiz"],
-            index=0
-        )
-        
-        # Common inputs
-        col1, col2 = st.columns(2)
-        with col1:
-            subject = st.text_input("Subject", value="mathematics")
-            level = st.selectbox("Level", ["beginner", "intermediate", "advanced"])
-        
-        with col2:
-            topic = st.text_input("Topic/Concept", value="calculus")
-            difficulty = st.selectbox("Difficulty", ["easy", "medium", "hard"])
-        
-        # User Context
-        st.markdown("### 🎯 Personalization Context")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            learning_style = st.selectbox(
-                "Learning Style",
-                ["visual", "auditory", "kinesthetic", "reading/writing"],
-                index=0
-            )
-        
-        with col2:
-            previous_knowledge = st.selectbox(
-                "Previous Knowledge",
-                ["none", "basic", "intermediate", "advanced"],
-                index=1
-            )
-        
-        with col3:
-            time_available = st.number_input("Time Available (hours)", min_value=0.5, max_value=10.0, value=2.0, step=0.5)
-        
-        # Advanced Options
-        with st.expander("🔧 Advanced Prompting Options"):
-            use_cot = st.checkbox("Use Chain-of-Thought", value=True)
-            include_examples = st.checkbox("Include Few-Shot Examples", value=True)
-            adaptive_complexity = st.checkbox("Adaptive Complexity", value=True)
-        
-        # Generate Content
-        if st.button("🚀 Generate Enhanced Learning Content", type="primary"):
-            with st.spinner("Generating enhanced content..."):
-                try:
-                    user_context = {
-                        "learning_style": learning_style,
-                        "previous_knowledge": previous_knowledge,
-                        "time_available": time_available,
-                        "difficulty_preference": difficulty
-                    }
-                    
-                    if learning_type == "Study Plan":
-                        prompt = advanced.generate_enhanced_study_plan(
-                            subject, level, int(time_available * 60), 7, 
-                            f"Learn {topic}", user_context, use_cot
-                        )
-                        
-                        st.markdown("### 📚 Generated Study Plan Prompt")
-                        st.code(prompt, language="markdown")
-                        
-                        # Generate actual study plan
-                        if st.button("🎯 Generate Study Plan"):
-                            with st.spinner("Creating study plan..."):
-                                study_plan = llm.complete(prompt, temperature=0.7, max_tokens=1500)
-                                st.markdown("### 📖 Your Personalized Study Plan")
-                                st.markdown(study_plan)
-                    
-                    elif learning_type == "Explanation":
-                        prompt = advanced.generate_enhanced_explanation(
-                            topic, level, user_context, use_cot, include_examples
-                        )
-                        
-                        st.markdown("### 📖 Generated Explanation Prompt")
-                        st.code(prompt, language="markdown")
-                        
-                        # Generate actual explanation
-                        if st.button("💡 Generate Explanation"):
-                            with st.spinner("Creating explanation..."):
-                                explanation = llm.complete(prompt, temperature=0.6, max_tokens=1200)
-                                st.markdown("### 🧠 Your Personalized Explanation")
-                                st.markdown(explanation)
-                    
-                    elif learning_type == "Quiz":
-                        prompt = advanced.generate_enhanced_quiz(
-                            topic, level, difficulty, 10, user_context, use_cot
-                        )
-                        
-                        st.markdown("### 🎯 Generated Quiz Prompt")
-                        st.code(prompt, language="markdown")
-                        
-                        # Generate actual quiz
-                        if st.button("📝 Generate Quiz"):
-                            with st.spinner("Creating quiz..."):
-                                quiz = llm.complete(prompt, temperature=0.7, max_tokens=2000)
-                                st.markdown("### 🧪 Your Personalized Quiz")
-                                st.markdown(quiz)
-                
-                except Exception as e:
-                    st.error(f"Error generating content: {e}")
-    
-    # Advanced RAG Tab
+        render_learning_tab()
+
     with tab3:
-        st.markdown("## 🔍 Advanced RAG System")
-        
-        # Search Configuration
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            query = st.text_input("Search Query", value="machine learning algorithms")
-            k_results = st.number_input("Number of Results", min_value=1, max_value=10, value=5)
-        
-        with col2:
-            use_hybrid = st.checkbox("Use Hybrid Search", value=True)
-            alpha = st.slider("Hybrid Weight (α)", min_value=0.0, max_value=1.0, value=0.7, step=0.1)
-        
-        with col3:
-            enable_expansion = st.checkbox("Enable Query Expansion", value=True)
-            search_type = st.selectbox("Search Type", ["Standard", "Expanded", "Document Insights"])
-        
-        # Execute Search
-        if st.button("🔍 Execute Advanced Search", type="primary"):
-            with st.spinner("Performing advanced search..."):
-                try:
-                    if search_type == "Standard":
-                        context, sources = advanced.advanced_search(
-                            query, k_results, use_hybrid, alpha
-                        )
-                        
-                        st.markdown("### 📚 Search Results")
-                        st.markdown(f"**Context Length:** {len(context)} characters")
-                        st.markdown(f"**Sources Found:** {len(sources)}")
-                        
-                        # Display sources
-                        for i, source in enumerate(sources):
-                            with st.expander(f"Source {i+1}: {source.get('source', 'Unknown')}"):
-                                st.markdown(f"**Relevance Score:** {source.get('relevance_score', 0):.3f}")
-                                st.markdown(f"**Content Type:** {source.get('content_type', 'Unknown')}")
-                                st.markdown(f"**Chunk ID:** {source.get('chunk_id', 'Unknown')}")
-                                
-                                # Show content preview
-                                content_preview = source.get('content', '')[:200] + "..." if len(source.get('content', '')) > 200 else source.get('content', '')
-                                st.markdown(f"**Content Preview:** {content_preview}")
-                    
-                    elif search_type == "Expanded":
-                        context, sources = advanced.expand_and_search(query, k_results)
-                        
-                        st.markdown("### 🔍 Expanded Search Results")
-                        st.markdown(f"**Context Length:** {len(context)} characters")
-                        st.markdown(f"**Sources Found:** {len(sources)}")
-                        
-                        # Display expanded results
-                        st.markdown("**Expanded Query Results:**")
-                        for i, source in enumerate(sources):
-                            st.markdown(f"{i+1}. {source.get('source', 'Unknown')} (Score: {source.get('relevance_score', 0):.3f})")
-                    
-                    elif search_type == "Document Insights":
-                        if sources:
-                            source_path = sources[0].get('source', '')
-                            if source_path:
-                                insights = advanced.get_document_insights(source_path)
-                                
-                                st.markdown("### 📊 Document Insights")
-                                st.json(insights)
-                
-                except Exception as e:
-                    st.error(f"Search failed: {e}")
-        
-        # RAG Statistics
-        st.markdown("### 📊 RAG System Statistics")
-        try:
-            rag_stats = advanced.rag_system.get_knowledge_base_stats()
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Status", rag_stats.get('status', 'Unknown'))
-                st.metric("Document Count", rag_stats.get('count', 0))
-            
-            with col2:
-                st.metric("Embedding Model", rag_stats.get('embedding_model', 'Unknown'))
-                st.metric("Hybrid Search", "✅" if rag_stats.get('hybrid_search', False) else "❌")
-            
-            with col3:
-                st.metric("Query Expansion", "✅" if rag_stats.get('query_expansion', False) else "❌")
-                st.metric("Content Types", len(rag_stats.get('content_types', {})))
-            
-            # Content type breakdown
-            if 'content_types' in rag_stats:
-                st.markdown("**Content Type Distribution:**")
-                for content_type, count in rag_stats['content_types'].items():
-                    st.markdown(f"- {content_type}: {count} chunks")
-        
-        except Exception as e:
-            st.error(f"Failed to get RAG statistics: {e}")
-    
-    # Fine-Tuning Tab
+        render_rag_tab()
+
     with tab4:
-        st.markdown("## 🎯 Fine-Tuning Pipeline")
-        
-        # Pipeline Status
-        st.markdown("### 📊 Pipeline Status")
-        try:
-            ft_status = advanced.fine_tuning_pipeline.get_pipeline_status()
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Model Status", ft_status['model_status'])
-                st.metric("Base Model", ft_status['base_model'])
-            
-            with col2:
-                st.metric("Training Examples", ft_status['data_collection']['total_examples'])
-                st.metric("Subjects", len(ft_status['data_collection']['subjects']))
-            
-            with col3:
-                st.metric("Difficulties", len(ft_status['data_collection']['difficulties']))
-                st.metric("Avg Rating", f"{ft_status['data_collection']['avg_rating']:.2f}")
-        
-        except Exception as e:
-            st.error(f"Failed to get pipeline status: {e}")
-        
-        # Data Management
-        st.markdown("### 📊 Training Data Management")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### 📥 Add Training Data")
-            
-            new_query = st.text_input("Query/Question")
-            new_response = st.text_area("Response/Answer")
-            new_subject = st.selectbox("Subject", ["mathematics", "computer_science", "physics", "chemistry", "biology"])
-            new_difficulty = st.selectbox("Difficulty", ["beginner", "intermediate", "advanced"])
-            new_rating = st.slider("User Rating", min_value=1.0, max_value=5.0, value=4.0, step=0.5)
-            
-            if st.button("💾 Add Training Example"):
-                try:
-                    user_interaction = {
-                        "query": new_query,
-                        "response": new_response,
-                        "subject": new_subject,
-                        "difficulty": new_difficulty,
-                        "rating": new_rating
-                    }
-                    
-                    advanced.collect_training_data([user_interaction])
-                    st.success("✅ Training example added successfully!")
-                    st.rerun()
-                
-                except Exception as e:
-                    st.error(f"Failed to add training example: {e}")
-        
-        with col2:
-            st.markdown("#### 🎲 Generate Synthetic Data")
-            
-            synth_subject = st.selectbox("Subject for Synthetic Data", ["mathematics", "computer_science", "physics"])
-            synth_count = st.number_input("Number of Examples", min_value=5, max_value=100, value=20)
-            
-            if st.button("🎲 Generate Synthetic Data"):
-                try:
-                    with st.spinner("Generating synthetic training data..."):
-                        advanced.generate_synthetic_training_data(synth_subject, synth_count)
-                        st.success(f"✅ Generated {synth_count} synthetic examples for {synth_subject}!")
-                        st.rerun()
-                
-                except Exception as e:
-                    st.error(f"Failed to generate synthetic data: {e}")
-        
-        # Fine-Tuning Execution
-        st.markdown("### 🚀 Execute Fine-Tuning")
-        
-        if st.button("🎯 Start Fine-Tuning", type="primary"):
-            try:
-                with st.spinner("Starting fine-tuning pipeline..."):
-                    metrics = advanced.run_fine_tuning()
-                    
-                    if metrics:
-                        st.success("✅ Fine-tuning completed successfully!")
-                        
-                        # Display metrics
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("Training Time", f"{metrics.training_time:.2f}s")
-                            st.metric("Loss", f"{metrics.loss:.4f}")
-                        
-                        with col2:
-                            st.metric("Perplexity", f"{metrics.perplexity:.4f}")
-                            st.metric("Accuracy", f"{metrics.accuracy:.4f}")
-                        
-                        with col3:
-                            st.metric("Precision", f"{metrics.precision:.4f}")
-                            st.metric("F1 Score", f"{metrics.f1_score:.4f}")
-                        
-                        st.rerun()
-                    else:
-                        st.error("❌ Fine-tuning failed")
-            
-            except Exception as e:
-                st.error(f"Fine-tuning failed: {e}")
-        
-        # Model Evaluation
-        if st.button("🔍 Evaluate Model"):
-            try:
-                with st.spinner("Evaluating fine-tuned model..."):
-                    eval_metrics = advanced.evaluate_fine_tuned_model()
-                    
-                    if eval_metrics:
-                        st.markdown("### 📊 Evaluation Results")
-                        st.json(eval_metrics)
-                    else:
-                        st.warning("⚠️ No fine-tuned model available for evaluation")
-            
-            except Exception as e:
-                st.error(f"Evaluation failed: {e}")
-    
-    # Multimodal Tab
+        render_fine_tuning_tab()
+
     with tab5:
-        st.markdown("## 🖼️ Multimodal Integration")
-        
-        # File Upload
-        st.markdown("### 📁 Process Media Files")
-        
-        uploaded_file = st.file_uploader(
-            "Choose a file to process",
-            type=['jpg', 'jpeg', 'png', 'gif', 'mp3', 'wav', 'mp4', 'avi', 'txt', 'md', 'pdf']
-        )
-        
-        if uploaded_file is not None:
-            # Save uploaded file temporarily
-            file_path = f"temp_{uploaded_file.name}"
-            with open(file_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-            
-            try:
-                # Process file
-                with st.spinner("Processing file..."):
-                    content = advanced.process_multimodal_file(file_path)
-                
-                if content:
-                    st.success(f"✅ File processed successfully!")
-                    
-                    # Display results
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown("### 📊 File Information")
-                        st.json({
-                            "Content Type": content['content_type'],
-                            "Source": content['source'],
-                            "Timestamp": content['timestamp']
-                        })
-                    
-                    with col2:
-                        st.markdown("### 🔍 Content Analysis")
-                        st.json(content['metadata'])
-                    
-                    # Clean up
-                    os.remove(file_path)
-                else:
-                    st.error("❌ Failed to process file")
-            
-            except Exception as e:
-                st.error(f"File processing failed: {e}")
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-        
-        # Educational Content Generation
-        st.markdown("### 🎨 Generate Educational Content")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            gen_subject = st.text_input("Subject", value="mathematics")
-            gen_prompt = st.text_area("Content Description", value="Create a diagram showing the relationship between derivatives and integrals")
-        
-        with col2:
-            gen_type = st.selectbox("Content Type", ["image"])
-            gen_size = st.selectbox("Image Size", ["800x600", "1024x768", "1200x800"])
-        
-        if st.button("🎨 Generate Content"):
-            try:
-                with st.spinner("Generating educational content..."):
-                    # Parse size
-                    width, height = map(int, gen_size.split('x'))
-                    
-                    content = advanced.generate_educational_content(gen_subject, gen_type, gen_prompt)
-                    
-                    if content:
-                        st.success("✅ Educational content generated!")
-                        
-                        # Display generated content
-                        if content['content_type'] == 'image':
-                            st.markdown("### 🖼️ Generated Image")
-                            # Note: In a real app, you'd save and display the image
-                            st.info("Image generated successfully! (Would display here in production)")
-                        
-                        st.json(content)
-                    else:
-                        st.error("❌ Failed to generate content")
-            
-            except Exception as e:
-                st.error(f"Content generation failed: {e}")
-        
-        # Cross-Modal Analysis
-        st.markdown("### 🔗 Cross-Modal Analysis")
-        
-        if st.button("🔍 Analyze Content Relationships"):
-            try:
-                # This would analyze relationships between multiple files
-                st.info("Cross-modal analysis requires multiple files. Upload several files to analyze relationships.")
-            
-            except Exception as e:
-                st.error(f"Analysis failed: {e}")
-    
-    # Integration Demo Tab
+        render_multimodal_tab()
+
     with tab6:
-        st.markdown("## 🚀 Complete Integration Demo")
-        
-        st.markdown("""
-        This tab demonstrates how all advanced features work together to create comprehensive learning experiences.
-        """)
-        
-        # Demo Configuration
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            demo_subject = st.selectbox("Demo Subject", ["mathematics", "computer_science", "physics"], key="demo_subject")
-            demo_topic = st.text_input("Demo Topic", value="calculus", key="demo_topic")
-        
-        with col2:
-            demo_level = st.selectbox("Demo Level", ["beginner", "intermediate", "advanced"], key="demo_level")
-            demo_difficulty = st.selectbox("Demo Difficulty", ["easy", "medium", "hard"], key="demo_difficulty")
-        
-        # Create Comprehensive Learning Experience
-        if st.button("🚀 Create Comprehensive Learning Experience", type="primary"):
-            try:
-                with st.spinner("Creating comprehensive learning experience..."):
-                    experience = advanced.create_comprehensive_learning_experience(
-                        demo_subject, demo_topic, demo_level, demo_difficulty, include_multimodal=True
-                    )
-                
-                if "error" not in experience:
-                    st.success("✅ Comprehensive learning experience created!")
-                    
-                    # Display experience components
-                    st.markdown("### 🎓 Learning Experience Components")
-                    
-                    for component_name, component_data in experience['components'].items():
-                        with st.expander(f"{component_name.replace('_', ' ').title()}"):
-                            if component_data['type'] == 'enhanced_prompt':
-                                st.markdown("**Type:** Enhanced Prompt with Advanced Features")
-                                st.code(component_data['prompt'][:500] + "...", language="markdown")
-                                
-                                if st.button(f"🎯 Generate {component_name.replace('_', ' ').title()}", key=f"gen_{component_name}"):
-                                    with st.spinner(f"Generating {component_name}..."):
-                                        if component_name == "study_plan":
-                                            result = llm.complete(component_data['prompt'], temperature=0.7, max_tokens=1500)
-                                        elif component_name == "explanation":
-                                            result = llm.complete(component_data['prompt'], temperature=0.6, max_tokens=1200)
-                                        elif component_name == "quiz":
-                                            result = llm.complete(component_data['prompt'], temperature=0.7, max_tokens=2000)
-                                        else:
-                                            result = "Component type not supported for generation"
-                                        
-                                        st.markdown(f"### 📖 Generated {component_name.replace('_', ' ').title()}")
-                                        st.markdown(result)
-                            
-                            elif component_data['type'] == 'advanced_rag':
-                                st.markdown("**Type:** Advanced RAG Context")
-                                st.markdown(f"**Context Length:** {len(component_data['context'])} characters")
-                                st.markdown(f"**Sources:** {len(component_data['sources'])}")
-                                
-                                # Show sources
-                                for i, source in enumerate(component_data['sources'][:3]):
-                                    st.markdown(f"**Source {i+1}:** {source.get('source', 'Unknown')}")
-                            
-                            elif component_data['type'] == 'generated_content':
-                                st.markdown("**Type:** Generated Multimodal Content")
-                                st.json(component_data)
-                    
-                    # Export experience
-                    if st.button("📤 Export Learning Experience"):
-                        try:
-                            export_data = {
-                                "experience": experience,
-                                "timestamp": datetime.now().isoformat(),
-                                "configuration": {
-                                    "subject": demo_subject,
-                                    "topic": demo_topic,
-                                    "level": demo_level,
-                                    "difficulty": demo_difficulty
-                                }
-                            }
-                            
-                            st.download_button(
-                                label="💾 Download Experience JSON",
-                                data=json.dumps(export_data, indent=2),
-                                file_name=f"learning_experience_{demo_subject}_{demo_topic}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                                mime="application/json"
-                            )
-                        
-                        except Exception as e:
-                            st.error(f"Export failed: {e}")
-                
-                else:
-                    st.error(f"Failed to create learning experience: {experience['error']}")
-            
-            except Exception as e:
-                st.error(f"Integration demo failed: {e}")
-        
-        # System Report
-        st.markdown("### 📊 Advanced Features Report")
-        
-        if st.button("📋 Generate System Report"):
-            try:
-                with st.spinner("Generating comprehensive report..."):
-                    report = advanced.export_advanced_features_report()
-                
-                if report:
-                    st.success("✅ System report generated!")
-                    
-                    # Display report summary
-                    st.markdown("#### 📈 Feature Summary")
-                    feature_summary = report.get('feature_summary', {})
-                    
-                    for feature, capabilities in feature_summary.items():
-                        with st.expander(f"{feature.replace('_', ' ').title()}"):
-                            for capability, status in capabilities.items():
-                                st.markdown(f"• {capability.replace('_', ' ').title()}: {'✅' if status else '❌'}")
-                    
-                    # Download report
-                    st.download_button(
-                        label="📥 Download Full Report",
-                        data=json.dumps(report, indent=2),
-                        file_name=f"smartlearn_advanced_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                        mime="application/json"
-                    )
-                
-                else:
-                    st.error("❌ Failed to generate report")
-            
-            except Exception as e:
-                st.error(f"Report generation failed: {e}")
+        render_integration_tab()
+    
+    if debug_enabled():
+        show_debug_timings()
 
 if __name__ == "__main__":
     main()
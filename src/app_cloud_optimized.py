@@ -19,7 +19,7 @@
 )
 
 # Custom CSS for clean, professional UI
-st.markdown("""
+CSS = """
 <style>
     body {
         background-color: #0e0e0e !important;
@@ -87,7 +87,37 @@
         font-weight: bold !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+HEADER_HTML = """
+<div class="main-header">
+    <h1>🎓 SmartLearn Enhanced</h1>
+    <h3>AI-Powered Study Assistant with Advanced Intelligence</h3>
+    <p>Study Plans • Explanations • Adaptive Quizzes</p>
+</div>
+"""
+
+# Background systems are always on in the cloud build, so the badges are static
+STATUS_BADGES_HTML = "\n\n".join(
+    f"**{name}:** <span class='status-badge status-active'>Active</span>"
+    for name in ("Core System", "AI Engine", "Knowledge Base")
+)
+
+SIDEBAR_FEATURES_HTML = """
+<small>
+💡 **Intelligent Features:**
+• Advanced Study Planning
+• Contextual Explanations
+• Varied Quiz Generation
+• Personalized Learning
+</small>
+"""
+
+FOOTER_HTML = """
+<div style="text-align: center; color: #666; font-size: 0.8rem;">
+    🚀 Powered by SmartLearn Intelligent AI • Advanced Algorithms • Varied Content • Personalized Learning
+</div>
+"""
 
 # Enhanced knowledge base for intelligent content generation
 KNOWLEDGE_BASE = {
@@ -617,6 +647,226 @@
     }
 }
 
+# Study methods per learning style
+STYLE_METHODS = {
+    "visual": [
+        "📊 Create mind maps and concept diagrams",
+        "🎨 Use color-coded notes and visual organizers",
+        "📱 Watch educational videos and animations",
+        "🖼️ Draw sketches and flowcharts"
+    ],
+    "auditory": [
+        "🎧 Listen to educational podcasts and lectures",
+        "🗣️ Join study groups and discussion sessions",
+        "📝 Read notes aloud and record yourself",
+        "🎵 Use mnemonic devices and rhymes"
+    ],
+    "kinesthetic": [
+        "✋ Build physical models and prototypes",
+        "🏃 Practice with hands-on experiments",
+        "🎯 Use interactive simulations and games",
+        "✏️ Write and rewrite notes by hand"
+    ],
+    "reading/writing": [
+        "📚 Extensive reading of textbooks and papers",
+        "✍️ Take detailed, organized notes",
+        "📝 Write summaries and explanations",
+        "📖 Create study guides and cheat sheets"
+    ]
+}
+
+# Quotes opening each study plan
+MOTIVATIONAL_QUOTES = [
+    "Success is the sum of small efforts repeated day in and day out.",
+    "The expert in anything was once a beginner.",
+    "Learning never exhausts the mind - embrace the journey!",
+    "Every master was once a disaster - keep going!",
+    "Knowledge is power, and power is the ability to act."
+]
+
+# Phrasings for study plan learning objectives
+OBJECTIVE_TEMPLATES = [
+    "Master the fundamental principles of",
+    "Develop deep understanding in",
+    "Build practical expertise with",
+    "Achieve proficiency in",
+    "Gain comprehensive knowledge of"
+]
+
+# Study plan guidance per difficulty preference (anything else is treated as hard)
+DIFFICULTY_PROGRESSION = {
+    "easy": """
+- Start with foundational concepts and basic examples
+- Gradually introduce complexity through guided practice
+- Focus on understanding before memorization
+- Use multiple approaches to reinforce learning
+""",
+    "medium": """
+- Balance foundational and advanced concepts
+- Mix theoretical understanding with practical application
+- Challenge yourself with progressively harder problems
+- Seek connections between different topics
+""",
+    "hard": """
+- Dive deep into complex concepts early
+- Focus on problem-solving and critical thinking
+- Explore advanced applications and edge cases
+- Push beyond comfort zone for maximum growth
+""",
+}
+
+# Bullet markers for explanation concepts
+CONCEPT_STARTERS = ["🔹", "🔸", "📌", "🎯", "💡"]
+
+# Follow-up lines for comprehensive explanations
+CONCEPT_ELABORATIONS = [
+    "   - This forms the foundation for advanced understanding",
+    "   - Essential for practical applications in real-world scenarios",
+    "   - Connects directly to other fundamental principles",
+    "   - Critical for problem-solving and analysis"
+]
+
+# Multiple choice question pools
+CALCULUS_QUESTIONS = [
+    {
+        "question": "What is the derivative of x³?",
+        "options": ["x²", "2x²", "3x²", "3x"],
+        "correct_answer": "3x²",
+        "explanation": "Using the power rule: d/dx(x^n) = n*x^(n-1). For x³, n=3, so d/dx(x³) = 3*x^(3-1) = 3x².",
+        "difficulty": "easy"
+    },
+    {
+        "question": "What is the derivative of sin(x)?",
+        "options": ["cos(x)", "-cos(x)", "sin(x)", "-sin(x)"],
+        "correct_answer": "cos(x)",
+        "explanation": "The derivative of sin(x) is cos(x). This is a fundamental trigonometric derivative.",
+        "difficulty": "easy"
+    },
+    {
+        "question": "What does the chain rule help us find?",
+        "options": ["Derivatives of composite functions", "Integrals", "Limits", "Areas"],
+        "correct_answer": "Derivatives of composite functions",
+        "explanation": "The chain rule is used to find derivatives of composite functions like f(g(x)).",
+        "difficulty": "medium"
+    },
+    {
+        "question": "If f(x) = e^(2x), what is f'(x)?",
+        "options": ["2e^(2x)", "e^(2x)", "2e^x", "e^(2x) + 2"],
+        "correct_answer": "2e^(2x)",
+        "explanation": "Using the chain rule: d/dx[e^(2x)] = e^(2x) · d/dx[2x] = e^(2x) · 2 = 2e^(2x).",
+        "difficulty": "medium"
+    },
+    {
+        "question": "What is ∫(1/x)dx?",
+        "options": ["ln|x| + C", "x + C", "1/x² + C", "-1/x + C"],
+        "correct_answer": "ln|x| + C",
+        "explanation": "The integral of 1/x is the natural logarithm: ∫(1/x)dx = ln|x| + C.",
+        "difficulty": "medium"
+    },
+    {
+        "question": "What is the second derivative test used for?",
+        "options": ["Finding concavity and inflection points", "Finding limits", "Integration", "Solving equations"],
+        "correct_answer": "Finding concavity and inflection points",
+        "explanation": "The second derivative test helps determine concavity (f'' > 0 means concave up) and locate inflection points.",
+        "difficulty": "hard"
+    }
+]
+
+ALGEBRA_QUESTIONS = [
+    {
+        "question": "What is the solution to 2x + 5 = 13?",
+        "options": ["x = 4", "x = 8", "x = 9", "x = 3"],
+        "correct_answer": "x = 4",
+        "explanation": "Subtract 5 from both sides: 2x = 8, then divide by 2: x = 4.",
+        "difficulty": "easy"
+    },
+    {
+        "question": "What is the vertex form of a quadratic equation?",
+        "options": ["y = ax² + bx + c", "y = a(x-h)² + k", "y = mx + b", "y = 1/x"],
+        "correct_answer": "y = a(x-h)² + k",
+        "explanation": "The vertex form y = a(x-h)² + k shows the vertex at point (h,k).",
+        "difficulty": "medium"
+    },
+    {
+        "question": "If x² - 5x + 6 = 0, what are the solutions?",
+        "options": ["x = 2, 3", "x = 1, 6", "x = -2, -3", "x = 5, 1"],
+        "correct_answer": "x = 2, 3",
+        "explanation": "Factor: (x-2)(x-3) = 0, so x = 2 or x = 3.",
+        "difficulty": "medium"
+    }
+]
+
+PHYSICS_QUESTIONS = [
+    {
+        "question": "What is Newton's First Law?",
+        "options": ["F = ma", "Action equals reaction", "Objects in motion stay in motion", "Gravity attracts objects"],
+        "correct_answer": "Objects in motion stay in motion",
+        "explanation": "Newton's First Law states that an object in motion will stay in motion unless acted upon by an external force.",
+        "difficulty": "easy"
+    },
+    {
+        "question": "What is the formula for kinetic energy?",
+        "options": ["KE = mgh", "KE = ½mv²", "KE = Fd", "KE = Pt"],
+        "correct_answer": "KE = ½mv²",
+        "explanation": "Kinetic energy is calculated using KE = ½mv², where m is mass and v is velocity.",
+        "difficulty": "medium"
+    }
+]
+
+# Topic keyword -> question pool; matched by substring in either direction
+QUESTION_POOLS = {
+    "calculus": CALCULUS_QUESTIONS,
+    "algebra": ALGEBRA_QUESTIONS,
+    "physics": PHYSICS_QUESTIONS,
+    "mechanics": PHYSICS_QUESTIONS,
+    "programming": [
+        {
+            "question": "What is a variable in programming?",
+            "options": ["A storage location with a name", "A function", "A loop", "An error"],
+            "correct_answer": "A storage location with a name",
+            "explanation": "A variable is a named storage location that can hold different values during program execution.",
+            "difficulty": "easy"
+        }
+    ]
+}
+
+# Static true/false and fill-in-the-blank questions for calculus topics
+CALCULUS_TRUE_FALSE_QUESTIONS = [
+    {
+        "question": "The derivative of a constant is always zero.",
+        "options": ["True", "False"],
+        "correct_answer": "True",
+        "explanation": "A constant doesn't change, so its rate of change is zero."
+    },
+    {
+        "question": "The integral of a function is always positive.",
+        "options": ["True", "False"],
+        "correct_answer": "False",
+        "explanation": "Integrals can be positive, negative, or zero depending on the function and interval."
+    },
+    {
+        "question": "All continuous functions are differentiable.",
+        "options": ["True", "False"],
+        "correct_answer": "False",
+        "explanation": "Not all continuous functions are differentiable (e.g., |x| at x=0)."
+    }
+]
+
+CALCULUS_FILL_BLANK_QUESTIONS = [
+    {
+        "question": "The derivative of x² is _____.",
+        "options": ["2x", "x", "2x²", "x²"],
+        "correct_answer": "2x",
+        "explanation": "Using the power rule: d/dx(x^n) = n*x^(n-1). For x², n=2, so d/dx(x²) = 2x."
+    },
+    {
+        "question": "The integral of 2x is _____.",
+        "options": ["x²", "x² + C", "2x²", "2x² + C"],
+        "correct_answer": "x² + C",
+        "explanation": "The integral of 2x is x² + C, where C is the constant of integration."
+    }
+]
+
 # Enhanced study plan generator with intelligent algorithms
 def generate_intelligent_study_plan(subject, level, minutes_per_day, duration_days, goal, learning_style, previous_knowledge, difficulty_preference):
     """Generate an intelligent, personalized study plan using knowledge base."""
@@ -636,40 +886,13 @@ def generate_intelligent_study_plan(subject, level, minutes_per_day, duration_da
         topics = all_topics  # Include all available topics
     
     # Add variety by shuffling for different experiences each time
-    import random
     random.shuffle(topics)
     if len(topics) > 3:
         topics = topics[:3]  # Keep manageable number
     
     # Personalize based on learning style
-    style_methods = {
-        "visual": [
-            "📊 Create mind maps and concept diagrams",
-            "🎨 Use color-coded notes and visual organizers",
-            "📱 Watch educational videos and animations",
-            "🖼️ Draw sketches and flowcharts"
-        ],
-        "auditory": [
-            "🎧 Listen to educational podcasts and lectures",
-            "🗣️ Join study groups and discussion sessions",
-            "📝 Read notes aloud and record yourself",
-            "🎵 Use mnemonic devices and rhymes"
-        ],
-        "kinesthetic": [
-            "✋ Build physical models and prototypes",
-            "🏃 Practice with hands-on experiments",
-            "🎯 Use interactive simulations and games",
-            "✏️ Write and rewrite notes by hand"
-        ],
-        "reading/writing": [
-            "📚 Extensive reading of textbooks and papers",
-            "✍️ Take detailed, organized notes",
-            "📝 Write summaries and explanations",
-            "📖 Create study guides and cheat sheets"
-        ]
-    }
     
-    methods = style_methods.get(learning_style, style_methods["visual"])
+    methods = STYLE_METHODS.get(learning_style, STYLE_METHODS["visual"])
     
     # Calculate time distribution intelligently
     total_minutes = minutes_per_day * duration_days
@@ -679,25 +902,14 @@ def generate_intelligent_study_plan(subject, level, minutes_per_day, duration_da
     assessment_time = total_minutes * 0.1 # 10% for assessment
     
     # Generate highly personalized and detailed plan
-    import random
-    from datetime import datetime, timedelta
-    
     # Create personalized header with motivation
-    motivational_quotes = [
-        "Success is the sum of small efforts repeated day in and day out.",
-        "The expert in anything was once a beginner.",
-        "Learning never exhausts the mind - embrace the journey!",
-        "Every master was once a disaster - keep going!",
-        "Knowledge is power, and power is the ability to act."
-    ]
-    
-    selected_quote = random.choice(motivational_quotes)
+    selected_quote = random.choice(MOTIVATIONAL_QUOTES)
     
     # Calculate smart time distribution
     total_study_time = minutes_per_day * duration_days
     weekly_hours = (minutes_per_day * 7) / 60
     
-    plan = f"""
+    parts = [f"""
 ## 📚 {subject.title()} Mastery Plan - {level.title()} Level
 *"{ selected_quote }"*
 
@@ -711,17 +923,9 @@ def generate_intelligent_study_plan(subject, level, minutes_per_day, duration_da
 
 ### 🎯 Personalized Learning Objectives:
 *Tailored specifically for your {level} level and {difficulty_preference} difficulty preference*
-"""
+"""]
     
     # Enhanced objective generation with variety
-    objective_templates = [
-        "Master the fundamental principles of",
-        "Develop deep understanding in",
-        "Build practical expertise with",
-        "Achieve proficiency in",
-        "Gain comprehensive knowledge of"
-    ]
-    
     for i, topic in enumerate(topics, 1):
         topic_content = subject_knowledge[topic].get(level.lower(), subject_knowledge[topic]["beginner"])
         concepts = topic_content["concepts"]
@@ -734,18 +938,18 @@ def generate_intelligent_study_plan(subject, level, minutes_per_day, duration_da
         else:  # hard
             selected_concepts = concepts
         
-        objective_template = random.choice(objective_templates)
-        plan += f"\n{i}. **{objective_template} {topic.title()}**"
-        plan += f"\n   - {', '.join(selected_concepts)}"
+        objective_template = random.choice(OBJECTIVE_TEMPLATES)
+        parts.append(f"\n{i}. **{objective_template} {topic.title()}**")
+        parts.append(f"\n   - {', '.join(selected_concepts)}")
         
         # Add specific learning outcomes
         outcomes = topic_content.get("applications", ["Practical problem solving"])
-        plan += f"\n   - *Outcome*: {random.choice(outcomes)}"
+        parts.append(f"\n   - *Outcome*: {random.choice(outcomes)}")
     
-    plan += f"""
+    parts.append(f"""
 
 ### 📅 Weekly Schedule:
-"""
+""")
     
     weeks = (duration_days + 6) // 7  # Calculate number of weeks
     for week in range(1, weeks + 1):
@@ -763,9 +967,9 @@ def generate_intelligent_study_plan(subject, level, minutes_per_day, duration_da
             else:
                 week_details.append(topic.title())
         
-        plan += f"- **Week {week} (Days {start_day}-{end_day})**: Focus on {', '.join(week_details)}\n"
+        parts.append(f"- **Week {week} (Days {start_day}-{end_day})**: Focus on {', '.join(week_details)}\n")
     
-    plan += f"""
+    parts.append(f"""
 
 ### 🧪 Practice Activities (Total: {int(practice_time)} minutes):
 - **Daily Problem Solving**: {minutes_per_day//4} minutes - Work through exercises and examples
@@ -774,12 +978,12 @@ def generate_intelligent_study_plan(subject, level, minutes_per_day, duration_da
 - **Study Groups**: {minutes_per_day//6} minutes - Discuss and explain concepts to others
 
 ### 🎨 Learning Methods (Personalized for {learning_style} style):
-"""
+""")
     
     for method in methods:
-        plan += f"- {method}"
+        parts.append(f"- {method}")
     
-    plan += f"""
+    parts.append(f"""
 
 ### 📊 Progress Tracking:
 - **Daily**: Quick concept review and practice
@@ -788,55 +992,33 @@ def generate_intelligent_study_plan(subject, level, minutes_per_day, duration_da
 - **Monthly**: Major milestone evaluation and plan refinement
 
 ### 💡 Difficulty Progression ({difficulty_preference} preference):
-"""
+""")
     
-    if difficulty_preference == "easy":
-        plan += """
-- Start with foundational concepts and basic examples
-- Gradually introduce complexity through guided practice
-- Focus on understanding before memorization
-- Use multiple approaches to reinforce learning
-"""
-    elif difficulty_preference == "medium":
-        plan += """
-- Balance foundational and advanced concepts
-- Mix theoretical understanding with practical application
-- Challenge yourself with progressively harder problems
-- Seek connections between different topics
-"""
-    else:  # hard
-        plan += """
-- Dive deep into complex concepts early
-- Focus on problem-solving and critical thinking
-- Explore advanced applications and edge cases
-- Push beyond comfort zone for maximum growth
-"""
+    parts.append(DIFFICULTY_PROGRESSION.get(difficulty_preference, DIFFICULTY_PROGRESSION["hard"]))
     
-    plan += f"""
+    parts.append(f"""
 
 ### 🔍 Topic-Specific Content:
 This plan incorporates {len(topics)} key topics with level-appropriate content:
-"""
+""")
     
     for topic in topics:
         topic_content = subject_knowledge[topic].get(level.lower(), subject_knowledge[topic]["beginner"])
-        plan += f"- **{topic.title()}**: {len(topic_content['concepts'])} core concepts, {len(topic_content['examples'])} examples, {len(topic_content['applications'])} applications\n"
+        parts.append(f"- **{topic.title()}**: {len(topic_content['concepts'])} core concepts, {len(topic_content['examples'])} examples, {len(topic_content['applications'])} applications\n")
     
     # Add specific examples for the selected topics
-    plan += f"\n### 📝 Specific Examples for {level.title()} Level:\n"
+    parts.append(f"\n### 📝 Specific Examples for {level.title()} Level:\n")
     for topic in topics:
         topic_content = subject_knowledge[topic].get(level.lower(), subject_knowledge[topic]["beginner"])
         examples = topic_content["examples"][:2]  # Get 2 examples
-        plan += f"- **{topic.title()}**: {', '.join(examples)}\n"
+        parts.append(f"- **{topic.title()}**: {', '.join(examples)}\n")
     
-    return plan
+    return "".join(parts)
 
 # Enhanced explanation generator with contextual intelligence
 def generate_intelligent_explanation(topic, level, explanation_type, include_visuals, use_cot, include_examples):
     """Generate an intelligent, contextual explanation using knowledge base."""
     
-    import random
-    
     # Advanced topic matching with fuzzy search
     topic_found = False
     topic_data = {}
@@ -899,84 +1081,76 @@ def generate_intelligent_explanation(topic, level, explanation_type, include_vis
     
     selected_intro = random.choice(intro_phrases)
     
-    explanation = f"""
+    parts = [f"""
 {selected_header}
 
 *{selected_intro}*
 
 ### 📖 Core Concepts & Principles:
 *Building your foundation step by step*
-"""
+"""]
     
     # Enhanced concept presentation with variety
-    concept_starters = ["🔹", "🔸", "📌", "🎯", "💡"]
-    
     for i, concept in enumerate(concepts, 1):
-        starter = random.choice(concept_starters)
-        explanation += f"{i}. {starter} **{concept}**\n"
+        starter = random.choice(CONCEPT_STARTERS)
+        parts.append(f"{i}. {starter} **{concept}**\n")
         
         # Add elaboration for advanced explanations
         if explanation_type in ["comprehensive", "with examples"]:
-            elaborations = [
-                "   - This forms the foundation for advanced understanding",
-                "   - Essential for practical applications in real-world scenarios",
-                "   - Connects directly to other fundamental principles",
-                "   - Critical for problem-solving and analysis"
-            ]
-            explanation += f"{random.choice(elaborations)}\n"
-    
-    explanation += f"""
+            parts.append(f"{random.choice(CONCEPT_ELABORATIONS)}\n")
+    
+    parts.append(f"""
 
 ### 🔍 {explanation_type.title()} Breakdown:
-"""
+""")
     
     if explanation_type == "conceptual":
-        explanation += f"""
+        parts.append(f"""
 - **What it is**: {topic.title()} represents fundamental principles in {subject_name}
 - **Why it matters**: Understanding {topic.lower()} is crucial for advanced learning in {subject_name}
 - **Key insight**: It connects multiple related concepts together
 - **Core principle**: {concepts[0] if concepts else 'Fundamental understanding'}
-"""
+""")
     elif explanation_type == "step-by-step":
-        explanation += f"""
+        parts.append(f"""
 1. **Foundation**: Start with basic principles and definitions
 2. **Building blocks**: Understand component parts and relationships
 3. **Integration**: See how pieces fit together
 4. **Application**: Practice with real-world examples
 5. **Mastery**: Develop deep understanding and intuition
-"""
+""")
     elif explanation_type == "with examples":
-        explanation += f"""
+        parts.append(f"""
 - **Simple case**: Start with basic, clear examples
 - **Intermediate**: Build complexity step by step
 - **Advanced**: Explore edge cases and variations
 - **Real-world**: Connect to practical applications
-"""
+""")
     else:  # comprehensive
-        explanation += f"""
+        parts.append(f"""
 - **Theoretical foundation**: Understand underlying principles
 - **Practical application**: See how theory becomes practice
 - **Historical context**: Learn about development and evolution
 - **Future implications**: Explore current research and applications
-"""
+""")
     
     if include_examples and examples:
-        explanation += f"""
+        parts.append(f"""
 
 ### 💡 Specific Examples for {level.title()} Level:
-"""
+""")
         for i, example in enumerate(examples, 1):
-            explanation += f"{i}. **{example}**\n"
+            parts.append(f"{i}. **{example}**\n")
     
     if include_visuals:
-        explanation += f"""
+        parts.append(f"""
 
 ### 🎨 Visual Description:
 Imagine {topic.lower()} as a building with multiple floors. Each floor represents a different aspect or level of understanding. As you climb higher, you see more connections and applications. The foundation supports everything above, just as basic concepts support advanced understanding.
-"""
+""")
     
     if use_cot:
-        explanation += f"""
+        parts.append(f"""
 
 ### 🤔 Chain of Thought:
 1. **Question**: What is {topic} and why is it important in {subject_name}?
@@ -985,17 +1159,17 @@ def generate_intelligent_explanation(topic, level, explanation_type, include_vis
 4. **Connection**: This relates to other concepts because...
 5. **Application**: We use this in practice when...
 6. **Conclusion**: {topic.title()} is essential for understanding {subject_name}...
-"""
+""")
     
     if applications:
-        explanation += f"""
+        parts.append(f"""
 
 ### 🌍 Real-World Applications:
-"""
+""")
         for i, application in enumerate(applications, 1):
-            explanation += f"{i}. **{application}**\n"
+            parts.append(f"{i}. **{application}**\n")
     
-    explanation += f"""
+    parts.append(f"""
 
 ### 📚 Next Steps:
 - Practice with progressively challenging problems
@@ -1006,9 +1180,9 @@ def generate_intelligent_explanation(topic, level, explanation_type, include_vis
 
 ### 🎯 Level-Appropriate Focus:
 For {level} level, focus on: {', '.join(concepts[:2])}
-"""
+""")
     
-    return explanation
+    return "".join(parts)
 
 # Enhanced quiz generator with variety and intelligence
 def generate_intelligent_quiz(topic, difficulty, num_questions, question_type):
@@ -1051,124 +1225,24 @@ def generate_intelligent_quiz(topic, difficulty, num_questions, question_type):
 def generate_multiple_choice_questions(topic, topic_data, difficulty, num_questions):
     """Generate varied multiple choice questions with intelligent algorithms."""
     
-    import random
-    
     # Enhanced question pools with more variety
-    calculus_questions_pool = [
-        {
-            "question": "What is the derivative of x³?",
-            "options": ["x²", "2x²", "3x²", "3x"],
-            "correct_answer": "3x²",
-            "explanation": "Using the power rule: d/dx(x^n) = n*x^(n-1). For x³, n=3, so d/dx(x³) = 3*x^(3-1) = 3x².",
-            "difficulty": "easy"
-        },
-        {
-            "question": "What is the derivative of sin(x)?",
-            "options": ["cos(x)", "-cos(x)", "sin(x)", "-sin(x)"],
-            "correct_answer": "cos(x)",
-            "explanation": "The derivative of sin(x) is cos(x). This is a fundamental trigonometric derivative.",
-            "difficulty": "easy"
-        },
-        {
-            "question": "What does the chain rule help us find?",
-            "options": ["Derivatives of composite functions", "Integrals", "Limits", "Areas"],
-            "correct_answer": "Derivatives of composite functions",
-            "explanation": "The chain rule is used to find derivatives of composite functions like f(g(x)).",
-            "difficulty": "medium"
-        },
-        {
-            "question": "If f(x) = e^(2x), what is f'(x)?",
-            "options": ["2e^(2x)", "e^(2x)", "2e^x", "e^(2x) + 2"],
-            "correct_answer": "2e^(2x)",
-            "explanation": "Using the chain rule: d/dx[e^(2x)] = e^(2x) · d/dx[2x] = e^(2x) · 2 = 2e^(2x).",
-            "difficulty": "medium"
-        },
-        {
-            "question": "What is ∫(1/x)dx?",
-            "options": ["ln|x| + C", "x + C", "1/x² + C", "-1/x + C"],
-            "correct_answer": "ln|x| + C",
-            "explanation": "The integral of 1/x is the natural logarithm: ∫(1/x)dx = ln|x| + C.",
-            "difficulty": "medium"
-        },
-        {
-            "question": "What is the second derivative test used for?",
-            "options": ["Finding concavity and inflection points", "Finding limits", "Integration", "Solving equations"],
-            "correct_answer": "Finding concavity and inflection points",
-            "explanation": "The second derivative test helps determine concavity (f'' > 0 means concave up) and locate inflection points.",
-            "difficulty": "hard"
-        }
-    ]
     
-    algebra_questions_pool = [
-        {
-            "question": "What is the solution to 2x + 5 = 13?",
-            "options": ["x = 4", "x = 8", "x = 9", "x = 3"],
-            "correct_answer": "x = 4",
-            "explanation": "Subtract 5 from both sides: 2x = 8, then divide by 2: x = 4.",
-            "difficulty": "easy"
-        },
-        {
-            "question": "What is the vertex form of a quadratic equation?",
-            "options": ["y = ax² + bx + c", "y = a(x-h)² + k", "y = mx + b", "y = 1/x"],
-            "correct_answer": "y = a(x-h)² + k",
-            "explanation": "The vertex form y = a(x-h)² + k shows the vertex at point (h,k).",
-            "difficulty": "medium"
-        },
-        {
-            "question": "If x² - 5x + 6 = 0, what are the solutions?",
-            "options": ["x = 2, 3", "x = 1, 6", "x = -2, -3", "x = 5, 1"],
-            "correct_answer": "x = 2, 3",
-            "explanation": "Factor: (x-2)(x-3) = 0, so x = 2 or x = 3.",
-            "difficulty": "medium"
-        }
-    ]
     
-    physics_questions_pool = [
-        {
-            "question": "What is Newton's First Law?",
-            "options": ["F = ma", "Action equals reaction", "Objects in motion stay in motion", "Gravity attracts objects"],
-            "correct_answer": "Objects in motion stay in motion",
-            "explanation": "Newton's First Law states that an object in motion will stay in motion unless acted upon by an external force.",
-            "difficulty": "easy"
-        },
-        {
-            "question": "What is the formula for kinetic energy?",
-            "options": ["KE = mgh", "KE = ½mv²", "KE = Fd", "KE = Pt"],
-            "correct_answer": "KE = ½mv²",
-            "explanation": "Kinetic energy is calculated using KE = ½mv², where m is mass and v is velocity.",
-            "difficulty": "medium"
-        }
-    ]
     
     # Smart question pool selection
-    base_questions = {
-        "calculus": calculus_questions_pool,
-        "algebra": algebra_questions_pool,
-        "physics": physics_questions_pool,
-        "mechanics": physics_questions_pool,
-        "programming": [
-            {
-                "question": "What is a variable in programming?",
-                "options": ["A storage location with a name", "A function", "A loop", "An error"],
-                "correct_answer": "A storage location with a name",
-                "explanation": "A variable is a named storage location that can hold different values during program execution.",
-                "difficulty": "easy"
-            }
-        ]
-    }
     
     # Intelligent question selection based on topic and difficulty
     topic_questions = []
     
     # Find matching questions
-    for topic_key, questions in base_questions.items():
+    for topic_key, questions in QUESTION_POOLS.items():
         if topic.lower() in topic_key.lower() or topic_key.lower() in topic.lower():
             topic_questions = questions
             break
     
     # Fallback to calculus if no match found
     if not topic_questions:
-        topic_questions = calculus_questions_pool
+        topic_questions = CALCULUS_QUESTIONS
     
     # Smart difficulty filtering
     filtered_questions = []
@@ -1182,7 +1256,7 @@ def generate_multiple_choice_questions(topic, topic_data, difficulty, num_questi
     
     # If no filtered questions, use all available
     if not filtered_questions:
-        filtered_questions = topic_questions
+        filtered_questions = list(topic_questions)  # copy: shuffled in place below
     
     # Shuffle for variety
     random.shuffle(filtered_questions)
@@ -1218,26 +1292,7 @@ def generate_true_false_questions(topic, topic_data, difficulty, num_questions):
     
     # Generate T/F questions based on topic data
     if topic.lower() in ["calculus", "derivatives"]:
-        tf_questions = [
-            {
-                "question": "The derivative of a constant is always zero.",
-                "options": ["True", "False"],
-                "correct_answer": "True",
-                "explanation": "A constant doesn't change, so its rate of change is zero."
-            },
-            {
-                "question": "The integral of a function is always positive.",
-                "options": ["True", "False"],
-                "correct_answer": "False",
-                "explanation": "Integrals can be positive, negative, or zero depending on the function and interval."
-            },
-            {
-                "question": "All continuous functions are differentiable.",
-                "options": ["True", "False"],
-                "correct_answer": "False",
-                "explanation": "Not all continuous functions are differentiable (e.g., |x| at x=0)."
-            }
-        ]
+        tf_questions = CALCULUS_TRUE_FALSE_QUESTIONS
     else:
         tf_questions = [
             {
@@ -1280,20 +1335,7 @@ def generate_fill_blank_questions(topic, topic_data, difficulty, num_questions):
     questions = []
     
     if topic.lower() in ["calculus", "derivatives"]:
-        fill_questions = [
-            {
-                "question": "The derivative of x² is _____.",
-                "options": ["2x", "x", "2x²", "x²"],
-                "correct_answer": "2x",
-                "explanation": "Using the power rule: d/dx(x^n) = n*x^(n-1). For x², n=2, so d/dx(x²) = 2x."
-            },
-            {
-                "question": "The integral of 2x is _____.",
-                "options": ["x²", "x² + C", "2x²", "2x² + C"],
-                "correct_answer": "x² + C",
-                "explanation": "The integral of 2x is x² + C, where C is the constant of integration."
-            }
-        ]
+        fill_questions = CALCULUS_FILL_BLANK_QUESTIONS
     else:
         fill_questions = [
             {
@@ -1338,14 +1380,10 @@ def generate_mixed_questions(topic, topic_data, difficulty, num_questions):
 def main():
     """Main application with clean interface."""
     
+    st.markdown(CSS, unsafe_allow_html=True)
+
     # Header
-    st.markdown("""
-    <div class="main-header">
-        <h1>🎓 SmartLearn Enhanced</h1>
-        <h3>AI-Powered Study Assistant with Advanced Intelligence</h3>
-        <p>Study Plans • Explanations • Adaptive Quizzes</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
     
     # Sidebar - Clean and simple
     with st.sidebar:
@@ -1360,20 +1398,10 @@ def main():
         
         # Background Systems Status (Read-only)
         st.markdown("## 🔧 System Status")
-        st.markdown(f"**Core System:** <span class='status-badge status-active'>Active</span>", unsafe_allow_html=True)
-        st.markdown(f"**AI Engine:** <span class='status-badge status-active'>Active</span>", unsafe_allow_html=True)
-        st.markdown(f"**Knowledge Base:** <span class='status-badge status-active'>Active</span>", unsafe_allow_html=True)
+        st.markdown(STATUS_BADGES_HTML, unsafe_allow_html=True)
         
         st.markdown("---")
-        st.markdown("""
-        <small>
-        💡 **Intelligent Features:**
-        • Advanced Study Planning
-        • Contextual Explanations
-        • Varied Quiz Generation
-        • Personalized Learning
-        </small>
-        """, unsafe_allow_html=True)
+        st.markdown(SIDEBAR_FEATURES_HTML, unsafe_allow_html=True)
     
     # Main content - Only 3 tabs with proper spacing
     tab1, tab2, tab3 = st.tabs([
@@ -1699,11 +1727,7 @@ def main():
 
     # Footer with subtle advanced features indicator
     st.markdown("---")
-    st.markdown("""
-    <div style="text-align: center; color: #666; font-size: 0.8rem;">
-        🚀 Powered by SmartLearn Intelligent AI • Advanced Algorithms • Varied Content • Personalized Learning
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
@@ -148,7 +148,7 @@ def export_metrics_data(metrics_collector: MetricsCollector):
                     "model_accuracy": m.model_accuracy,
                     "user_engagement": m.user_engagement
                 }
-                for m in metrics_collector.performance_metrics
+                for m in metrics_collector.snapshot("performance")
             ],
             "training_metrics": [
                 {
@@ -160,7 +160,7 @@ def export_metrics_data(metrics_collector: MetricsCollector):
                     "accuracy": m.accuracy,
                     "timestamp": m.timestamp.isoformat() if m.timestamp else None
                 }
-                for m in metrics_collector.training_metrics
+                for m in metrics_collector.snapshot("training")
             ],
             "user_metrics": [
                 {
@@ -173,7 +173,7 @@ def export_metrics_data(metrics_collector: MetricsCollector):
                     "accuracy": m.accuracy,
                     "engagement_score": m.engagement_score
                 }
-                for m in metrics_collector.user_metrics
+                for m in metrics_collector.snapshot("user")
             ]
         }
         
@@ -197,9 +197,7 @@ def export_metrics_data(metrics_collector: MetricsCollector):
 def clear_metrics_cache(metrics_collector: MetricsCollector):
     """Clear the metrics cache"""
     try:
-        metrics_collector.performance_metrics.clear()
-        metrics_collector.training_metrics.clear()
-        metrics_collector.user_metrics.clear()
+        metrics_collector.clear()
         st.success("✅ Metrics cache cleared successfully!")
         st.rerun()
     except Exception as e:
@@ -5,6 +5,7 @@
 
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
@@ -14,7 +15,7 @@
     StudyPlanPrompt, ExplanationPrompt, QuizPrompt, 
     AdaptivePromptManager, AdvancedPromptTemplate
 )
-from .rag import EnhancedRAG, HybridSearchEngine, QueryExpander
+from .rag import EnhancedRAG, HybridSearchEngine, QueryExpander, mmr_rerank
 from .fine_tuning import (
     FineTuningPipeline, TrainingExample, TrainingMetrics,
     generate_synthetic_data
@@ -24,6 +25,9 @@
     ImageProcessor, AudioProcessor, VideoProcessor
 )
 
+# Independent learning-experience components are built concurrently
+EXPERIENCE_MAX_WORKERS = 4
+
 class SmartLearnAdvanced:
     """Main class that integrates all advanced features."""
     
@@ -178,16 +182,18 @@ def get_document_insights(self, source: str) -> Dict[str, Any]:
             print(f"❌ Error getting document insights: {e}")
             return {}
     
-    def expand_and_search(self, query: str, k: int = 5) -> Tuple[str, List[Dict]]:
-        """Expand query and perform enhanced search."""
+    def expand_and_search(self, query: str, k: int = 5,
+                          lambda_mult: float = 0.7) -> Tuple[str, List[Dict]]:
+        """Expand query, search, and MMR-rerank the pooled results for diversity."""
         try:
             # Expand query
             expanded_queries = self.rag_system.query_expander.expand_query(query)
             
-            # Search with expanded queries
+            # Search with expanded queries, pooling about 2k candidates
+            per_query_k = max(1, -(-2 * k // 3))
             all_results = []
             for exp_query in expanded_queries[:3]:  # Use top 3 expanded queries
-                context, sources = self.rag_system.retrieve_relevant_context(exp_query, k=k//3)
+                context, sources = self.rag_system.retrieve_relevant_context(exp_query, k=per_query_k)
                 all_results.extend(sources)
             
             # Combine and deduplicate results
@@ -196,10 +202,18 @@ def expand_and_search(self, query: str, k: int = 5) -> Tuple[str, List[Dict]]:
                 chunk_id = result.get('chunk_id', 'unknown')
                 if chunk_id not in unique_results:
                     unique_results[chunk_id] = result
+            candidates = list(unique_results.values())
             
-            # Sort by relevance
-            sorted_results = sorted(unique_results.values(), 
-                                  key=lambda x: x.get('relevance_score', 0), reverse=True)
+            # Rerank by relevance to the query, penalising near-duplicate chunks
+            if len(candidates) > 1:
+                doc_embeddings = self.rag_system.emb.embed_documents(
+                    [result.get('content', '') for result in candidates]
+                )
+                query_embedding = self.rag_system.emb.embed_query(query)
+                order = mmr_rerank(query_embedding, doc_embeddings, k, lambda_mult)
+                sorted_results = [candidates[i] for i in order]
+            else:
+                sorted_results = candidates
             
             # Combine context
             combined_context = "\n\n".join([
@@ -244,16 +258,8 @@ def generate_synthetic_training_data(self, subject: str, num_examples: int = 50)
         """Generate synthetic training data for testing."""
         try:
             examples = generate_synthetic_data(subject, num_examples)
-            self.fine_tuning_pipeline.collect_user_data([
-                {
-                    "query": ex.input_text,
-                    "response": ex.target_text,
-                    "subject": ex.subject,
-                    "difficulty": ex.difficulty,
-                    "rating": ex.user_rating
-                }
-                for ex in examples
-            ])
+            # Already TrainingExamples, so skip the interaction-dict round trip
+            self.fine_tuning_pipeline.data_collector.add_batch_examples(examples)
             print(f"✅ Generated {len(examples)} synthetic training examples")
         except Exception as e:
             print(f"❌ Error generating synthetic data: {e}")
@@ -325,54 +331,59 @@ def create_comprehensive_learning_experience(self, subject: str, topic: str,
                 "components": {}
             }
             
-            # 1. Enhanced Study Plan
-            study_plan_prompt = self.generate_enhanced_study_plan(
-                subject, level, 60, 7, f"Learn {topic}", use_cot=True
-            )
+            # Each component runs its own RAG retrieval (and the multimodal one
+            # renders an image), so build them side by side rather than in turn
+            with ThreadPoolExecutor(max_workers=EXPERIENCE_MAX_WORKERS) as pool:
+                # 1. Enhanced Study Plan
+                study_plan = pool.submit(
+                    self.generate_enhanced_study_plan,
+                    subject, level, 60, 7, f"Learn {topic}", use_cot=True
+                )
+                # 2. Enhanced Explanation
+                explanation = pool.submit(
+                    self.generate_enhanced_explanation,
+                    topic, level, use_cot=True, include_examples=True
+                )
+                # 3. Enhanced Quiz
+                quiz = pool.submit(
+                    self.generate_enhanced_quiz,
+                    topic, level, difficulty, 10, use_cot=True
+                )
+                # 4. Advanced RAG Context
+                rag = pool.submit(
+                    self.advanced_search,
+                    f"{topic} {subject} {level}", k=5, use_hybrid=True
+                )
+                # 5. Multimodal Content (if enabled)
+                image = pool.submit(
+                    self.generate_educational_content,
+                    subject, "image", f"Create an educational diagram for {topic}"
+                ) if include_multimodal else None
+            
             experience["components"]["study_plan"] = {
-                "prompt": study_plan_prompt,
+                "prompt": study_plan.result(),
                 "type": "enhanced_prompt"
             }
-            
-            # 2. Enhanced Explanation
-            explanation_prompt = self.generate_enhanced_explanation(
-                topic, level, use_cot=True, include_examples=True
-            )
             experience["components"]["explanation"] = {
-                "prompt": explanation_prompt,
+                "prompt": explanation.result(),
                 "type": "enhanced_prompt"
             }
-            
-            # 3. Enhanced Quiz
-            quiz_prompt = self.generate_enhanced_quiz(
-                topic, level, difficulty, 10, use_cot=True
-            )
             experience["components"]["quiz"] = {
-                "prompt": quiz_prompt,
+                "prompt": quiz.result(),
                 "type": "enhanced_prompt"
             }
-            
-            # 4. Advanced RAG Context
-            rag_context, rag_sources = self.advanced_search(
-                f"{topic} {subject} {level}", k=5, use_hybrid=True
-            )
+            rag_context, rag_sources = rag.result()
             experience["components"]["rag_context"] = {
                 "context": rag_context,
                 "sources": rag_sources,
                 "type": "advanced_rag"
             }
-            
-            # 5. Multimodal Content (if enabled)
-            if include_multimodal:
-                # Generate educational image
-                image_content = self.generate_educational_content(
-                    subject, "image", f"Create an educational diagram for {topic}"
-                )
-                if image_content:
-                    experience["components"]["multimodal"] = {
-                        "image": image_content,
-                        "type": "generated_content"
-                    }
+            image_content = image.result() if image else None
+            if image_content:
+                experience["components"]["multimodal"] = {
+                    "image": image_content,
+                    "type": "generated_content"
+                }
             
             return experience
             
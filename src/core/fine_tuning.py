@@ -3,6 +3,8 @@
 This module handles data collection, preparation, training, and evaluation.
 """
 
+import gc
+import hashlib
 import json
 import os
 import pickle
@@ -21,6 +23,58 @@
 )
 import evaluate
 
+try:
+    from datasets import Dataset as HFDataset, load_from_disk
+    DATASETS_AVAILABLE = True
+except ImportError:
+    DATASETS_AVAILABLE = False
+
+try:
+    import flash_attn  # noqa: F401 - backs attn_implementation="flash_attention_2"
+    FLASH_ATTN_AVAILABLE = True
+except ImportError:
+    FLASH_ATTN_AVAILABLE = False
+
+# Batched tokenization only fans out to worker processes for large corpora
+TOKENIZE_BATCH_SIZE = 1000
+TOKENIZE_PARALLEL_MIN_EXAMPLES = 10000
+TOKENIZE_NUM_PROC = min(4, os.cpu_count() or 1)
+
+# Tokenized datasets are saved here as Arrow files, keyed by a digest of their inputs
+TOKENIZED_CACHE_DIR = "data/cache/tokenized"
+
+def model_load_kwargs(torch_dtype: Optional[torch.dtype] = None) -> Dict[str, Any]:
+    """Extra from_pretrained arguments for loading the base causal LM."""
+    # PyTorch SDPA gives memory-efficient attention kernels instead of eager attention
+    kwargs = {"attn_implementation": "sdpa"}
+    if torch_dtype is not None:
+        kwargs["torch_dtype"] = torch_dtype
+        # FlashAttention-2 needs half-precision weights on an Ampere or newer GPU
+        if (FLASH_ATTN_AVAILABLE and torch_dtype in (torch.float16, torch.bfloat16)
+                and torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 8):
+            kwargs["attn_implementation"] = "flash_attention_2"
+    return kwargs
+
+def release_device_memory():
+    """Collect garbage and hand cached accelerator memory back to the allocator."""
+    gc.collect()
+    if torch.backends.mps.is_available():
+        torch.mps.synchronize()
+        torch.mps.empty_cache()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+def dataloader_kwargs() -> Dict[str, Any]:
+    """TrainingArguments DataLoader settings for the available device."""
+    if torch.backends.mps.is_available():
+        # Apple unified memory: pinning does not apply and workers only add overhead
+        return {"dataloader_pin_memory": False, "dataloader_num_workers": 0}
+    # Pinned buffers let CUDA host-to-device copies overlap with compute
+    return {
+        "dataloader_pin_memory": torch.cuda.is_available(),
+        "dataloader_num_workers": min(4, os.cpu_count() or 1),
+    }
+
 @dataclass
 class TrainingExample:
     """Represents a single training example."""
@@ -44,6 +98,10 @@ class TrainingMetrics:
     training_time: float
     timestamp: str
 
+def format_training_text(example: TrainingExample) -> str:
+    """Combine input and target into the causal LM training text."""
+    return f"Input: {example.input_text}\nOutput: {example.target_text}"
+
 class SmartLearnDataset(Dataset):
     """Custom dataset for SmartLearn training data."""
     
@@ -56,10 +114,8 @@ def __len__(self):
         return len(self.examples)
     
     def __getitem__(self, idx):
-        example = self.examples[idx]
-        
         # Combine input and target
-        full_text = f"Input: {example.input_text}\nOutput: {example.target_text}"
+        full_text = format_training_text(self.examples[idx])
         
         # Tokenize
         encoding = self.tokenizer(
@@ -82,8 +138,33 @@ class DataCollector:
     def __init__(self, data_dir: str = "data/training"):
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
-        self.examples: List[TrainingExample] = []
-        self.load_existing_data()
+        self.data_file = os.path.join(data_dir, "training_data.json")
+        # Sidecar with the example count, so count() can skip parsing the JSON
+        self.count_file = os.path.join(data_dir, "training_data.count")
+        self._examples: Optional[List[TrainingExample]] = None
+    
+    @property
+    def examples(self) -> List[TrainingExample]:
+        """Training examples, loaded from disk on first access."""
+        if self._examples is None:
+            self._examples = []
+            self.load_existing_data()
+        return self._examples
+    
+    @examples.setter
+    def examples(self, examples: List[TrainingExample]):
+        self._examples = examples
+    
+    def count(self) -> int:
+        """Number of training examples, without loading them when possible."""
+        if self._examples is None:
+            try:
+                if os.path.getmtime(self.count_file) >= os.path.getmtime(self.data_file):
+                    with open(self.count_file, 'r') as f:
+                        return int(f.read())
+            except (OSError, ValueError):
+                pass
+        return len(self.examples)
     
     def add_example(self, example: TrainingExample):
         """Add a new training example."""
@@ -97,7 +178,7 @@ def add_batch_examples(self, examples: List[TrainingExample]):
     
     def load_existing_data(self):
         """Load existing training data from disk."""
-        data_file = os.path.join(self.data_dir, "training_data.json")
+        data_file = self.data_file
         if os.path.exists(data_file):
             try:
                 with open(data_file, 'r') as f:
@@ -110,10 +191,12 @@ def load_existing_data(self):
     
     def save_data(self):
         """Save training data to disk."""
-        data_file = os.path.join(self.data_dir, "training_data.json")
+        data_file = self.data_file
         try:
             with open(data_file, 'w') as f:
                 json.dump([asdict(ex) for ex in self.examples], f, indent=2)
+            with open(self.count_file, 'w') as f:
+                f.write(str(len(self.examples)))
         except Exception as e:
             print(f"❌ Error saving training data: {e}")
     
@@ -175,6 +258,57 @@ def create_training_data(self, examples: List[TrainingExample]) -> SmartLearnDat
         """Create training dataset from examples."""
         return SmartLearnDataset(examples, self.tokenizer, self.max_length)
     
+    def create_tokenized_dataset(self, examples: List[TrainingExample]) -> "HFDataset":
+        """Tokenize all examples once into an Arrow-backed dataset.
+        
+        Sequences are left unpadded; the data collator pads each batch, and
+        the ``length`` column lets the Trainer group similar lengths together.
+        The result is cached on disk and memory-mapped on later runs.
+        """
+        texts = [format_training_text(ex) for ex in examples]
+        cache_path = os.path.join(TOKENIZED_CACHE_DIR, self._cache_key(texts))
+        if os.path.isdir(cache_path):
+            return load_from_disk(cache_path, keep_in_memory=False)
+        
+        dataset = HFDataset.from_dict({"text": texts})
+        num_proc = TOKENIZE_NUM_PROC if len(examples) >= TOKENIZE_PARALLEL_MIN_EXAMPLES else None
+        dataset = dataset.map(
+            self._tokenize_batch,
+            batched=True,
+            batch_size=TOKENIZE_BATCH_SIZE,
+            num_proc=num_proc,
+            remove_columns=["text"],
+        )
+        dataset.save_to_disk(cache_path)
+        return load_from_disk(cache_path, keep_in_memory=False)
+    
+    def _cache_key(self, texts: List[str]) -> str:
+        """Digest of the tokenizer, max length and training texts."""
+        digest = hashlib.sha256(f"{self.tokenizer.name_or_path}:{self.max_length}".encode())
+        for text in texts:
+            digest.update(text.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()[:16]
+    
+    def _tokenize_batch(self, batch: Dict[str, List[str]]) -> Dict[str, List]:
+        encoded = self.tokenizer(batch["text"], truncation=True, max_length=self.max_length)
+        encoded["length"] = [len(ids) for ids in encoded["input_ids"]]
+        return encoded
+    
+    def split_dataset(self, dataset: "HFDataset", train_ratio: float = 0.8,
+                      val_ratio: float = 0.1) -> Tuple["HFDataset", "HFDataset", "HFDataset"]:
+        """Split a tokenized dataset into train/validation/test sets."""
+        total = len(dataset)
+        train_size = int(total * train_ratio)
+        val_size = int(total * val_ratio)
+        
+        # Shuffle indices; select() only builds index mappings over the Arrow table
+        indices = np.random.permutation(total)
+        
+        return (dataset.select(indices[:train_size]),
+                dataset.select(indices[train_size:train_size + val_size]),
+                dataset.select(indices[train_size + val_size:]))
+    
     def split_data(self, examples: List[TrainingExample], 
                    train_ratio: float = 0.8, val_ratio: float = 0.1) -> Tuple[List, List, List]:
         """Split data into train/validation/test sets."""
@@ -195,9 +329,11 @@ class FineTuner:
     """Handles the fine-tuning process."""
     
     def __init__(self, base_model: str = "microsoft/DialoGPT-medium", 
-                 output_dir: str = "models/fine_tuned"):
+                 output_dir: str = "models/fine_tuned",
+                 torch_dtype: Optional[torch.dtype] = None):
         self.base_model = base_model
         self.output_dir = output_dir
+        self.torch_dtype = torch_dtype
         os.makedirs(output_dir, exist_ok=True)
         
         self.tokenizer = None
@@ -210,8 +346,15 @@ def load_model(self):
         """Load the base model and tokenizer."""
         try:
             print(f"🔄 Loading base model: {self.base_model}")
-            self.tokenizer = AutoTokenizer.from_pretrained(self.base_model)
-            self.model = AutoModelForCausalLM.from_pretrained(self.base_model)
+            self.tokenizer = AutoTokenizer.from_pretrained(self.base_model, use_fast=True)
+            load_kwargs = model_load_kwargs(self.torch_dtype)
+            try:
+                self.model = AutoModelForCausalLM.from_pretrained(self.base_model, **load_kwargs)
+            except (TypeError, ValueError) as e:
+                # Older transformers releases do not support SDPA for every architecture
+                print(f"⚠️ Falling back to default attention: {e}")
+                load_kwargs.pop("attn_implementation")
+                self.model = AutoModelForCausalLM.from_pretrained(self.base_model, **load_kwargs)
             
             # Add padding token if not present
             if self.tokenizer.pad_token is None:
@@ -225,6 +368,12 @@ def load_model(self):
     def prepare_training_data(self, examples: List[TrainingExample]) -> Tuple[SmartLearnDataset, SmartLearnDataset]:
         """Prepare training and validation datasets."""
         preprocessor = DataPreprocessor(self.tokenizer)
+        if DATASETS_AVAILABLE:
+            # Tokenize once up front instead of on every __getitem__ call
+            tokenized = preprocessor.create_tokenized_dataset(examples)
+            train_dataset, val_dataset, _ = preprocessor.split_dataset(tokenized)
+            return train_dataset, val_dataset
+        
         train_examples, val_examples, _ = preprocessor.split_data(examples)
         
         train_dataset = preprocessor.create_training_data(train_examples)
@@ -251,13 +400,15 @@ def setup_training(self, train_dataset: SmartLearnDataset, val_dataset: SmartLea
             load_best_model_at_end=True,
             metric_for_best_model="eval_loss",
             greater_is_better=False,
-            dataloader_pin_memory=False,  # Disable for M3
-            dataloader_num_workers=0,     # Single worker
+            **dataloader_kwargs(),
+            group_by_length=DATASETS_AVAILABLE,  # Batch similar lengths to cut padding
+            length_column_name="length",
         )
         
         data_collator = DataCollatorForLanguageModeling(
             tokenizer=self.tokenizer,
-            mlm=False
+            mlm=False,
+            pad_to_multiple_of=8
         )
         
         self.trainer = Trainer(
@@ -313,7 +464,11 @@ def save_model(self):
         """Save the fine-tuned model."""
         try:
             model_path = os.path.join(self.output_dir, "final_model")
-            self.trainer.save_model(model_path)
+            if hasattr(self.model, "peft_config"):
+                # LoRA runs only need the adapter weights, not the full base checkpoint
+                self.model.save_pretrained(model_path, safe_serialization=True)
+            else:
+                self.trainer.save_model(model_path)
             self.tokenizer.save_pretrained(model_path)
             print(f"✅ Model saved to {model_path}")
         except Exception as e:
@@ -324,7 +479,7 @@ def load_fine_tuned_model(self, model_path: str):
         try:
             full_path = os.path.join(self.output_dir, model_path)
             self.model = AutoModelForCausalLM.from_pretrained(full_path)
-            self.tokenizer = AutoTokenizer.from_pretrained(full_path)
+            self.tokenizer = AutoTokenizer.from_pretrained(full_path, use_fast=True)
             print(f"✅ Fine-tuned model loaded from {full_path}")
         except Exception as e:
             print(f"❌ Error loading fine-tuned model: {e}")
@@ -344,10 +499,20 @@ def evaluate_examples(self, test_examples: List[TrainingExample]) -> Dict[str, f
         predictions = []
         targets = []
         
-        for example in test_examples:
+        # Encode every prompt in one batched tokenizer call
+        input_texts = [
+            f"Subject: {example.subject}\nDifficulty: {example.difficulty}\nQuery: {example.input_text}"
+            for example in test_examples
+        ]
+        encodings = self.tokenizer(input_texts, truncation=True, max_length=512)
+        
+        for example, input_ids, attention_mask in zip(test_examples, encodings["input_ids"],
+                                                      encodings["attention_mask"]):
             # Generate prediction
-            input_text = f"Subject: {example.subject}\nDifficulty: {example.difficulty}\nQuery: {example.input_text}"
-            inputs = self.tokenizer(input_text, return_tensors="pt", truncation=True, max_length=512)
+            inputs = {
+                "input_ids": torch.tensor([input_ids]),
+                "attention_mask": torch.tensor([attention_mask])
+            }
             
             with torch.no_grad():
                 outputs = self.model.generate(
@@ -367,8 +532,10 @@ def evaluate_examples(self, test_examples: List[TrainingExample]) -> Dict[str, f
         # In a real implementation, you'd use proper evaluation metrics
         metrics = {
             "num_examples": len(test_examples),
-            "avg_prediction_length": np.mean([len(p) for p in predictions]),
-            "avg_target_length": np.mean([len(t) for t in targets])
+            "avg_prediction_length": np.fromiter(map(len, predictions), dtype=np.int64,
+                                                 count=len(predictions)).mean(),
+            "avg_target_length": np.fromiter(map(len, targets), dtype=np.int64,
+                                             count=len(targets)).mean()
         }
         
         return metrics
@@ -376,9 +543,10 @@ def evaluate_examples(self, test_examples: List[TrainingExample]) -> Dict[str, f
 class FineTuningPipeline:
     """Complete fine-tuning pipeline for SmartLearn."""
     
-    def __init__(self, base_model: str = "microsoft/DialoGPT-medium"):
+    def __init__(self, base_model: str = "microsoft/DialoGPT-medium",
+                 torch_dtype: Optional[torch.dtype] = None):
         self.data_collector = DataCollector()
-        self.fine_tuner = FineTuner(base_model)
+        self.fine_tuner = FineTuner(base_model, torch_dtype=torch_dtype)
         self.evaluator = None
     
     def collect_user_data(self, user_interactions: List[Dict[str, Any]]):
@@ -460,30 +628,27 @@ def generate_synthetic_data(subject: str, num_examples: int = 50) -> List[Traini
     }
     
     subject_templates = templates.get(subject.lower(), templates["mathematics"])
+    ratings = np.random.uniform(3.5, 5.0, size=num_examples).tolist()
+    timestamp = datetime.now().isoformat()
     
     for i in range(num_examples):
         template = subject_templates[i % len(subject_templates)]
+        fields = {
+            "topic": f"topic_{i}",
+            "problem_type": f"problem_type_{i}",
+            "concept1": f"concept_{i}",
+            "concept2": f"concept_{i+1}",
+            "algorithm": f"algorithm_{i}",
+            "concept": f"concept_{i}"
+        }
         example = TrainingExample(
-            input_text=template[0].format(
-                topic=f"topic_{i}",
-                problem_type=f"problem_type_{i}",
-                concept1=f"concept_{i}",
-                concept2=f"concept_{i+1}",
-                algorithm=f"algorithm_{i}",
-                concept=f"concept_{i}"
-            ),
-            target_text=template[1].format(
-                topic=f"topic_{i}",
-                problem_type=f"problem_type_{i}",
-                concept1=f"concept_{i}",
-                concept2=f"concept_{i+1}",
-                algorithm=f"algorithm_{i}",
-                concept=f"concept_{i}"
-            ),
+            input_text=template[0].format(**fields),
+            target_text=template[1].format(**fields),
             subject=subject,
             difficulty=["easy", "medium", "hard"][i % 3],
-            user_rating=np.random.uniform(3.5, 5.0),
-            timestamp=datetime.now().isoformat()
+            user_rating=ratings[i],
+            timestamp=timestamp,
+            metadata={}
         )
         examples.append(example)
     
@@ -1,10 +1,13 @@
 from __future__ import annotations
 import os
 import json, re
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, Optional
 from pydantic import BaseModel
 from dotenv import load_dotenv
 try:
+    import httpx
     import ollama
     OLLAMA_AVAILABLE = True
 except ImportError:
@@ -14,6 +17,17 @@
 load_dotenv()
 
 DEFAULT_MODEL = os.getenv("LLM_MODEL", "mistral:7b-instruct")
+OLLAMA_CONNECT_TIMEOUT = 5.0
+OLLAMA_READ_TIMEOUT = 120.0
+BATCH_MAX_WORKERS = 8  # matches the client's keep-alive pool
+
+@lru_cache(maxsize=1)
+def _ollama_client() -> "ollama.Client":
+    """One keep-alive HTTP client shared by every LLM call in the process."""
+    return ollama.Client(
+        timeout=httpx.Timeout(OLLAMA_READ_TIMEOUT, connect=OLLAMA_CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+    )
 
 def _strip_code_fences(txt: str) -> str:
     t = (txt or "").strip()
@@ -81,7 +95,7 @@ def complete(self, prompt: str, temperature: float = 0.4, max_tokens: int = 800)
         
         system_msg = "You are a helpful educational assistant. Keep answers clear and age-appropriate."
         full = f"{system_msg}\n\nUser: {prompt}\nAssistant:"
-        resp = ollama.generate(
+        resp = _ollama_client().generate(
             model=self.model,
             prompt=full,
             options={
@@ -92,6 +106,40 @@ def complete(self, prompt: str, temperature: float = 0.4, max_tokens: int = 800)
         )
         return resp.get("response", "").strip()
 
+    def stream(self, prompt: str, temperature: float = 0.4, max_tokens: int = 800) -> Iterator[str]:
+        """Like complete(), but yields the response text as the model generates it."""
+        if not OLLAMA_AVAILABLE:
+            yield self.complete(prompt, temperature, max_tokens)
+            return
+
+        system_msg = "You are a helpful educational assistant. Keep answers clear and age-appropriate."
+        full = f"{system_msg}\n\nUser: {prompt}\nAssistant:"
+        for chunk in _ollama_client().generate(
+            model=self.model,
+            prompt=full,
+            options={
+                "temperature": float(temperature),
+                "num_predict": int(max_tokens),
+                "stop": ["\nUser:"],
+            },
+            stream=True,
+        ):
+            delta = chunk.get("response", "")
+            if delta:
+                yield delta
+
+    def batch_complete(self, prompts: list[tuple[str, dict]]) -> list[str]:
+        """
+        Complete several independent prompts, each given as (prompt, kwargs for
+        complete()). Ollama has no batch endpoint, so the requests are issued
+        concurrently over the shared client; results keep the input order.
+        """
+        if len(prompts) <= 1 or not OLLAMA_AVAILABLE:
+            return [self.complete(prompt, **params) for prompt, params in prompts]
+        with ThreadPoolExecutor(max_workers=min(len(prompts), BATCH_MAX_WORKERS)) as pool:
+            futures = [pool.submit(self.complete, prompt, **params) for prompt, params in prompts]
+            return [future.result() for future in futures]
+
     def complete_json(self, prompt: str, temperature: float = 0.2, max_tokens: int = 1800, attempts: int = 3) -> dict:
         """
         Use Ollama JSON mode. If the model returns invalid JSON, try to repair/extract.
@@ -108,7 +156,7 @@ def complete_json(self, prompt: str, temperature: float = 0.2, max_tokens: int =
         system_msg = "You are a helpful educational assistant. Only return valid JSON for structured tasks."
         for k in range(attempts):
             full = f"{system_msg}\n\nUser: {prompt}\nAssistant:"
-            resp = ollama.generate(
+            resp = _ollama_client().generate(
                 model=self.model,
                 prompt=full,
                 options={
@@ -9,16 +9,18 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Deque, Dict, List, Optional, Tuple, Any
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import streamlit as st
 import altair as alt
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
+from functools import wraps
 import threading
 import queue
 import logging
+from collections import deque
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -59,14 +61,38 @@ class UserMetrics:
     accuracy: float
     engagement_score: float
 
+# NumPy dtype per dataclass field type for the columnar views; anything
+# else (float and Optional[float]) becomes float32 with None stored as NaN
+COLUMN_DTYPES = {
+    datetime: 'datetime64[us]',
+    int: np.int64,
+    str: object,
+}
+
+# Bounded scores (0-1 accuracies, 1-10 engagement) only need half precision
+FIELD_DTYPES = {
+    "accuracy": np.float16,
+    "model_accuracy": np.float16,
+    "engagement_score": np.float16,
+    "user_engagement": np.float16,
+}
+
 class MetricsCollector:
     """Collects and stores real-time metrics"""
     
     def __init__(self, max_history: int = 1000):
         self.max_history = max_history
-        self.performance_metrics: List[PerformanceMetrics] = []
-        self.training_metrics: List[TrainingMetrics] = []
-        self.user_metrics: List[UserMetrics] = []
+        # Bounded ring buffers: appends past max_history drop the oldest entry in O(1)
+        self.performance_metrics: Deque[PerformanceMetrics] = deque(maxlen=max_history)
+        self.training_metrics: Deque[TrainingMetrics] = deque(maxlen=max_history)
+        self.user_metrics: Deque[UserMetrics] = deque(maxlen=max_history)
+        # Columnar snapshots per metric type, dropped whenever that history changes
+        self._columns: Dict[str, Dict[str, np.ndarray]] = {}
+        # Bumped on every change so derived views (charts) know when to rebuild
+        self.version = 0
+        # The collection thread appends while the UI thread reads; deques raise
+        # if mutated mid-iteration, so every append/clear/snapshot holds this
+        self._lock = threading.Lock()
         self.metrics_queue = queue.Queue()
         self.is_collecting = False
         self.collection_thread = None
@@ -125,23 +151,35 @@ def _collect_metrics_loop(self):
     
     def add_performance_metrics(self, metrics: PerformanceMetrics):
         """Add performance metrics to history"""
-        self.performance_metrics.append(metrics)
-        if len(self.performance_metrics) > self.max_history:
-            self.performance_metrics.pop(0)
+        with self._lock:
+            self.performance_metrics.append(metrics)
+            self._columns.pop("performance", None)
+            self.version += 1
     
     def add_training_metrics(self, metrics: TrainingMetrics):
         """Add training metrics to history"""
         if metrics.timestamp is None:
             metrics.timestamp = datetime.now()
-        self.training_metrics.append(metrics)
-        if len(self.training_metrics) > self.max_history:
-            self.training_metrics.pop(0)
+        with self._lock:
+            self.training_metrics.append(metrics)
+            self._columns.pop("training", None)
+            self.version += 1
     
     def add_user_metrics(self, metrics: UserMetrics):
         """Add user interaction metrics to history"""
-        self.user_metrics.append(metrics)
-        if len(self.user_metrics) > self.max_history:
-            self.user_metrics.pop(0)
+        with self._lock:
+            self.user_metrics.append(metrics)
+            self._columns.pop("user", None)
+            self.version += 1
+    
+    def clear(self):
+        """Drop all collected metrics"""
+        with self._lock:
+            self.performance_metrics.clear()
+            self.training_metrics.clear()
+            self.user_metrics.clear()
+            self._columns.clear()
+            self.version += 1
     
     def get_latest_metrics(self, metric_type: str = "performance") -> Optional[Any]:
         """Get the latest metrics of specified type"""
@@ -153,25 +191,89 @@ def get_latest_metrics(self, metric_type: str = "performance") -> Optional[Any]:
             return self.user_metrics[-1]
         return None
     
+    def snapshot(self, metric_type: str = "performance") -> List[Any]:
+        """Copy of the full history of a metric type, safe to iterate"""
+        with self._lock:
+            return self._snapshot_locked(metric_type)
+    
+    def _snapshot_locked(self, metric_type: str) -> List[Any]:
+        """Copy of a history; the caller must hold the collector lock"""
+        histories = {
+            "performance": self.performance_metrics,
+            "training": self.training_metrics,
+            "user": self.user_metrics,
+        }
+        return list(histories.get(metric_type, ()))
+    
     def get_metrics_history(self, metric_type: str = "performance", 
                           hours: int = 24) -> List[Any]:
         """Get metrics history for specified time period"""
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        
-        if metric_type == "performance":
-            return [m for m in self.performance_metrics if m.timestamp > cutoff_time]
-        elif metric_type == "training":
-            return [m for m in self.training_metrics if m.timestamp > cutoff_time]
-        elif metric_type == "user":
-            return [m for m in self.user_metrics if m.timestamp > cutoff_time]
-        return []
+        return [m for m in self.snapshot(metric_type) if m.timestamp > cutoff_time]
+    
+    def get_columns(self, metric_type: str = "performance",
+                    hours: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Get a metric history as one NumPy array per field (structure of arrays)
+        
+        The full-history columns are built once and reused until metrics of
+        that type are added; passing ``hours`` returns a time-windowed copy.
+        """
+        columns = self._columns.get(metric_type)
+        if columns is None:
+            metric_classes = {
+                "performance": PerformanceMetrics,
+                "training": TrainingMetrics,
+                "user": UserMetrics,
+            }
+            if metric_type not in metric_classes:
+                return {}
+            metric_class = metric_classes[metric_type]
+            with self._lock:
+                records = self._snapshot_locked(metric_type)
+                built_version = self.version
+            columns = {
+                field.name: np.array([getattr(m, field.name) for m in records],
+                                     dtype=FIELD_DTYPES.get(field.name,
+                                                            COLUMN_DTYPES.get(field.type, np.float32)))
+                for field in fields(metric_class)
+            }
+            # Only cache if nothing was added while building, else the next
+            # call would keep serving these stale arrays
+            with self._lock:
+                if self.version == built_version:
+                    self._columns[metric_type] = columns
+        
+        if hours is None:
+            return columns
+        cutoff_time = np.datetime64(datetime.now() - timedelta(hours=hours), 'us')
+        window = columns["timestamp"] > cutoff_time
+        return {name: values[window] for name, values in columns.items()}
+
+# Charts window their data relative to now, so a cached figure also expires
+# once this many seconds pass even when no new metrics arrive
+FIGURE_CACHE_BUCKET_SECONDS = 60
+
+def cached_figure(build):
+    """Reuse a chart until the collector's metrics change or the time bucket moves"""
+    @wraps(build)
+    def wrapper(self):
+        key = (self.metrics_collector.version, int(time.time() // FIGURE_CACHE_BUCKET_SECONDS))
+        cached = self._figure_cache.get(build.__name__)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        fig = build(self)
+        self._figure_cache[build.__name__] = (key, fig)
+        return fig
+    return wrapper
 
 class VisualizationEngine:
     """Creates interactive visualizations and charts"""
     
     def __init__(self, metrics_collector: MetricsCollector):
         self.metrics_collector = metrics_collector
+        self._figure_cache: Dict[str, Tuple[Tuple[int, int], go.Figure]] = {}
     
+    @cached_figure
     def create_system_dashboard(self) -> go.Figure:
         """Create comprehensive system performance dashboard"""
         performance_metrics = self.metrics_collector.get_metrics_history("performance", hours=1)
@@ -263,6 +365,7 @@ def create_system_dashboard(self) -> go.Figure:
         
         return fig
     
+    @cached_figure
     def create_training_analytics(self) -> go.Figure:
         """Create training metrics visualization"""
         training_metrics = self.metrics_collector.get_metrics_history("training", hours=24)
@@ -330,6 +433,7 @@ def create_training_analytics(self) -> go.Figure:
         
         return fig
     
+    @cached_figure
     def create_user_analytics(self) -> go.Figure:
         """Create user interaction analytics visualization"""
         user_metrics = self.metrics_collector.get_metrics_history("user", hours=24)
@@ -396,6 +500,7 @@ def create_user_analytics(self) -> go.Figure:
         
         return fig
     
+    @cached_figure
     def create_ai_performance_dashboard(self) -> go.Figure:
         """Create AI model performance dashboard"""
         # Get latest metrics
@@ -1,30 +1,58 @@
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
 import json
 
+DEFAULT_REASONING_STEPS = (
+    "First, let me understand what is being asked",
+    "Next, I'll break this down into logical steps",
+    "Then, I'll apply relevant knowledge and concepts",
+    "Finally, I'll provide a comprehensive answer"
+)
+
+SUBJECT_STRATEGIES = {
+    "mathematics": "Focus on problem-solving practice, formula memorization, and concept connections. Include daily practice problems and weekly concept reviews.",
+    "computer science": "Emphasize hands-on coding, algorithm understanding, and project-based learning. Include code reviews and debugging practice.",
+    "physics": "Combine theoretical understanding with practical applications. Include problem-solving, lab work, and real-world examples.",
+    "chemistry": "Focus on understanding molecular concepts, balancing equations, and laboratory safety. Include hands-on experiments and calculations.",
+    "biology": "Emphasize understanding systems and processes, memorizing key terms, and connecting concepts. Include diagrams and real-world applications.",
+    "history": "Focus on chronological understanding, cause-and-effect relationships, and primary source analysis. Include timeline creation and document analysis.",
+    "literature": "Emphasize close reading, analysis, and creative writing. Include discussion, essay writing, and literary analysis.",
+    "economics": "Focus on understanding principles, analyzing data, and applying concepts to real situations. Include case studies and data interpretation."
+}
+
+LEVEL_GUIDELINES = {
+    "beginner": "Use simple language, avoid jargon, focus on basic concepts, provide many examples, use analogies from everyday life.",
+    "intermediate": "Build on basic knowledge, introduce some technical terms, include moderate complexity examples, connect to related concepts.",
+    "advanced": "Assume solid foundation, use technical terminology, include complex examples, explore advanced applications and edge cases."
+}
+
+DIFFICULTY_GUIDELINES = {
+    "easy": "Focus on basic facts, definitions, and simple applications. Use straightforward language and make incorrect options obviously wrong.",
+    "medium": "Test understanding and application of concepts. Use moderate complexity language and make incorrect options plausible but wrong.",
+    "hard": "Challenge with analysis, synthesis, and evaluation. Use advanced concepts and make incorrect options very plausible. Include complex scenarios."
+}
+
+@lru_cache(maxsize=64)
+def _reasoning_block(reasoning_steps: Tuple[str, ...]) -> str:
+    """The static chain-of-thought suffix, rendered once per set of steps."""
+    steps = "\n".join(f"{i+1}. {step}" for i, step in enumerate(reasoning_steps))
+    return f"""
+
+**Reasoning Process:**
+{steps}
+
+Please think through this step by step before providing your final answer.
+"""
+
 @dataclass
 class AdvancedPromptTemplate:
     """Base class for advanced prompt engineering features."""
     
     def add_chain_of_thought(self, prompt: str, reasoning_steps: List[str] = None) -> str:
         """Add chain-of-thought reasoning to prompts."""
-        if not reasoning_steps:
-            reasoning_steps = [
-                "First, let me understand what is being asked",
-                "Next, I'll break this down into logical steps", 
-                "Then, I'll apply relevant knowledge and concepts",
-                "Finally, I'll provide a comprehensive answer"
-            ]
-        
-        cot_prompt = f"""
-{prompt}
-
-**Reasoning Process:**
-{chr(10).join([f"{i+1}. {step}" for i, step in enumerate(reasoning_steps)])}
-
-Please think through this step by step before providing your final answer.
-"""
-        return cot_prompt
+        steps = tuple(reasoning_steps) if reasoning_steps else DEFAULT_REASONING_STEPS
+        return f"\n{prompt}{_reasoning_block(steps)}"
     
     def add_few_shot_examples(self, prompt: str, examples: List[Dict[str, Any]]) -> str:
         """Add few-shot learning examples to prompts."""
@@ -116,17 +144,7 @@ def render(self, subject: str, level: str, minutes_per_day: int, duration_days:
     
     def _get_subject_strategies(self, subject: str) -> str:
         """Return subject-specific study strategies."""
-        strategies = {
-            "mathematics": "Focus on problem-solving practice, formula memorization, and concept connections. Include daily practice problems and weekly concept reviews.",
-            "computer science": "Emphasize hands-on coding, algorithm understanding, and project-based learning. Include code reviews and debugging practice.",
-            "physics": "Combine theoretical understanding with practical applications. Include problem-solving, lab work, and real-world examples.",
-            "chemistry": "Focus on understanding molecular concepts, balancing equations, and laboratory safety. Include hands-on experiments and calculations.",
-            "biology": "Emphasize understanding systems and processes, memorizing key terms, and connecting concepts. Include diagrams and real-world applications.",
-            "history": "Focus on chronological understanding, cause-and-effect relationships, and primary source analysis. Include timeline creation and document analysis.",
-            "literature": "Emphasize close reading, analysis, and creative writing. Include discussion, essay writing, and literary analysis.",
-            "economics": "Focus on understanding principles, analyzing data, and applying concepts to real situations. Include case studies and data interpretation."
-        }
-        return strategies.get(subject.lower(), "Focus on understanding core concepts, regular practice, and application of knowledge.")
+        return SUBJECT_STRATEGIES.get(subject.lower(), "Focus on understanding core concepts, regular practice, and application of knowledge.")
 
 @dataclass
 class ExplanationPrompt(AdvancedPromptTemplate):
@@ -182,12 +200,7 @@ def render(self, topic: str, level: str, rag_context: Optional[str] = None,
     
     def _get_level_guidelines(self, level: str) -> str:
         """Return level-specific explanation guidelines."""
-        guidelines = {
-            "beginner": "Use simple language, avoid jargon, focus on basic concepts, provide many examples, use analogies from everyday life.",
-            "intermediate": "Build on basic knowledge, introduce some technical terms, include moderate complexity examples, connect to related concepts.",
-            "advanced": "Assume solid foundation, use technical terminology, include complex examples, explore advanced applications and edge cases."
-        }
-        return guidelines.get(level.lower(), "Provide clear, comprehensive explanations with appropriate complexity for the level.")
+        return LEVEL_GUIDELINES.get(level.lower(), "Provide clear, comprehensive explanations with appropriate complexity for the level.")
     
     def _get_explanation_examples(self, topic: str, level: str) -> List[Dict[str, str]]:
         """Get few-shot examples for explanations."""
@@ -257,12 +270,7 @@ def render(self, topic: str, level: str, difficulty: str, num_questions: int = 1
     
     def _get_difficulty_guidelines(self, difficulty: str) -> str:
         """Return difficulty-specific question guidelines."""
-        guidelines = {
-            "easy": "Focus on basic facts, definitions, and simple applications. Use straightforward language and make incorrect options obviously wrong.",
-            "medium": "Test understanding and application of concepts. Use moderate complexity language and make incorrect options plausible but wrong.",
-            "hard": "Challenge with analysis, synthesis, and evaluation. Use advanced concepts and make incorrect options very plausible. Include complex scenarios."
-        }
-        return guidelines.get(difficulty.lower(), "Create questions appropriate for the specified difficulty level.")
+        return DIFFICULTY_GUIDELINES.get(difficulty.lower(), "Create questions appropriate for the specified difficulty level.")
 
 @dataclass
 class RAGEnhancedPrompt(AdvancedPromptTemplate):
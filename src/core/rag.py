@@ -2,6 +2,7 @@
 from typing import List, Dict, Optional, Tuple, Union
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 try:
@@ -110,6 +111,51 @@ def split_text_adaptive(text: str, content_type: str = "general") -> List[str]:
         )
         return text_splitter.split_text(text)
 
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, without a full sort."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        # k-th largest score; ties at that boundary keep their lowest indices
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[:k - len(above)]
+        candidates = np.concatenate([above, tied])
+    else:
+        candidates = np.arange(len(scores))
+    # Highest score first, equal scores in index order (as sorted(..., reverse=True) did)
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+def mmr_rerank(query_embedding, doc_embeddings, k: int, lambda_mult: float = 0.7) -> List[int]:
+    """
+    Maximal Marginal Relevance: pick k documents that are relevant to the query
+    but not redundant with each other. Returns indices into doc_embeddings.
+    """
+    docs = np.asarray(doc_embeddings, dtype=np.float32)
+    if docs.ndim != 2 or len(docs) == 0 or k <= 0:
+        return []
+    query = np.asarray(query_embedding, dtype=np.float32)
+    docs = docs / np.maximum(np.linalg.norm(docs, axis=1, keepdims=True), 1e-12)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = docs @ query
+    doc_sim = docs @ docs.T
+
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of every candidate to anything already selected
+    redundancy = doc_sim[selected[0]].copy()
+    available = np.ones(len(docs), dtype=bool)
+    available[selected[0]] = False
+    while len(selected) < min(k, len(docs)):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, doc_sim[best], out=redundancy)
+    return selected
+
 class HybridSearchEngine:
     """Combines semantic and keyword search for better retrieval."""
     
@@ -141,8 +187,8 @@ def keyword_search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
             similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
             
             # Get top-k results
-            top_indices = similarities.argsort()[-top_k:][::-1]
-            results = [(idx, similarities[idx]) for idx in top_indices if similarities[idx] > 0]
+            top_indices = top_k_indices(similarities, top_k)
+            results = [(int(idx), float(similarities[idx])) for idx in top_indices if similarities[idx] > 0]
             return results
         except Exception as e:
             print(f"Error in keyword search: {e}")
@@ -155,70 +201,72 @@ def hybrid_search(self, query: str, semantic_scores: List[float],
             return []
         
         # Get keyword search scores
-        keyword_results = self.keyword_search(query, top_k=len(semantic_scores))
-        keyword_scores = [0.0] * len(semantic_scores)
-        
-        for idx, score in keyword_results:
-            if idx < len(keyword_scores):
-                keyword_scores[idx] = score
+        semantic = np.asarray(semantic_scores, dtype=np.float64)
+        keyword = np.zeros_like(semantic)
+        keyword_results = self.keyword_search(query, top_k=len(semantic))
+        if keyword_results:
+            indices, scores = map(np.asarray, zip(*keyword_results))
+            in_range = indices < len(keyword)
+            keyword[indices[in_range]] = scores[in_range]
         
         # Normalize scores
-        if max(semantic_scores) > 0:
-            semantic_scores = [s / max(semantic_scores) for s in semantic_scores]
-        if max(keyword_scores) > 0:
-            keyword_scores = [s / max(keyword_scores) for s in keyword_scores]
+        if semantic.max() > 0:
+            semantic /= semantic.max()
+        if keyword.max() > 0:
+            keyword /= keyword.max()
         
-        # Combine scores
-        hybrid_scores = []
-        for i in range(len(semantic_scores)):
-            hybrid_score = alpha * semantic_scores[i] + (1 - alpha) * keyword_scores[i]
-            hybrid_scores.append((i, hybrid_score))
-        
-        # Sort by hybrid score and return top-k
-        hybrid_scores.sort(key=lambda x: x[1], reverse=True)
-        return hybrid_scores[:top_k]
+        # Combine scores and return top-k
+        hybrid = alpha * semantic + (1 - alpha) * keyword
+        return [(int(i), float(hybrid[i])) for i in top_k_indices(hybrid, top_k)]
+
+QUERY_SYNONYMS = {
+    "math": ["mathematics", "mathematical", "calculation", "computation"],
+    "programming": ["coding", "software development", "computer programming"],
+    "physics": ["physical science", "mechanics", "dynamics"],
+    "chemistry": ["chemical science", "molecular science"],
+    "biology": ["biological science", "life science"],
+    "study": ["learn", "research", "investigate", "examine"],
+    "understand": ["comprehend", "grasp", "fathom", "realize"],
+    "practice": ["exercise", "drill", "rehearse", "train"]
+}
+
+@lru_cache(maxsize=512)
+def _expand_query(query: str) -> Tuple[str, ...]:
+    """Synonym and related-term expansions of a query, memoized per query."""
+    expanded_queries = [query]
+    
+    # Add synonyms
+    for word in query.lower().split():
+        if word in QUERY_SYNONYMS:
+            for synonym in QUERY_SYNONYMS[word]:
+                expanded_queries.append(query.replace(word, synonym))
+    
+    # Add related terms
+    if "derivative" in query.lower():
+        expanded_queries.extend([
+            query + " calculus",
+            query + " differentiation",
+            query + " rate of change"
+        ])
+    
+    if "algorithm" in query.lower():
+        expanded_queries.extend([
+            query + " computer science",
+            query + " programming",
+            query + " data structure"
+        ])
+    
+    return tuple(set(expanded_queries))  # Remove duplicates
 
 class QueryExpander:
     """Expands queries to improve retrieval."""
     
     def __init__(self):
-        self.synonyms = {
-            "math": ["mathematics", "mathematical", "calculation", "computation"],
-            "programming": ["coding", "software development", "computer programming"],
-            "physics": ["physical science", "mechanics", "dynamics"],
-            "chemistry": ["chemical science", "molecular science"],
-            "biology": ["biological science", "life science"],
-            "study": ["learn", "research", "investigate", "examine"],
-            "understand": ["comprehend", "grasp", "fathom", "realize"],
-            "practice": ["exercise", "drill", "rehearse", "train"]
-        }
+        self.synonyms = QUERY_SYNONYMS
     
     def expand_query(self, query: str) -> List[str]:
-        """Expand a query with synonyms and related terms."""
-        expanded_queries = [query]
-        
-        # Add synonyms
-        for word in query.lower().split():
-            if word in self.synonyms:
-                for synonym in self.synonyms[word]:
-                    expanded_queries.append(query.replace(word, synonym))
-        
-        # Add related terms
-        if "derivative" in query.lower():
-            expanded_queries.extend([
-                query + " calculus",
-                query + " differentiation",
-                query + " rate of change"
-            ])
-        
-        if "algorithm" in query.lower():
-            expanded_queries.extend([
-                query + " computer science",
-                query + " programming",
-                query + " data structure"
-            ])
-        
-        return list(set(expanded_queries))  # Remove duplicates
+        """Expand a query with synonyms and related terms (memoized per query)."""
+        return list(_expand_query(query))
 
 class EnhancedRAG:
     """Enhanced RAG system with advanced features."""
@@ -236,6 +284,8 @@ def __init__(self, persist_path: str | None = None,
         self.documents = []
         self.hybrid_search_engine = None
         self.query_expander = QueryExpander()
+        # Identical searches are answered from memory until the knowledge base is reloaded
+        self._search_cached = lru_cache(maxsize=128)(self._search)
         
         # Initialize vector store
         self._init_vector_store()
@@ -281,6 +331,7 @@ def load_knowledge_base(self, knowledge_base_path: str) -> bool:
                     print(f"⚠️ Warning: Could not clear existing documents: {e}")
                     # Continue anyway
             
+            self._search_cached.cache_clear()
             documents = []
             chunk_id = 0
             
@@ -352,59 +403,66 @@ def retrieve_relevant_context(self, query: str, k: int = 3,
             if not self.documents_loaded:
                 return "", []
             
-            # Expand query
-            expanded_queries = self.query_expander.expand_query(query)
-            
-            # Get semantic search results
-            semantic_results = []
-            for exp_query in expanded_queries:
-                results = self.vs.similarity_search_with_score(exp_query, k=k)
-                semantic_results.extend(results)
-            
-            # Remove duplicates and get top results
-            unique_results = {}
-            for doc, score in semantic_results:
-                if doc.metadata.get('chunk_id') not in unique_results:
-                    unique_results[doc.metadata.get('chunk_id')] = (doc, score)
-            
-            # Sort by score and get top-k
-            sorted_results = sorted(unique_results.values(), key=lambda x: x[1], reverse=True)[:k]
-            
-            if use_hybrid and self.hybrid_search_engine:
-                # Use hybrid search
-                semantic_scores = [score for _, score in sorted_results]
-                hybrid_results = self.hybrid_search_engine.hybrid_search(
-                    query, semantic_scores, alpha=alpha, top_k=k
-                )
-                
-                # Reorder results based on hybrid scores
-                final_results = []
-                for idx, hybrid_score in hybrid_results:
-                    if idx < len(sorted_results):
-                        doc, _ = sorted_results[idx]
-                        final_results.append((doc, hybrid_score))
-                sorted_results = final_results
-            
-            # Format results
-            context = "\n\n".join([doc.page_content for doc, _ in sorted_results])
-            sources = []
-            
-            for doc, score in sorted_results:
-                sources.append({
-                    "source": doc.metadata.get("source", "Unknown"),
-                    "chunk_id": doc.metadata.get("chunk_id", "Unknown"),
-                    "content_type": doc.metadata.get("content_type", "general"),
-                    "relevance_score": float(score),
-                    "chunk_index": doc.metadata.get("chunk_index", 0),
-                    "total_chunks": doc.metadata.get("total_chunks", 1)
-                })
-            
-            return context, sources
+            context, sources = self._search_cached(query, k, use_hybrid, alpha)
+            # Hand out copies so callers can't mutate the cached results
+            return context, [dict(source) for source in sources]
             
         except Exception as e:
             print(f"❌ Error retrieving context: {e}")
             return "", []
     
+    def _search(self, query: str, k: int, use_hybrid: bool, alpha: float) -> Tuple[str, List[Dict]]:
+        """Run the expanded semantic (and optionally hybrid) search for a query."""
+        # Expand query
+        expanded_queries = self.query_expander.expand_query(query)
+        
+        # Get semantic search results
+        semantic_results = []
+        for exp_query in expanded_queries:
+            results = self.vs.similarity_search_with_score(exp_query, k=k)
+            semantic_results.extend(results)
+        
+        # Remove duplicates and get top results
+        unique_results = {}
+        for doc, score in semantic_results:
+            if doc.metadata.get('chunk_id') not in unique_results:
+                unique_results[doc.metadata.get('chunk_id')] = (doc, score)
+        
+        # Sort by score and get top-k
+        sorted_results = sorted(unique_results.values(), key=lambda x: x[1], reverse=True)[:k]
+        
+        if use_hybrid and self.hybrid_search_engine:
+            # Use hybrid search
+            semantic_scores = [score for _, score in sorted_results]
+            hybrid_results = self.hybrid_search_engine.hybrid_search(
+                query, semantic_scores, alpha=alpha, top_k=k
+            )
+            
+            # Reorder results based on hybrid scores
+            final_results = []
+            for idx, hybrid_score in hybrid_results:
+                if idx < len(sorted_results):
+                    doc, _ = sorted_results[idx]
+                    final_results.append((doc, hybrid_score))
+            sorted_results = final_results
+        
+        # Format results
+        context = "\n\n".join([doc.page_content for doc, _ in sorted_results])
+        sources = []
+        
+        for doc, score in sorted_results:
+            sources.append({
+                "source": doc.metadata.get("source", "Unknown"),
+                "chunk_id": doc.metadata.get("chunk_id", "Unknown"),
+                "content_type": doc.metadata.get("content_type", "general"),
+                "relevance_score": float(score),
+                "content": doc.page_content,
+                "chunk_index": doc.metadata.get("chunk_index", 0),
+                "total_chunks": doc.metadata.get("total_chunks", 1)
+            })
+        
+        return context, sources
+    
     def get_knowledge_base_stats(self) -> Dict:
         """Get comprehensive statistics about the loaded knowledge base."""
         try:
@@ -0,0 +1,14 @@
+from deploy_streamlit_cloud import write_if_changed
+
+def test_write_if_changed_skips_identical_content(tmp_path):
+    path = tmp_path / "requirements.txt"
+    assert write_if_changed(path, "streamlit\n") is True
+    mtime = path.stat().st_mtime_ns
+    assert write_if_changed(path, b"streamlit\n") is False
+    assert path.stat().st_mtime_ns == mtime
+
+def test_write_if_changed_rewrites_different_content(tmp_path):
+    path = tmp_path / "requirements.txt"
+    write_if_changed(path, "streamlit\n")
+    assert write_if_changed(path, "streamlit\npandas\n") is True
+    assert path.read_text() == "streamlit\npandas\n"
@@ -0,0 +1,31 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+fine_tuning = pytest.importorskip("src.core.fine_tuning")
+
+def _example(i):
+    return fine_tuning.TrainingExample(input_text=f"q{i}", target_text=f"a{i}",
+                                       subject="math", difficulty="easy")
+
+def test_data_collector_count_uses_sidecar(tmp_path):
+    collector = fine_tuning.DataCollector(data_dir=str(tmp_path))
+    collector.add_batch_examples([_example(i) for i in range(3)])
+    fresh = fine_tuning.DataCollector(data_dir=str(tmp_path))
+    assert fresh.count() == 3
+    # Answered from the sidecar without loading the examples
+    assert fresh._examples is None
+
+def test_data_collector_count_ignores_stale_sidecar(tmp_path):
+    collector = fine_tuning.DataCollector(data_dir=str(tmp_path))
+    collector.add_batch_examples([_example(i) for i in range(3)])
+    with open(collector.count_file, "w") as f:
+        f.write("not a number")
+    assert fine_tuning.DataCollector(data_dir=str(tmp_path)).count() == 3
+
+def test_fast_causal_collator_masks_padding():
+    from run_fine_tuning_memory_efficient import FastCausalCollator
+    collator = FastCausalCollator(pad_id=0, pad_to_multiple_of=4)
+    batch = collator([{"input_ids": [5, 6, 7]}, {"input_ids": [8], "attention_mask": [1]}])
+    assert batch["input_ids"].tolist() == [[5, 6, 7, 0], [8, 0, 0, 0]]
+    assert batch["attention_mask"].tolist() == [[1, 1, 1, 0], [1, 0, 0, 0]]
+    assert batch["labels"].tolist() == [[5, 6, 7, -100], [8, -100, -100, -100]]
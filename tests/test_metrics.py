@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+mv = pytest.importorskip("src.core.metrics_visualization")
+
+def _user(timestamp, accuracy=0.8):
+    return mv.UserMetrics(timestamp=timestamp, user_id="u1", action="quiz", subject="math",
+                          difficulty="easy", response_time=1.5, accuracy=accuracy, engagement_score=7.0)
+
+def test_get_columns_dtypes():
+    collector = mv.MetricsCollector()
+    collector.add_user_metrics(_user(datetime.now()))
+    collector.add_training_metrics(mv.TrainingMetrics(epoch=1, step=10, training_loss=0.5, learning_rate=1e-4))
+    users = collector.get_columns("user")
+    assert users["timestamp"].dtype == np.dtype("datetime64[us]")
+    assert users["subject"].dtype == object
+    assert users["accuracy"].dtype == np.float16
+    assert users["engagement_score"].dtype == np.float16
+    assert users["response_time"].dtype == np.float32
+    training = collector.get_columns("training")
+    assert training["epoch"].dtype == np.int64
+    # Unset optional floats come back as NaN
+    assert np.isnan(training["validation_loss"][0])
+
+def test_get_columns_hours_window():
+    collector = mv.MetricsCollector()
+    now = datetime.now()
+    collector.add_user_metrics(_user(now - timedelta(hours=3), accuracy=0.1))
+    collector.add_user_metrics(_user(now, accuracy=0.9))
+    assert len(collector.get_columns("user")["accuracy"]) == 2
+    recent = collector.get_columns("user", hours=1)
+    assert recent["accuracy"].tolist() == [pytest.approx(0.9, abs=1e-3)]
+
+def test_get_columns_rebuilt_after_append():
+    collector = mv.MetricsCollector()
+    collector.add_user_metrics(_user(datetime.now()))
+    assert len(collector.get_columns("user")["user_id"]) == 1
+    collector.add_user_metrics(_user(datetime.now()))
+    assert len(collector.get_columns("user")["user_id"]) == 2
+    assert collector.get_columns("unknown") == {}
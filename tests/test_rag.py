@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+rag = pytest.importorskip("src.core.rag")
+
+def _baseline_top_k(scores, k):
+    return sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:k]
+
+def test_top_k_indices_orders_best_first():
+    scores = np.array([0.1, 0.9, 0.5, 0.7])
+    assert rag.top_k_indices(scores, 2).tolist() == [1, 3]
+
+def test_top_k_indices_keeps_index_order_for_ties():
+    scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1])
+    assert rag.top_k_indices(scores, 5).tolist() == [1, 0, 2, 3, 4]
+
+def test_top_k_indices_matches_sorted_with_spread_ties():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        scores = rng.integers(0, 5, size=60).astype(np.float32)
+        # k usually lands inside a run of tied scores
+        for k in (7, 13, 30, 59):
+            assert rag.top_k_indices(scores, k).tolist() == _baseline_top_k(scores, k)
+
+def test_top_k_indices_with_k_at_least_n():
+    scores = np.array([0.2, 0.8, 0.4])
+    assert rag.top_k_indices(scores, 3).tolist() == [1, 2, 0]
+    assert rag.top_k_indices(scores, 10).tolist() == [1, 2, 0]
+    assert rag.top_k_indices(scores, 0).tolist() == []
+
+def test_mmr_lambda_one_is_pure_relevance():
+    query = [1.0, 0.0]
+    docs = [[0.0, 1.0], [1.0, 0.1], [1.0, 0.0], [1.0, 0.5]]
+    assert rag.mmr_rerank(query, docs, k=4, lambda_mult=1.0) == [2, 1, 3, 0]
+
+def test_mmr_lambda_zero_picks_most_dissimilar_after_best():
+    query = [1.0, 0.0]
+    docs = [[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]]
+    assert rag.mmr_rerank(query, docs, k=2, lambda_mult=0.0) == [0, 2]
+
+def test_mmr_skips_duplicates():
+    query = [1.0, 0.2]
+    docs = [[1.0, 0.2], [1.0, 0.2], [0.6, 0.8]]
+    selected = rag.mmr_rerank(query, docs, k=2, lambda_mult=0.3)
+    assert selected == [0, 2]
+    # Asking for more than there are never repeats an index
+    assert sorted(rag.mmr_rerank(query, docs, k=5)) == [0, 1, 2]